@@ -1,28 +1,67 @@
 from odoo import http
 from odoo.http import request
 
+from .page_cache import MAX_CACHED_PAGES, PageCache, latest, serve_cached
+
+POSTS_PER_PAGE = 10
+DEFAULT_API_LIMIT = 20
+MAX_API_LIMIT = 100
+
+# Pages of the list API, kept per worker process like rendered pages
+_api_page_cache = PageCache(MAX_CACHED_PAGES)
+
 class BlogController(http.Controller):
 
     @http.route(['/blog', '/blog/page/<int:page>'], type='http', auth='public', website=True)
     def blog_list(self, page=1, **kw):
-        domain = [('published', '=', True)]
         category_id = kw.get('category_id')
         if category_id:
             try:
-                cid = int(category_id)
-                domain = domain + [('category_id', '=', cid)]
+                category_id = int(category_id)
             except Exception:
-                pass
-        posts = request.env['blog.post'].sudo().search(domain, order='date desc')
+                category_id = False
+        Post = request.env['blog.post'].sudo()
+        posts_version = Post._get_list_version(category_id)
+        categories_version = Post._get_categories_version()
+        return serve_cached(
+            ('list', category_id or None, int(page)),
+            (posts_version, categories_version),
+            latest(posts_version[0], categories_version[0]),
+            lambda: self._render_blog_list(page, category_id))
+
+    def _render_blog_list(self, page, category_id):
+        domain = [('published', '=', True)]
+        url_args = {}
+        if category_id:
+            domain = domain + [('category_id', '=', category_id)]
+            url_args['category_id'] = category_id
+        Post = request.env['blog.post'].sudo()
+        pager = request.website.pager(
+            url='/blog', total=Post.search_count(domain), page=page,
+            step=POSTS_PER_PAGE, url_args=url_args)
+        posts = Post.search(domain, order='date desc', limit=POSTS_PER_PAGE, offset=pager['offset'])
         categories = request.env['blog.category'].sudo().search([])
         return request.render('blog_api.blog_list_template', {
             'posts': posts,
+            'pager': pager,
             'categories': categories,
             'selected_category': int(category_id) if category_id else False
         })
 
     @http.route(['/blog/<model("blog.post"):post>'], type='http', auth='public', website=True)
     def blog_detail(self, post, **kw):
+        post_data = post.sudo().read(['published', 'write_date'])[0]
+        if not post_data['published']:
+            # unpublished posts are only ever rendered fresh
+            return self._render_blog_detail(post)
+        categories_version = post.sudo()._get_categories_version()
+        return serve_cached(
+            ('detail', post.id),
+            (post_data['write_date'], categories_version),
+            latest(post_data['write_date'], categories_version[0]),
+            lambda: self._render_blog_detail(post))
+
+    def _render_blog_detail(self, post):
         post = post.sudo()
         categories = request.env['blog.category'].sudo().search([])
         return request.render('blog_api.blog_detail_template', {
@@ -35,15 +74,56 @@ class BlogController(http.Controller):
         return http.redirect_with_hash('/blog?category_id=%s' % (category_id,))
 
     @http.route(['/api/blog/posts'], type='json', auth='public', methods=['POST'], csrf=False)
-    def api_blog_posts_list(self, **kwargs):
-        """Get all published blog posts"""
+    def api_blog_posts_list(self, limit=DEFAULT_API_LIMIT, offset=0, category_id=None, include_content=True, **kwargs):
+        """Get a page of published blog posts, optionally of one category"""
         try:
-            domain = [('published', '=', True)]
-            posts = request.env['blog.post'].sudo().search_read(
-                domain, 
-                ['id', 'title', 'slug', 'content', 'date', 'category_id', 'author_name', 'published']
-            )
-            return {'success': True, 'data': posts, 'count': len(posts)}
+            limit = min(max(int(limit), 1), MAX_API_LIMIT)
+            offset = max(int(offset), 0)
+            category_id = int(category_id) if category_id else None
+            include_content = str(include_content).lower() not in ('false', '0')
+            Post = request.env['blog.post'].sudo()
+            # creating, writing or deleting a post moves the version, so a
+            # cached page is never served stale
+            version = (Post._get_list_version(category_id), Post._get_categories_version())
+            key = (request.db, category_id, limit, offset, include_content)
+            cached = _api_page_cache.get(key, version)
+            if cached is None:
+                cached = Post._get_published_posts_page(limit, offset, category_id, include_content=include_content)
+                _api_page_cache.put(key, version, cached)
+            page, total = cached
+            return {
+                'success': True,
+                'data': page,
+                'count': len(page),
+                'total': total,
+                'limit': limit,
+                'offset': offset,
+            }
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    @http.route(['/api/blog/search'], type='json', auth='public', methods=['POST'], csrf=False)
+    def api_blog_search(self, q='', limit=DEFAULT_API_LIMIT, offset=0, category_id=None, **kwargs):
+        """Full-text search of published posts, best match first, with highlighted snippets"""
+        try:
+            q = (q or '').strip()
+            if not q:
+                return {'success': False, 'error': 'Search query is required'}
+            limit = min(max(int(limit), 1), MAX_API_LIMIT)
+            offset = max(int(offset), 0)
+            Post = request.env['blog.post'].sudo()
+            rows, total = Post._search_fulltext(q, limit, offset, int(category_id) if category_id else None)
+            posts = {post['id']: post for post in Post.browse([row[0] for row in rows]).read(
+                ['id', 'title', 'slug', 'date', 'category_id', 'author_name'])}
+            data = [dict(posts[post_id], rank=rank, snippet=snippet) for post_id, rank, snippet in rows]
+            return {
+                'success': True,
+                'data': data,
+                'count': len(data),
+                'total': total,
+                'limit': limit,
+                'offset': offset,
+            }
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
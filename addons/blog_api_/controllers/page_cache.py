@@ -0,0 +1,82 @@
+from collections import OrderedDict
+from odoo.http import request
+import hashlib
+import threading
+
+# Rendered pages kept per worker process
+MAX_CACHED_PAGES = 512
+# Browsers may reuse a page this long before revalidating it with its ETag
+PAGE_MAX_AGE = 60
+CSRF_PLACEHOLDER = '__blog_api_csrf_token__'
+
+
+class PageCache:
+    """LRU of rendered public blog pages.
+
+    Each entry remembers the version it was rendered at, see
+    ``blog.post._get_list_version``; an entry whose version moved on is
+    rendered again, so invalidation never has to find the entries.
+    """
+
+    def __init__(self, size):
+        self._size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, etag):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, etag, body):
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+
+_page_cache = PageCache(MAX_CACHED_PAGES)
+
+
+def latest(*dates):
+    return max((date for date in dates if date), default=None)
+
+
+def serve_cached(key, version, last_modified, render):
+    """Serve the page ``key`` from the cache while ``version`` is current.
+
+    ``render`` returns the response when the page has to be rendered.
+    Logged-in users always get a fresh render. The anonymous session's
+    CSRF token is swapped out of the cached body and back in on serve.
+    """
+    if request.session.uid:
+        return render()
+    key = (request.website.id, request.lang.code) + key
+    etag = hashlib.sha1(repr((key, version)).encode()).hexdigest()
+    if request.httprequest.if_none_match.contains(etag):
+        response = request.make_response('', status=304)
+        response.set_etag(etag)
+        return response
+
+    csrf_token = request.csrf_token(None)
+    body = _page_cache.get(key, etag)
+    if body is None:
+        response = render()
+        response.flatten()
+        if response.status_code != 200:
+            return response
+        body = response.get_data(as_text=True).replace(csrf_token, CSRF_PLACEHOLDER)
+        _page_cache.put(key, etag, body)
+
+    response = request.make_response(body.replace(CSRF_PLACEHOLDER, csrf_token),
+                                     headers=[('Content-Type', 'text/html; charset=utf-8')])
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.max_age = PAGE_MAX_AGE
+    return response.make_conditional(request.httprequest)
@@ -1,5 +1,13 @@
 from odoo import models, fields, api
-from odoo.tools import misc
+from odoo.tools import html2plaintext, misc
+
+EXCERPT_LENGTH = 300
+# Text search configuration of the search_vector column and of queries
+SEARCH_CONFIG = 'english'
+SEARCH_HEADLINE_OPTIONS = 'MaxFragments=2, MaxWords=30, MinWords=10, StartSel=<mark>, StopSel=</mark>'
+# HTML content reduced to text inside PostgreSQL
+PLAIN_CONTENT_SQL = "regexp_replace(coalesce(content, ''), '<[^>]+>', ' ', 'g')"
+LIST_FIELDS = ['id', 'title', 'slug', 'content', 'date', 'category_id', 'author_name', 'published']
 
 
 class BlogCategory(models.Model):
@@ -34,6 +42,111 @@ class BlogPost(models.Model):
             vals['slug'] = misc.slugify(vals.get('title'))
         return super().write(vals)
 
+    def init(self):
+        # Title and plain-text content, weighted so title matches rank first;
+        # a generated column keeps it current without ORM involvement.
+        self.env.cr.execute("""
+            ALTER TABLE blog_post ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('{config}', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('{config}', {content}), 'B')
+                ) STORED
+        """.format(config=SEARCH_CONFIG, content=PLAIN_CONTENT_SQL))
+        self.env.cr.execute(
+            "CREATE INDEX IF NOT EXISTS blog_post_search_vector_index ON blog_post USING gin (search_vector)")
+        # Published posts newest first, of the blog and per category:
+        # listing pages, the list API and their versions
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS blog_post_published_date_index
+                ON blog_post (date DESC, id DESC) WHERE published
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS blog_post_published_category_index
+                ON blog_post (category_id, date DESC, id DESC) WHERE published
+        """)
+
+    @api.model
+    def _search_fulltext(self, query, limit, offset=0, category_id=None):
+        """Published posts matching ``query`` (web search syntax), best first.
+
+        Only the returned page is highlighted, so the cost of snippets does
+        not grow with the number of matches. Returns ``(rows, total)`` where
+        rows are ``(id, rank, snippet)``.
+        """
+        self.flush_model(['title', 'content', 'published', 'category_id', 'date'])
+        where = "p.published AND p.search_vector @@ q.query"
+        params = {'config': SEARCH_CONFIG, 'query': query, 'limit': limit, 'offset': offset,
+                  'options': SEARCH_HEADLINE_OPTIONS}
+        if category_id:
+            where += " AND p.category_id = %(category_id)s"
+            params['category_id'] = category_id
+        self.env.cr.execute("""
+            SELECT count(*)
+              FROM blog_post p, websearch_to_tsquery(%(config)s::regconfig, %(query)s) AS q(query)
+             WHERE {where}
+        """.format(where=where), params)
+        total = self.env.cr.fetchone()[0]
+        if not total:
+            return [], 0
+        self.env.cr.execute("""
+            SELECT page.id, page.rank,
+                   ts_headline(%(config)s::regconfig, {content}, page.query, %(options)s)
+              FROM (
+                SELECT p.id, p.content, p.date, q.query, ts_rank_cd(p.search_vector, q.query) AS rank
+                  FROM blog_post p, websearch_to_tsquery(%(config)s::regconfig, %(query)s) AS q(query)
+                 WHERE {where}
+                 ORDER BY rank DESC, p.date DESC, p.id DESC
+                 LIMIT %(limit)s OFFSET %(offset)s
+              ) page
+             ORDER BY page.rank DESC, page.date DESC, page.id DESC
+        """.format(where=where, content=PLAIN_CONTENT_SQL), params)
+        return self.env.cr.fetchall(), total
+
+    @api.model
+    def _get_categories_version(self):
+        """Version of the category list shown in the sidebar of every page."""
+        self.env['blog.category'].flush_model(['name'])
+        self.env.cr.execute("SELECT max(write_date), count(*), coalesce(sum(id), 0) FROM blog_category")
+        return self.env.cr.fetchone()
+
+    @api.model
+    def _get_list_version(self, category_id=None):
+        """Version of the published posts of the blog, or of one category.
+
+        Last change, count and sum of ids: publishing, unpublishing, moving
+        or deleting a post changes at least one of them. Read from the
+        partial index on published posts, see :meth:`init`.
+        """
+        self.flush_model(['published', 'category_id'])
+        query = "SELECT max(write_date), count(*), coalesce(sum(id), 0) FROM blog_post WHERE published"
+        params = ()
+        if category_id:
+            query += " AND category_id = %s"
+            params = (category_id,)
+        self.env.cr.execute(query, params)
+        return self.env.cr.fetchone()
+
+    @api.model
+    def _get_published_posts_page(self, limit, offset=0, category_id=None, include_content=True):
+        """A page of published posts, newest first, as read by the list API.
+
+        Paged in SQL on the partial index of published posts; each post gets
+        a plain-text ``excerpt``, computed for this page only. Returns
+        ``(posts, total)``.
+        """
+        domain = [('published', '=', True)]
+        if category_id:
+            domain.append(('category_id', '=', category_id))
+        Post = self.sudo()
+        total = Post.search_count(domain)
+        fields_to_read = LIST_FIELDS if include_content else [f for f in LIST_FIELDS if f != 'content']
+        posts = Post.search(domain, order='date desc, id desc', limit=limit, offset=offset)
+        data = posts.read(fields_to_read)
+        for post, values in zip(posts, data):
+            text = html2plaintext(post.content) if post.content else ''
+            values['excerpt'] = text[:EXCERPT_LENGTH] + ('...' if len(text) > EXCERPT_LENGTH else '')
+        return data, total
+
     def name_get(self):
         result = []
         for rec in self:
@@ -1,16 +1,18 @@
 {
     'name': 'Project Form Integration',
-    'version': '19.0.1.0.0',
+    'version': '19.0.1.5.0',
     'summary': 'Project form data integration with Google Drive',
     'description': 'Extends project module to store form submissions from Next.js app',
     'category': 'Project',
     'author': 'techsaker',
     'website': 'github-url',
     'license': 'LGPL-3',
-    'depends': ['base', 'project'],
+    'depends': ['base', 'project', 'bus'],
     'data': [
         'security/ir.model.access.csv',
         'views/project_task_views.xml',
+        'views/project_task_description_templates.xml',
+        'data/ir_cron.xml',
     ],
 
 
@@ -2,39 +2,16 @@ from odoo import http
 from odoo.http import request
 import json
 import logging
-import jwt
-import datetime
-import time
-from odoo.tools import config
 
-_logger = logging.getLogger(__name__)
+from ..services.jwt_auth import decode_token, generate_token, get_request_token, jwt_required
 
-SECRET_KEY = config.get('jwt_secret')
+_logger = logging.getLogger(__name__)
 
 class AuthController(http.Controller):
 
-    def _generate_token(self, contractor_id):
-        payload = {
-            'user_id': contractor_id,
-            'exp': datetime.datetime.utcnow() + datetime.timedelta(days=1),
-            'iat': datetime.datetime.utcnow()
-        }
-        return jwt.encode(payload, SECRET_KEY, algorithm='HS256')
-
-    def _verify_token(self):
-        auth_header = request.httprequest.headers.get('Authorization')
-        if not auth_header:
-            return None
-        
-        try:
-            token = auth_header.split(" ")[1]
-            payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-            return payload.get('user_id')
-        except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, IndexError):
-            return None
-
     @http.route('/api/contractor/profile', type='http', auth='public', methods=['GET', 'OPTIONS'], csrf=False, cors='*')
-    def contractor_profile(self, **kwargs):
+    @jwt_required()
+    def contractor_profile(self, contractor=None, **kwargs):
         if request.httprequest.method == 'OPTIONS':
              return request.make_response(
                 json.dumps({'status': 'ok'}),
@@ -45,22 +22,6 @@ class AuthController(http.Controller):
                 }
             )
 
-        contractor_id = self._verify_token()
-        if not contractor_id:
-             return request.make_response(
-                json.dumps({'status': 'error', 'message': 'Unauthorized request. Invalid or missing token.'}),
-                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                status=401
-            )
-            
-        contractor = request.env['project.form.contractor'].sudo().browse(contractor_id)
-        if not contractor.exists():
-             return request.make_response(
-                json.dumps({'status': 'error', 'message': 'Contractor not found'}),
-                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                status=404
-            )
-            
         licenses = []
         for lic in contractor.license_ids:
             licenses.append({
@@ -128,7 +89,7 @@ class AuthController(http.Controller):
             contractor = request.env['project.form.contractor'].sudo().create({
                 'name': name,
                 'email': email,
-                'password': password, # TODO: Hash password in production
+                'password': password,
                 'company_name': data.get('company_name'),
                 'address': data.get('address'),
                 'phone': data.get('phone'),
@@ -146,7 +107,7 @@ class AuthController(http.Controller):
                         'state': lic.get('state'),
                     })
 
-            token = self._generate_token(contractor.id)
+            token = generate_token(contractor.id)
 
             return request.make_response(
                 json.dumps({
@@ -199,13 +160,10 @@ class AuthController(http.Controller):
                     status=400
                 )
 
-            contractor = request.env['project.form.contractor'].sudo().search([
-                ('email', '=', email),
-                ('password', '=', password) 
-            ], limit=1)
+            contractor = request.env['project.form.contractor'].sudo()._authenticate(email, password)
 
             if contractor:
-                token = self._generate_token(contractor.id)
+                token = generate_token(contractor.id)
                 return request.make_response(
                     json.dumps({
                         'status': 'success',
@@ -248,9 +206,12 @@ class AuthController(http.Controller):
                 }
             )
         
-        # In a session-based auth, we would call request.session.logout() here.
-        # Since we are currently stateless/custom, we just return success so frontend knows to clear state.
-        
+        # Tokens are stateless, so signing out revokes the token until it expires
+        token = get_request_token()
+        claims = decode_token(token) if token else None
+        if claims:
+            request.env['project.form.revoked.token'].sudo()._revoke(claims)
+
         return request.make_response(
             json.dumps({
                 'status': 'success',
@@ -1,324 +1,127 @@
 from odoo import http
 from odoo.http import request
+import datetime
+import hashlib
 import json
-import re
 import logging
-import jwt
-import datetime
-from odoo.tools import config
 from odoo.tools import html2plaintext
+from odoo.exceptions import ValidationError
+from psycopg2.errors import UniqueViolation
+from psycopg2.extensions import TransactionRollbackError
+
+from ..models.project_inherit import API_FIELDS, NORMALIZED_ADDRESS_UNIQUE_INDEX
+from ..models.project_bus import UPDATES_NOTIFICATION
+from ..services.address import normalize_address
+from ..services.jwt_auth import jwt_required
 
 _logger = logging.getLogger(__name__)
-SECRET_KEY = config.get('jwt_secret')
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+MAX_BULK_ROWS = 1000
+# Messages per response of the project updates feed
+UPDATES_MESSAGE_LIMIT = 50
+# Sections of a bulk row: a single object, or a list of objects
+BULK_OBJECT_SECTIONS = [
+    'project', 'user_profile', 'engineering_firm', 'system_summary', 'battery_info', 'site_details',
+    'electrical_details', 'advanced_electrical_details', 'optional_extra_details'
+]
+BULK_LIST_SECTIONS = ['services', 'system_components', 'uploads']
+
+SITE_DETAIL_FIELDS = ['roof_material', 'roof_pitch', 'number_of_arrays', 'ground_mount_type', 'foundation_type', 'main_panel_size', 'utility_provider', 'jurisdiction']
+ELECTRICAL_DETAIL_FIELDS = ['main_panel_size', 'bus_rating', 'main_breaker', 'pv_breaker_location', 'one_line_diagram']
+ADVANCED_ELECTRICAL_DETAIL_FIELDS = ['meter_location', 'service_entrance_type', 'subpanel_details']
+OPTIONAL_EXTRA_DETAIL_FIELDS = [
+    'miracle_watt_required', 'miracle_watt_notes', 'der_rlc_required', 'der_rlc_notes',
+    'setback_constraints', 'setback_notes', 'site_access_restrictions', 'site_access_notes',
+    'inspection_notes', 'inspection_notes_text', 'battery_sld_requested', 'battery_sld_notes'
+]
+OPTIONAL_EXTRA_DETAIL_FLAGS = [
+    'miracle_watt_required', 'der_rlc_required', 'setback_constraints',
+    'site_access_restrictions', 'inspection_notes', 'battery_sld_requested'
+]
+
+
+def parse_url_list(value):
+    """URL arrays arrive as lists, or as the JSON text of one from older clients."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return [value]
+    if value in (None, False, ''):
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def parse_api_datetime(value):
+    """Parse an ISO date or datetime (``T`` or space separated, with an
+    optional offset or ``Z``) into a naive UTC datetime.
+
+    Returns ``(datetime, is_date)``, ``is_date`` telling a bare date apart.
+    """
+    value = value.strip()
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed, len(value) == 10
+
 
 class ProjectController(http.Controller):
 
-    def _verify_token(self):
-        auth_header = request.httprequest.headers.get('Authorization')
-        if not auth_header:
-            return None
-        
+    def _get_page_limit(self, value):
+        if not value:
+            return DEFAULT_PAGE_LIMIT
         try:
-            token = auth_header.split(" ")[1]
-            payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-            return payload.get('user_id')
-        except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, IndexError):
-            return None
-
-    def _generate_project_description(self, project):
-        # Fetch related data
-        user_profile = request.env['project.form.user.profile'].sudo().search([('uuid', '=', project.user_profile_id)], limit=1)
-        submission_type = request.env['project.form.submission.type'].sudo().search([('uuid', '=', project.submission_type_id)], limit=1)
-        
-        sys_sum = request.env['project.form.system.summary'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-        site = request.env['project.form.site.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-        elec = request.env['project.form.electrical.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-        adv_elec = request.env['project.form.advanced.electrical.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-        opt_extra = request.env['project.form.optional.extra.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-        components = request.env['project.form.system.component'].sudo().search([('project_id', '=', project.uuid)])
-        uploads = request.env['project.form.upload'].sudo().search([('project_id', '=', project.uuid)])
-
-        html_description = f"""
-<div style="font-family: Arial, sans-serif; font-size: 14px;">
-    <h2 style="color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px;">
-        🏗️ {project.name or 'N/A'}
-    </h2>
-    
-    <div style="background-color: #ecf0f1; padding: 15px; border-radius: 5px; margin-bottom: 20px;">
-        <h3 style="color: #2980b9; margin-top: 0;">📋 Project Details</h3>
-        <table style="width: 100%; border-collapse: collapse;">
-            <tr>
-                <td style="padding: 8px; font-weight: bold; width: 30%;">Address:</td>
-                <td style="padding: 8px;">{project.address or 'N/A'}</td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">Type:</td>
-                <td style="padding: 8px;"><span style="background-color: #3498db; color: white; padding: 3px 10px; border-radius: 3px;">{(project.type or 'unknown').upper()}</span></td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; font-weight: bold;">Submission Type:</td>
-                <td style="padding: 8px;">{submission_type.name if submission_type else 'N/A'}</td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">General Notes:</td>
-                <td style="padding: 8px;"><em>{project.general_notes or 'None'}</em></td>
-            </tr>
-        </table>
-    </div>
-"""
-
-        if user_profile:
-            html_description += f"""
-    <div style="background-color: #e8f5e9; padding: 15px; border-radius: 5px; margin-bottom: 20px;">
-        <h3 style="color: #27ae60; margin-top: 0;">👤 Customer Information</h3>
-        <table style="width: 100%; border-collapse: collapse;">
-            <tr>
-                <td style="padding: 8px; font-weight: bold; width: 30%;">Company:</td>
-                <td style="padding: 8px;">{user_profile.company_name or 'N/A'}</td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">Contact:</td>
-                <td style="padding: 8px;">{user_profile.contact_name or 'N/A'}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; font-weight: bold;">Email:</td>
-                <td style="padding: 8px;"><a href="mailto:{user_profile.email}">{user_profile.email or 'N/A'}</a></td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">Phone:</td>
-                <td style="padding: 8px;">{user_profile.phone or 'N/A'}</td>
-            </tr>
-        </table>
-    </div>
-"""
-
-        # Services
-        html_description += """
-    <div style="background-color: #fff3e0; padding: 15px; border-radius: 5px; margin-bottom: 20px;">
-        <h3 style="color: #f39c12; margin-top: 0;">🔧 Services Requested</h3>
-        <ul style="list-style-type: none; padding-left: 0;">
-"""
-        if project.service_ids:
-            for service in project.service_ids:
-                html_description += f'<li style="padding: 5px 0;">✓ <strong>{service.name}</strong></li>'
-        else:
-            html_description += '<li style="padding: 5px 0;"><em>No services specified</em></li>'
-        html_description += "</ul></div>"
-
-        # System Summary
-        if sys_sum:
-            html_description += f"""
-    <div style="background-color: #fce4ec; padding: 15px; border-radius: 5px; margin-bottom: 20px;">
-        <h3 style="color: #e91e63; margin-top: 0;">⚡ System Summary</h3>
-        <table style="width: 100%; border-collapse: collapse;">
-            <tr>
-                <td style="padding: 8px; font-weight: bold; width: 30%;">System Size:</td>
-                <td style="padding: 8px;"><strong style="color: #e91e63; font-size: 16px;">{sys_sum.system_size} kW</strong></td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">System Type:</td>
-                <td style="padding: 8px;">{dict(sys_sum._fields['system_type'].selection).get(sys_sum.system_type) if sys_sum.system_type else 'N/A'}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; font-weight: bold;">PV Modules:</td>
-                <td style="padding: 8px;">{sys_sum.pv_modules or 'N/A'}</td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">Inverters:</td>
-                <td style="padding: 8px;">{sys_sum.inverters or 'N/A'}</td>
-            </tr>
-        </table>
-"""
-            # Battery Info
-            batt = request.env['project.form.battery.info'].sudo().search([('system_summary_id', '=', sys_sum.uuid)], limit=1)
-            if batt:
-                html_description += f"""
-        <div style="margin-top: 15px; padding: 10px; background-color: #fff; border-left: 4px solid #9c27b0;">
-            <strong style="color: #9c27b0;">🔋 Battery:</strong> {batt.qty}x {batt.model}
-        </div>
-"""
-            html_description += "</div>"
-
-        # Site Details
-        if site:
-             html_description += f"""
-    <div style="background-color: #e3f2fd; padding: 15px; border-radius: 5px; margin-bottom: 20px;">
-        <h3 style="color: #1976d2; margin-top: 0;">🏠 Site Details</h3>
-        <table style="width: 100%; border-collapse: collapse;">
-            <tr>
-                <td style="padding: 8px; font-weight: bold; width: 30%;">Roof Material:</td>
-                <td style="padding: 8px;">{site.roof_material or 'N/A'}</td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">Roof Pitch:</td>
-                <td style="padding: 8px;">{site.roof_pitch or 'N/A'}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; font-weight: bold;">Number of Arrays:</td>
-                <td style="padding: 8px;">{site.number_of_arrays or 0}</td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">Utility Provider:</td>
-                <td style="padding: 8px;">{site.utility_provider or 'N/A'}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; font-weight: bold;">Jurisdiction:</td>
-                <td style="padding: 8px;">{site.jurisdiction or 'N/A'}</td>
-            </tr>
-        </table>
-    </div>
-"""
-
-        # Electrical Details
-        if elec:
-            html_description += f"""
-    <div style="background-color: #fff9c4; padding: 15px; border-radius: 5px; margin-bottom: 20px;">
-        <h3 style="color: #f57c00; margin-top: 0;">⚙️ Electrical Details</h3>
-        <table style="width: 100%; border-collapse: collapse;">
-            <tr>
-                <td style="padding: 8px; font-weight: bold; width: 30%;">Main Panel Size:</td>
-                <td style="padding: 8px;">{elec.main_panel_size or 'N/A'}</td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">Bus Rating:</td>
-                <td style="padding: 8px;">{elec.bus_rating or 'N/A'}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; font-weight: bold;">Main Breaker:</td>
-                <td style="padding: 8px;">{elec.main_breaker or 'N/A'}</td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">PV Breaker Location:</td>
-                <td style="padding: 8px;">{dict(elec._fields['pv_breaker_location'].selection).get(elec.pv_breaker_location) if elec.pv_breaker_location else 'N/A'}</td>
-            </tr>
-        </table>
-    </div>
-"""
-
-        # Advanced Electrical Details
-        if adv_elec:
-             html_description += f"""
-    <div style="background-color: #f3e5f5; padding: 15px; border-radius: 5px; margin-bottom: 20px;">
-        <h3 style="color: #7b1fa2; margin-top: 0;">🔌 Advanced Electrical Details</h3>
-        <table style="width: 100%; border-collapse: collapse;">
-            <tr>
-                <td style="padding: 8px; font-weight: bold; width: 30%;">Meter Location:</td>
-                <td style="padding: 8px;">{adv_elec.meter_location or 'N/A'}</td>
-            </tr>
-            <tr style="background-color: #fff;">
-                <td style="padding: 8px; font-weight: bold;">Service Entrance Type:</td>
-                <td style="padding: 8px;">{adv_elec.service_entrance_type or 'N/A'}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; font-weight: bold;">Subpanel Details:</td>
-                <td style="padding: 8px;">{adv_elec.subpanel_details or 'N/A'}</td>
-            </tr>
-        </table>
-    </div>
-"""
-
-        # Optional Extra Details
-        if opt_extra:
-            extras_list = []
-            if opt_extra.miracle_watt_required:
-                extras_list.append(f"<li>✓ <strong>Miracle Watt Required:</strong> {opt_extra.miracle_watt_notes or 'Yes'}</li>")
-            if opt_extra.der_rlc_required:
-                extras_list.append(f"<li>✓ <strong>DER RLC Required:</strong> {opt_extra.der_rlc_notes or 'Yes'}</li>")
-            if opt_extra.setback_constraints:
-                extras_list.append(f"<li>⚠️ <strong>Setback Constraints:</strong> {opt_extra.setback_notes or 'Yes'}</li>")
-            if opt_extra.site_access_restrictions:
-                extras_list.append(f"<li>⚠️ <strong>Site Access Restrictions:</strong> {opt_extra.site_access_notes or 'Yes'}</li>")
-            if opt_extra.inspection_notes:
-                extras_list.append(f"<li>📝 <strong>Inspection Notes:</strong> {opt_extra.inspection_notes_text or 'Yes'}</li>")
-            if opt_extra.battery_sld_requested:
-                extras_list.append(f"<li>✓ <strong>Battery SLD Requested:</strong> {opt_extra.battery_sld_notes or 'Yes'}</li>")
-            
-            if extras_list:
-                html_description += f"""
-    <div style="background-color: #ffe0b2; padding: 15px; border-radius: 5px; margin-bottom: 20px;">
-        <h3 style="color: #e65100; margin-top: 0;">📌 Optional Extra Details</h3>
-        <ul style="list-style-type: none; padding-left: 0;">
-            {''.join(extras_list)}
-        </ul>
-    </div>
-"""
-
-        # System Components
-        if components:
-            html_description += f"""
-    <div style="background-color: #e0f2f1; padding: 15px; border-radius: 5px; margin-bottom: 20px;">
-        <h3 style="color: #00695c; margin-top: 0;">🔩 System Components ({len(components)})</h3>
-        <table style="width: 100%; border-collapse: collapse; border: 1px solid #ddd;">
-            <thead>
-                <tr style="background-color: #00695c; color: white;">
-                    <th style="padding: 10px; text-align: left;">Type</th>
-                    <th style="padding: 10px; text-align: left;">Make/Model</th>
-                    <th style="padding: 10px; text-align: center;">Qty</th>
-                    <th style="padding: 10px; text-align: left;">Notes</th>
-                </tr>
-            </thead>
-            <tbody>
-"""
-            for comp in components:
-                html_description += f"""
-                <tr style="border-bottom: 1px solid #ddd;">
-                    <td style="padding: 8px;">{comp.type or 'N/A'}</td>
-                    <td style="padding: 8px;"><strong>{comp.make_model or 'N/A'}</strong></td>
-                    <td style="padding: 8px; text-align: center;">{comp.qty or 0}</td>
-                    <td style="padding: 8px;"><em>{comp.notes or '-'}</em></td>
-                </tr>
-"""
-            html_description += "</tbody></table></div>"
-
-        # Uploads
-        if uploads:
-            html_description += f"""
-    <div style="background-color: #fafafa; padding: 15px; border-radius: 5px; margin-bottom: 20px; border: 2px dashed #9e9e9e;">
-        <h3 style="color: #424242; margin-top: 0;">📎 Uploaded Files ({len(uploads)})</h3>
-        <ul style="list-style-type: none; padding-left: 0;">
-"""
-            for upload in uploads:
-                is_image = False
-                if upload.mime_type and upload.mime_type.startswith('image/'):
-                    is_image = True
-                elif upload.name and upload.name.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp')):
-                    is_image = True
-                
-                image_url = upload.url
-                if is_image and 'drive.google.com' in upload.url:
-                    match = re.search(r'/d/([a-zA-Z0-9_-]+)', upload.url)
-                    if match:
-                        file_id = match.group(1)
-                        image_url = f'https://drive.google.com/uc?export=view&id={file_id}'
-                    else:
-                        match = re.search(r'id=([a-zA-Z0-9_-]+)', upload.url)
-                        if match:
-                            file_id = match.group(1)
-                            image_url = f'https://drive.google.com/uc?export=view&id={file_id}'
-
-                html_description += f"""
-            <li style="padding: 8px 0; border-bottom: 1px solid #eee;">
-                <a href="{upload.url}" target="_blank" style="color: #1976d2; text-decoration: none; font-weight: bold;">
-                    📄 {upload.name}
-                </a>
-                <span style="background-color: #e0e0e0; padding: 2px 8px; border-radius: 3px; margin-left: 10px; font-size: 12px;">
-                    {upload.category or 'General'}
-                </span>
-"""
-                if is_image:
-                     html_description += f"""
-                <div style="margin-top: 10px;">
-                    <img src="{image_url}" alt="{upload.name}" style="max-width: 100%; max-height: 400px; border-radius: 5px; border: 1px solid #ddd;">
-                </div>
-"""
-                html_description += "</li>"
-            html_description += "</ul></div>"
-
-        html_description += "</div>"
-        return html_description
+            limit = int(value)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid limit '%s'" % value)
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+        return min(limit, MAX_PAGE_LIMIT)
+
+    def _get_project_filter_domain(self, params):
+        """Translate the list filters of /api/projects into an ORM domain.
+
+        ``status``, ``type`` and ``submission_type_id`` accept a comma separated
+        list of values; ``created_from``/``created_to`` and
+        ``updated_from``/``updated_to`` accept ISO dates or datetimes. A bare
+        date in ``*_to`` includes that whole day.
+        """
+        domain = []
+        for param in ('status', 'type', 'submission_type_id'):
+            if params.get(param):
+                values = [v.strip() for v in params[param].split(',') if v.strip()]
+                domain.append((param, 'in', values))
+        for param, field_name, operator in (
+            ('created_from', 'created_at', '>='),
+            ('created_to', 'created_at', '<='),
+            ('updated_from', 'updated_at', '>='),
+            ('updated_to', 'updated_at', '<='),
+        ):
+            if params.get(param):
+                try:
+                    value, is_date = parse_api_datetime(params[param])
+                except ValueError:
+                    raise ValueError("Invalid date for %s: '%s'" % (param, params[param]))
+                if is_date and operator == '<=':
+                    # up to the end of that day
+                    operator, value = '<', value + datetime.timedelta(days=1)
+                domain.append((field_name, operator, value))
+        return domain
+
+    def _find_engineering_firm(self, firm_id_val):
+        if not firm_id_val:
+            return request.env['project.form.engineering.firm']
+        return request.env['project.form.engineering.firm'].sudo().search([
+            '|', ('uuid', '=', firm_id_val), ('name', '=', firm_id_val)
+        ], limit=1)
 
     @http.route('/api/create-project', type='http', auth='public', methods=['POST', 'OPTIONS'], csrf=False, cors='*')
-    def create_project(self, **kwargs):
+    @jwt_required(optional=True)
+    def create_project(self, contractor=None, **kwargs):
         if request.httprequest.method == 'OPTIONS':
             return request.make_response(
                 json.dumps({'status': 'ok'}),
@@ -440,7 +243,8 @@ class ProjectController(http.Controller):
                     else:
                         _logger.warning("Service with name '%s' not found", service_data.get('name'))
 
-        contractor_id = data.get('contractor_id')
+        # a signed-in contractor owns the projects it submits
+        contractor_id = data.get('contractor_id') or (contractor.id if contractor else None)
 
         try:
             # 4. Create Project
@@ -463,12 +267,23 @@ class ProjectController(http.Controller):
             if contractor_id:
                 project_vals['contractor_id'] = contractor_id
 
-            project = request.env['project.form.project'].sudo().create(project_vals)
+            firm = self._find_engineering_firm(
+                engineering_firm_data.get('id') or engineering_firm_data.get('uuid') or data.get('engineering_firm_id'))
+            if firm:
+                project_vals['engineering_firm_id'] = firm.id
+
+            # a savepoint keeps the transaction usable when the create fails
+            with request.env.cr.savepoint():
+                project = request.env['project.form.project'].sudo().create(project_vals)
         except Exception as e:
+            message = str(e)
+            if isinstance(e, UniqueViolation) and e.diag.constraint_name == NORMALIZED_ADDRESS_UNIQUE_INDEX:
+                # the same duplicate as the constraint reports, caught by the index in a race
+                message = "The address '%s' is already associated with another project." % project_vals['address']
             _logger.exception("Failed to create project")
             error_response = json.dumps({
                 'status': 'error',
-                'message': str(e),
+                'message': message,
                 'details': 'Failed to create project. Please check the logs for more details.'
             })
             return request.make_response(
@@ -487,7 +302,7 @@ class ProjectController(http.Controller):
             if system_summary_data:
                 _logger.info("Creating system summary with data: %s", system_summary_data)
                 system_summary = request.env['project.form.system.summary'].sudo().create({
-                    'project_id': project.uuid,
+                    'project_id': project.id,
                     'system_size': system_summary_data.get('system_size'),
                     'system_type': system_summary_data.get('system_type'),
                     'pv_modules': system_summary_data.get('pv_modules'),
@@ -498,15 +313,11 @@ class ProjectController(http.Controller):
 
                 if battery_info_data:
                     _logger.info("Creating battery info with data: %s", battery_info_data)
-                    image_urls = battery_info_data.get('image', [])
-                    if isinstance(image_urls, list):
-                        image_urls = json.dumps(image_urls)
-                    
                     battery_info = request.env['project.form.battery.info'].sudo().create({
-                        'system_summary_id': system_summary.uuid,
+                        'system_summary_id': system_summary.id,
                         'qty': battery_info_data.get('qty'),
                         'model': battery_info_data.get('model'),
-                        'image': image_urls,
+                        'image': parse_url_list(battery_info_data.get('image')),
                     })
                     battery_info_id = battery_info.uuid
                     _logger.info("Battery info created with ID: %s", battery_info_id)
@@ -518,7 +329,7 @@ class ProjectController(http.Controller):
             if site_details_data:
                 _logger.info("Creating site details with data: %s", site_details_data)
                 site_details = request.env['project.form.site.detail'].sudo().create({
-                    'project_id': project.uuid,
+                    'project_id': project.id,
                     'roof_material': site_details_data.get('roof_material'),
                     'roof_pitch': site_details_data.get('roof_pitch'),
                     'number_of_arrays': site_details_data.get('number_of_arrays'),
@@ -537,12 +348,10 @@ class ProjectController(http.Controller):
         try:
             if electrical_details_data:
                 _logger.info("Creating electrical details with data: %s", electrical_details_data)
-                one_line_diagram = electrical_details_data.get('one_line_diagram', [])
-                if isinstance(one_line_diagram, list):
-                    one_line_diagram = json.dumps(one_line_diagram)
+                one_line_diagram = parse_url_list(electrical_details_data.get('one_line_diagram'))
                 
                 electrical_details = request.env['project.form.electrical.detail'].sudo().create({
-                    'project_id': project.uuid,
+                    'project_id': project.id,
                     'main_panel_size': electrical_details_data.get('main_panel_size'),
                     'bus_rating': electrical_details_data.get('bus_rating'),
                     'main_breaker': electrical_details_data.get('main_breaker'),
@@ -559,7 +368,7 @@ class ProjectController(http.Controller):
             if advanced_electrical_details_data:
                 _logger.info("Creating advanced electrical details with data: %s", advanced_electrical_details_data)
                 advanced_electrical_details = request.env['project.form.advanced.electrical.detail'].sudo().create({
-                    'project_id': project.uuid,
+                    'project_id': project.id,
                     'meter_location': advanced_electrical_details_data.get('meter_location'),
                     'service_entrance_type': advanced_electrical_details_data.get('service_entrance_type'),
                     'subpanel_details': advanced_electrical_details_data.get('subpanel_details'),
@@ -574,7 +383,7 @@ class ProjectController(http.Controller):
             if optional_extra_details_data:
                 _logger.info("Creating optional extra details with data: %s", optional_extra_details_data)
                 optional_extra_details = request.env['project.form.optional.extra.detail'].sudo().create({
-                    'project_id': project.uuid,
+                    'project_id': project.id,
                     'miracle_watt_required': optional_extra_details_data.get('miracle_watt_required', False),
                     'miracle_watt_notes': optional_extra_details_data.get('miracle_watt_notes'),
                     'der_rlc_required': optional_extra_details_data.get('der_rlc_required', False),
@@ -597,12 +406,10 @@ class ProjectController(http.Controller):
         try:
             for component_data in system_components_data:
                 _logger.info("Creating system component with data: %s", component_data)
-                attachment_urls = component_data.get('attachment', [])
-                if isinstance(attachment_urls, list):
-                    attachment_urls = json.dumps(attachment_urls)
+                attachment_urls = parse_url_list(component_data.get('attachment'))
                 
                 component = request.env['project.form.system.component'].sudo().create({
-                    'project_id': project.uuid,
+                    'project_id': project.id,
                     'type': component_data.get('type'),
                     'make_model': component_data.get('make_model'),
                     'qty': component_data.get('qty'),
@@ -619,7 +426,7 @@ class ProjectController(http.Controller):
             for upload_data in uploads_data:
                 _logger.info("Creating upload with data: %s", upload_data)
                 upload = request.env['project.form.upload'].sudo().create({
-                    'project_id': project.uuid,
+                    'project_id': project.id,
                     'url': upload_data.get('url'),
                     'name': upload_data.get('name'),
                     'category': upload_data.get('category'),
@@ -631,141 +438,8 @@ class ProjectController(http.Controller):
         except Exception as e:
             _logger.exception("Failed to create uploads: %s", str(e))
 
-        # Create Odoo Task in Project Module
-        odoo_task_id = None
-        try:
-            # Find or create default Odoo project for form submissions
-            odoo_project = request.env['project.project'].sudo().search([
-                ('name', '=', 'Form Submissions')
-            ], limit=1)
-            
-            if not odoo_project:
-                _logger.info("Creating 'Form Submissions' project in Odoo")
-                odoo_project = request.env['project.project'].sudo().create({
-                    'name': 'Form Submissions',
-                    'description': 'Auto-generated tasks from project form API submissions'
-                })
-            
-            # ===== 1. PREPARE TAGS FROM EXISTING DATA =====
-            tag_ids = []
-            tag_names = []
-            
-            # Add project type as tag
-            if project.type:
-                tag_names.append(project.type.capitalize())
-            
-            # Add submission type as tag
-            if submission_type:
-                tag_names.append(submission_type.name)
-            
-            # Add service names as tags
-            if service_ids:
-                services = request.env['project.form.service'].sudo().search([('uuid', 'in', service_ids)])
-                for service in services:
-                    tag_names.append(service.name)
-            
-            # Add system type as tag
-            if system_summary_id:
-                sys_sum = request.env['project.form.system.summary'].sudo().search([('uuid', '=', system_summary_id)], limit=1)
-                if sys_sum and sys_sum.system_type:
-                    tag_names.append(sys_sum.system_type.capitalize())
-            
-            # Create or find tags
-            for tag_name in tag_names:
-                tag = request.env['project.tags'].sudo().search([('name', '=', tag_name)], limit=1)
-                if not tag:
-                    tag = request.env['project.tags'].sudo().create({'name': tag_name})
-                tag_ids.append(tag.id)
-            
-            _logger.info("Created/found tags: %s", tag_names)
-            
-            # ===== 2. CALCULATE SMART PRIORITY =====
-            priority = '0'  # Default: Normal
-            
-            if system_summary_id:
-                sys_sum = request.env['project.form.system.summary'].sudo().search([('uuid', '=', system_summary_id)], limit=1)
-                if sys_sum and sys_sum.system_size:
-                    if sys_sum.system_size > 20:
-                        priority = '2'  # Very High
-                    elif sys_sum.system_size >= 10:
-                        priority = '1'  # High
-            
-            # Lower priority if critical data is missing
-            if not electrical_details_id or not site_details_id:
-                if priority == '2':
-                    priority = '1'
-                elif priority == '1':
-                    priority = '0'
-            
-            _logger.info("Calculated priority: %s", priority)
-            
-            # ===== 3. BUILD RICH HTML DESCRIPTION =====
-            html_description = self._generate_project_description(project)
-            
-            _logger.info("Generated HTML description with %d characters", len(html_description))
-            
-            # ===== 4. FIND OR CREATE CUSTOMER/PARTNER =====
-            partner = request.env['res.partner'].sudo().search([('email', '=', user_profile.email)], limit=1)
-            if not partner:
-                partner = request.env['res.partner'].sudo().create({
-                    'name': user_profile.company_name or user_profile.contact_name,
-                    'email': user_profile.email,
-                    'phone': user_profile.phone,
-                    'is_company': True if user_profile.company_name else False,
-                })
-                _logger.info("Created partner for %s", user_profile.email)
-            
-            # ===== 5. FIND APPROPRIATE STAGE =====
-            stage = request.env['project.task.type'].sudo().search([
-                ('project_ids', 'in', [odoo_project.id]),
-                ('name', '=', 'New Job Creation')
-            ], limit=1)
-            
-            if not stage:
-                # Get first stage of the project
-                stage = request.env['project.task.type'].sudo().search([
-                    ('project_ids', 'in', [odoo_project.id])
-                ], limit=1)
-            
-            # ===== 6. CREATE ODOO TASK WITH ALL ENHANCEMENTS =====
-            task_values = {
-                'name': f"{project.name} - {project.type.upper()}",
-                'project_id': odoo_project.id,
-                'description': html_description,
-                'priority': priority,
-                'partner_id': partner.id if partner else False,
-                'email_from': user_profile.email,
-            }
-
-            # Add engineering firm
-            firm_id_val = engineering_firm_data.get('id') or engineering_firm_data.get('uuid') or data.get('engineering_firm_id')
-            if firm_id_val:
-                firm = request.env['project.form.engineering.firm'].sudo().search([
-                    '|', ('uuid', '=', firm_id_val), ('name', '=', firm_id_val)
-                ], limit=1)
-                if firm:
-                    task_values['engineering_firm_id'] = firm.id
-            
-            # Add tags
-            if tag_ids:
-                task_values['tag_ids'] = [(6, 0, tag_ids)]
-            
-            # Add stage
-            if stage:
-                task_values['stage_id'] = stage.id
-            
-            odoo_task = request.env['project.task'].sudo().create(task_values)
-            
-            odoo_task_id = odoo_task.id
-            
-            # Update project with task ID
-            project.write({'odoo_task_id': odoo_task_id})
-            
-            _logger.info("Created enhanced Odoo task %s for project %s with %d tags, priority %s", 
-                        odoo_task_id, project.uuid, len(tag_ids), priority)
-        except Exception as e:
-            _logger.exception("Failed to create Odoo task: %s", str(e))
-            # Don't fail the whole request if task creation fails
+        # The Odoo task is created in the background once the form data is committed
+        project._schedule_task_sync()
 
         response_data = json.dumps({
             'status': 'success',
@@ -779,7 +453,8 @@ class ProjectController(http.Controller):
             'optional_extra_details_id': optional_extra_details_id,
             'system_component_ids': system_component_ids,
             'upload_ids': upload_ids,
-            'odoo_task_id': odoo_task_id,
+            'odoo_task_id': None,
+            'task_sync_state': project.task_sync_state,
             'contractor_id': project.contractor_id.id if project.contractor_id else None,
         })
         
@@ -797,9 +472,500 @@ class ProjectController(http.Controller):
 
 
 
+### http://localhost:8069/api/projects/bulk
+    @http.route('/api/projects/bulk', type='http', auth='public', methods=['POST', 'OPTIONS'], csrf=False, cors='*')
+    @jwt_required(optional=True)
+    def bulk_create_projects(self, contractor=None, **kwargs):
+        """Create many submissions in one transaction.
+
+        The body is a JSON array (or ``{"projects": [...]}``) or NDJSON, one
+        create-project payload per row. Every row is validated up front,
+        creates are batched per model and a bad row is reported in its own
+        result without aborting the others.
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return request.make_response(
+                json.dumps({'status': 'ok'}),
+                headers={
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                }
+            )
+
+        try:
+            rows = self._parse_bulk_rows(request.httprequest.data.decode('utf-8'))
+            if not rows:
+                raise ValueError("No rows to import")
+            if len(rows) > MAX_BULK_ROWS:
+                raise ValueError("At most %d rows can be imported per request" % MAX_BULK_ROWS)
+        except ValueError as e:
+            return request.make_response(
+                json.dumps({'status': 'error', 'message': str(e)}),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                status=400
+            )
+
+        try:
+            results = self._bulk_create(rows)
+            failed = sum(1 for result in results if result['status'] == 'error')
+            return request.make_response(
+                json.dumps({
+                    'status': 'success' if not failed else 'partial',
+                    'created': len(results) - failed,
+                    'failed': failed,
+                    'results': results,
+                }),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+            )
+        except Exception as e:
+            request.env.cr.rollback()
+            _logger.exception("Bulk project import failed")
+            return request.make_response(
+                json.dumps({'status': 'error', 'message': str(e)}),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                status=500
+            )
+
+    def _parse_bulk_rows(self, body):
+        body = body.strip()
+        if not body:
+            return []
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if payload is None:
+            # NDJSON: one JSON document per line
+            rows = []
+            for line_no, line in enumerate(body.splitlines(), 1):
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    raise ValueError("Invalid JSON on line %d" % line_no)
+            return rows
+        if isinstance(payload, dict):
+            payload = payload.get('projects', [payload])
+        if not isinstance(payload, list):
+            raise ValueError("Expected a JSON array of projects")
+        return payload
+
+    def _check_bulk_row(self, row):
+        """Return the errors in the shape of a bulk ``row``, so a malformed
+        row is reported on its own instead of failing the whole import."""
+        if not isinstance(row, dict):
+            return ["Row must be a JSON object"]
+        errors = []
+        for key in BULK_OBJECT_SECTIONS:
+            if row.get(key) and not isinstance(row[key], dict):
+                errors.append("%s must be an object" % key)
+        for key in BULK_LIST_SECTIONS:
+            value = row.get(key)
+            if not value:
+                continue
+            if not isinstance(value, list):
+                errors.append("%s must be a list" % key)
+            elif key == 'services':
+                # services are objects, or their uuid or name
+                if not all(isinstance(item, (dict, str, int)) for item in value):
+                    errors.append("services must only contain objects, ids or names")
+            elif not all(isinstance(item, dict) for item in value):
+                errors.append("%s must only contain objects" % key)
+        return errors
+
+    def _create_in_batch(self, model, items, errors):
+        """Create ``items`` (a list of ``(row index, vals)``) with one ``create``.
+
+        If the batch fails, fall back to one savepoint per item so only the
+        faulty rows are reported in ``errors``. Returns ``(row index, record)``
+        pairs for the records that were created.
+        """
+        if not items:
+            return []
+        Model = request.env[model].sudo()
+        try:
+            with request.env.cr.savepoint():
+                records = Model.create([vals for _index, vals in items])
+            return list(zip([index for index, _vals in items], records))
+        except Exception as e:
+            _logger.warning("Batch create of %d %s failed, retrying row by row: %s", len(items), model, e)
+        created = []
+        for index, vals in items:
+            try:
+                with request.env.cr.savepoint():
+                    created.append((index, Model.create(vals)))
+            except Exception as e:
+                errors.setdefault(index, []).append("%s: %s" % (model, e))
+        return created
+
+    def _bulk_create(self, rows):
+        env = request.env
+        errors = {}
+        warnings = {}
+
+        for index, row in enumerate(rows):
+            row_errors = self._check_bulk_row(row)
+            if row_errors:
+                errors[index] = row_errors
+        # malformed rows take no part in the lookups below
+        valid_rows = [None if index in errors else row for index, row in enumerate(rows)]
+
+        def section(row, key):
+            value = row.get(key) if isinstance(row, dict) else None
+            return value if value else ({} if key not in BULK_LIST_SECTIONS else [])
+
+        # ===== 1. RESOLVE LOOKUPS ONCE FOR THE WHOLE BATCH =====
+        st_uuids = {section(r, 'project').get('submission_type_id') for r in valid_rows} - {None}
+        st_names = {section(r, 'project').get('submission_type_name') for r in valid_rows} - {None}
+        SubmissionType = env['project.form.submission.type'].sudo()
+        st_by_uuid = {st.uuid: st for st in SubmissionType.search([('uuid', 'in', list(st_uuids))])} if st_uuids else {}
+        st_by_name = {st.name: st for st in SubmissionType.search([('name', 'in', list(st_names))])} if st_names else {}
+
+        service_keys = set()
+        for row in valid_rows:
+            for service_data in section(row, 'services'):
+                if isinstance(service_data, dict):
+                    service_keys.add(service_data.get('id') or service_data.get('uuid') or service_data.get('name'))
+                else:
+                    service_keys.add(service_data)
+        service_keys.discard(None)
+        services = env['project.form.service'].sudo().search([
+            '|', ('uuid', 'in', list(service_keys)), ('name', 'in', list(service_keys))
+        ]) if service_keys else env['project.form.service']
+        service_map = {}
+        for service in services:
+            service_map[service.uuid] = service.id
+            service_map[service.name] = service.id
+
+        emails = {section(r, 'user_profile').get('email') for r in valid_rows} - {None}
+        profile_by_email = {
+            p.email: p for p in env['project.form.user.profile'].sudo().search([('email', 'in', list(emails))])
+        } if emails else {}
+
+        contractor_ids = set()
+        for row in valid_rows:
+            if isinstance(row, dict) and str(row.get('contractor_id') or '').isdigit():
+                contractor_ids.add(int(row['contractor_id']))
+        valid_contractors = set(env['project.form.contractor'].sudo().browse(list(contractor_ids)).exists().ids)
+
+        addresses = {normalize_address(section(r, 'project').get('address')) for r in valid_rows} - {None, ''}
+        taken_addresses = set(env['project.form.project'].sudo().search(
+            [('normalized_address', 'in', list(addresses))]).mapped('normalized_address')) if addresses else set()
+
+        firm_keys = set()
+        for row in valid_rows:
+            firm_data = section(row, 'engineering_firm')
+            firm_keys.add(firm_data.get('id') or firm_data.get('uuid') or (row.get('engineering_firm_id') if isinstance(row, dict) else None))
+        firm_keys.discard(None)
+        firm_map = {}
+        if firm_keys:
+            for firm in env['project.form.engineering.firm'].sudo().search([
+                '|', ('uuid', 'in', list(firm_keys)), ('name', 'in', list(firm_keys))
+            ]):
+                firm_map.setdefault(firm.uuid, firm)
+                firm_map.setdefault(firm.name, firm)
+
+        # ===== 2. VALIDATE EVERY ROW UP FRONT =====
+        prepared = []
+        new_profiles = {}
+        seen_addresses = set()
+        for index, row in enumerate(valid_rows):
+            if row is None:
+                continue
+            row_errors = []
+            project_data = section(row, 'project')
+            profile_data = section(row, 'user_profile')
+
+            for key in ('name', 'address', 'type'):
+                if not project_data.get(key):
+                    row_errors.append("project.%s is required" % key)
+
+            submission_type = None
+            if project_data.get('submission_type_id'):
+                submission_type = st_by_uuid.get(project_data['submission_type_id'])
+                if not submission_type:
+                    row_errors.append("Submission type with ID %s does not exist" % project_data['submission_type_id'])
+            elif project_data.get('submission_type_name'):
+                submission_type = st_by_name.get(project_data['submission_type_name'])
+                if not submission_type:
+                    row_errors.append("Submission type with name '%s' does not exist" % project_data['submission_type_name'])
+            else:
+                row_errors.append("project.submission_type_id or project.submission_type_name is required")
+
+            email = profile_data.get('email')
+            if not email:
+                row_errors.append("user_profile.email is required")
+            elif email not in profile_by_email and email not in new_profiles:
+                if not profile_data.get('company_name') or not profile_data.get('contact_name'):
+                    row_errors.append("user_profile.company_name and contact_name are required for a new profile")
+
+            contractor_id = row.get('contractor_id')
+            if str(contractor_id or '').isdigit():
+                contractor_id = int(contractor_id)
+            if contractor_id and contractor_id not in valid_contractors:
+                row_errors.append("Contractor %s does not exist" % contractor_id)
+
+            address = project_data.get('address')
+            normalized_address = normalize_address(address)
+            if normalized_address and contractor_id and (
+                    normalized_address in taken_addresses or normalized_address in seen_addresses):
+                row_errors.append("The address '%s' is already associated with another project." % address)
+
+            service_ids = []
+            for service_data in section(row, 'services'):
+                key = service_data
+                if isinstance(service_data, dict):
+                    key = service_data.get('id') or service_data.get('uuid') or service_data.get('name')
+                if key in service_map:
+                    service_ids.append(service_map[key])
+                else:
+                    warnings.setdefault(index, []).append("Service '%s' not found" % key)
+
+            if row_errors:
+                errors[index] = row_errors
+                continue
+
+            if normalized_address:
+                seen_addresses.add(normalized_address)
+            if email not in profile_by_email and email not in new_profiles:
+                new_profiles[email] = {
+                    'company_name': profile_data.get('company_name'),
+                    'contact_name': profile_data.get('contact_name'),
+                    'email': email,
+                    'phone': profile_data.get('phone'),
+                }
+            firm_data = section(row, 'engineering_firm')
+            firm_key = firm_data.get('id') or firm_data.get('uuid') or row.get('engineering_firm_id')
+            firm = firm_map.get(firm_key) if firm_key else None
+            prepared.append({
+                'index': index,
+                'row': row,
+                'email': email,
+                'project_vals': {
+                    'name': project_data.get('name'),
+                    'address': address,
+                    'type': project_data.get('type'),
+                    'submission_type_id': submission_type.uuid,
+                    'general_notes': project_data.get('general_notes'),
+                    'service_ids': [(6, 0, list(dict.fromkeys(service_ids)))] if service_ids else False,
+                    'contractor_id': contractor_id or False,
+                    'engineering_firm_id': firm.id if firm else False,
+                },
+            })
+
+        # ===== 3. USER PROFILES =====
+        if new_profiles:
+            for profile in env['project.form.user.profile'].sudo().create(list(new_profiles.values())):
+                profile_by_email[profile.email] = profile
+
+        # ===== 4. PROJECTS =====
+        items = []
+        for item in prepared:
+            item['project_vals']['user_profile_id'] = profile_by_email[item['email']].uuid
+            items.append((item['index'], item['project_vals']))
+        projects = dict(self._create_in_batch('project.form.project', items, errors))
+        prepared = [item for item in prepared if item['index'] in projects]
+
+        # ===== 5. RELATED MODELS, ONE CREATE PER MODEL =====
+        summary_items, site_items, elec_items, adv_items, opt_items, comp_items, upload_items = [], [], [], [], [], [], []
+        for item in prepared:
+            index, row, project_id = item['index'], item['row'], projects[item['index']].id
+            ss_data = section(row, 'system_summary')
+            if ss_data:
+                summary_items.append((index, {
+                    'project_id': project_id,
+                    'system_size': ss_data.get('system_size'),
+                    'system_type': ss_data.get('system_type'),
+                    'pv_modules': ss_data.get('pv_modules'),
+                    'inverters': ss_data.get('inverters'),
+                }))
+            sd_data = section(row, 'site_details')
+            if sd_data:
+                site_items.append((index, dict(
+                    {k: sd_data.get(k) for k in SITE_DETAIL_FIELDS}, project_id=project_id)))
+            ed_data = section(row, 'electrical_details')
+            if ed_data:
+                vals = {k: ed_data.get(k) for k in ELECTRICAL_DETAIL_FIELDS}
+                vals['one_line_diagram'] = parse_url_list(vals.get('one_line_diagram'))
+                elec_items.append((index, dict(vals, project_id=project_id)))
+            aed_data = section(row, 'advanced_electrical_details')
+            if aed_data:
+                adv_items.append((index, dict(
+                    {k: aed_data.get(k) for k in ADVANCED_ELECTRICAL_DETAIL_FIELDS}, project_id=project_id)))
+            oed_data = section(row, 'optional_extra_details')
+            if oed_data:
+                vals = {k: oed_data.get(k) for k in OPTIONAL_EXTRA_DETAIL_FIELDS}
+                for k in OPTIONAL_EXTRA_DETAIL_FIELDS:
+                    if k in OPTIONAL_EXTRA_DETAIL_FLAGS:
+                        vals[k] = oed_data.get(k, False)
+                opt_items.append((index, dict(vals, project_id=project_id)))
+            for comp_data in section(row, 'system_components'):
+                attachment_urls = parse_url_list(comp_data.get('attachment'))
+                comp_items.append((index, {
+                    'project_id': project_id,
+                    'type': comp_data.get('type'),
+                    'make_model': comp_data.get('make_model'),
+                    'qty': comp_data.get('qty'),
+                    'attachment': attachment_urls,
+                    'notes': comp_data.get('notes'),
+                }))
+            for upload_data in section(row, 'uploads'):
+                upload_items.append((index, {
+                    'project_id': project_id,
+                    'url': upload_data.get('url'),
+                    'name': upload_data.get('name'),
+                    'category': upload_data.get('category'),
+                    'mime_type': upload_data.get('mime_type'),
+                    'size': upload_data.get('size'),
+                }))
+
+        summaries = dict(self._create_in_batch('project.form.system.summary', summary_items, warnings))
+        battery_items = []
+        for item in prepared:
+            bi_data = section(item['row'], 'battery_info')
+            if bi_data and item['index'] in summaries:
+                image_urls = parse_url_list(bi_data.get('image'))
+                battery_items.append((item['index'], {
+                    'system_summary_id': summaries[item['index']].id,
+                    'qty': bi_data.get('qty'),
+                    'model': bi_data.get('model'),
+                    'image': image_urls,
+                }))
+        self._create_in_batch('project.form.battery.info', battery_items, warnings)
+        self._create_in_batch('project.form.site.detail', site_items, warnings)
+        self._create_in_batch('project.form.electrical.detail', elec_items, warnings)
+        self._create_in_batch('project.form.advanced.electrical.detail', adv_items, warnings)
+        self._create_in_batch('project.form.optional.extra.detail', opt_items, warnings)
+        self._create_in_batch('project.form.system.component', comp_items, warnings)
+        self._create_in_batch('project.form.upload', upload_items, warnings)
+
+        # ===== 6. ODOO TASKS, ONE BACKGROUND BATCH FOR ALL PROJECTS =====
+        env['project.form.project'].sudo().browse([projects[item['index']].id for item in prepared])._schedule_task_sync()
+
+        # ===== 7. PER-ROW RESULT =====
+        results = []
+        for index in range(len(rows)):
+            if index in projects:
+                project = projects[index]
+                result = {
+                    'index': index,
+                    'status': 'created',
+                    'project_id': project.uuid,
+                    'task_sync_state': project.task_sync_state,
+                }
+                if warnings.get(index):
+                    result['warnings'] = warnings[index]
+            else:
+                result = {
+                    'index': index,
+                    'status': 'error',
+                    'errors': errors.get(index, ['Row was not imported']),
+                }
+            results.append(result)
+        return results
+
+    def _get_expected_version(self, data):
+        """Version required by an update, None when the client sent no precondition."""
+        if_match = request.httprequest.if_match
+        if if_match and not if_match.star_tag:
+            values = if_match.as_set(include_weak=True)
+        elif data.get('version') not in (None, ''):
+            values = {str(data['version'])}
+        else:
+            return None
+        try:
+            return int(next(iter(values)))
+        except (StopIteration, ValueError):
+            raise ValueError("Invalid version precondition")
+
+    def _parse_updates_since(self, since):
+        """``since`` is a mail.message id or a datetime; returns ``(message_id, date)``."""
+        if not since:
+            return None, None
+        if since.isdigit():
+            return int(since), None
+        try:
+            return None, parse_api_datetime(since)[0]
+        except ValueError:
+            raise ValueError("Invalid since '%s': expected a message id or a datetime" % since)
+
+    def _get_task_activity_stamp(self, task_id):
+        """Cheap fingerprint of everything the updates feed shows for a task.
+
+        One indexed query over the task, its subtasks and its messages;
+        any edit, new subtask, deleted subtask or new message changes it.
+        """
+        request.env.flush_all()
+        request.env.cr.execute("""
+            SELECT (SELECT max(write_date) FROM project_task WHERE id = %(task)s OR parent_id = %(task)s),
+                   (SELECT count(*) FROM project_task WHERE parent_id = %(task)s),
+                   (SELECT max(id) FROM mail_message WHERE model = 'project.task' AND res_id = %(task)s),
+                   (SELECT max(write_date) FROM mail_message WHERE model = 'project.task' AND res_id = %(task)s)
+        """, {'task': task_id})
+        task_date, subtask_count, last_message_id, message_date = request.env.cr.fetchone()
+        return {
+            'updated_at': max(filter(None, [task_date, message_date]), default=None),
+            'subtask_count': subtask_count,
+            'last_message_id': last_message_id,
+        }
+
+    def _is_subtask_closed(self, child):
+        is_closed = child.stage_id.fold if child.stage_id else False
+
+        # Enhanced state check for Odoo 16+
+        if hasattr(child, 'state') and child.state in ['1_done', '1_canceled', 'done', 'cancel']:
+             is_closed = True
+
+        # Fallback: check stage name
+        if not is_closed and child.stage_id and child.stage_id.name in ['Done', 'Cancelled', 'Canceled']:
+            is_closed = True
+        return is_closed
+
+### http://localhost:8069/api/projects/<string:project_uuid>/updates-channel
+    @http.route('/api/projects/<string:project_uuid>/updates-channel', type='http', auth='public', methods=['GET', 'OPTIONS'], csrf=False, cors='*')
+    @jwt_required()
+    def get_project_updates_channel(self, project_uuid, contractor=None, **kwargs):
+        """Hand an authenticated contractor the bus channel of one of their projects.
+
+        Subscribing to it on Odoo's websocket replaces polling
+        /api/project-updates: a notification is pushed on every stage change
+        and every new message of the project's task.
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return request.make_response(
+                json.dumps({'status': 'ok'}),
+                headers={
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                }
+            )
+
+        project = request.env['project.form.project'].sudo().search([
+            ('uuid', '=', project_uuid), ('contractor_id', '=', contractor.id)
+        ], limit=1)
+        if not project:
+            return request.make_response(
+                json.dumps({'status': 'error', 'message': 'Project not found'}),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                status=404
+            )
+
+        return request.make_response(
+            json.dumps({
+                'status': 'success',
+                'channel': project._get_updates_channel(),
+                'notification_type': UPDATES_NOTIFICATION,
+            }),
+            headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+        )
+
 ###http://localhost:8069/api/project-updates/<string:project_uuid>
     @http.route('/api/project-updates/<string:project_uuid>', type='http', auth='public', methods=['GET', 'OPTIONS'], csrf=False, cors='*')
-    def get_project_updates(self, project_uuid, **kwargs):
+    @jwt_required(optional=True)
+    def get_project_updates(self, project_uuid, contractor=None, **kwargs):
         cors_headers = {
             'Access-Control-Allow-Origin': '*',
             'Access-Control-Allow-Methods': 'GET, OPTIONS',
@@ -845,6 +1011,31 @@ class ProjectController(http.Controller):
                 )
 
             task = request.env['project.task'].sudo().browse(task_id)
+            try:
+                since_message_id, since_date = self._parse_updates_since(kwargs.get('since'))
+            except ValueError as e:
+                headers = {'Content-Type': 'application/json'}
+                headers.update(cors_headers)
+                return request.make_response(
+                    json.dumps({'status': 'error', 'message': str(e)}),
+                    headers=headers,
+                    status=400
+                )
+
+            # Unchanged since the client's last poll: answer before loading anything
+            stamp = self._get_task_activity_stamp(task.id)
+            etag = hashlib.sha1(json.dumps([
+                project.status, str(project.write_date), str(stamp['updated_at']),
+                stamp['subtask_count'], stamp['last_message_id'], kwargs.get('since') or '',
+            ]).encode()).hexdigest()
+            cache_headers = {
+                'ETag': '"%s"' % etag,
+                'Cache-Control': 'no-cache',
+                'Access-Control-Expose-Headers': 'ETag',
+            }
+            cache_headers.update(cors_headers)
+            if request.httprequest.if_none_match.contains(etag):
+                return request.make_response('', headers=cache_headers, status=304)
 
             # 1. Subtasks
             subtasks_data = []
@@ -854,19 +1045,14 @@ class ProjectController(http.Controller):
             if hasattr(task, 'child_ids'):
                 for child in task.child_ids:
                     total_subtasks_count += 1
-                    is_closed = child.stage_id.fold if child.stage_id else False
-                    
-                    # Enhanced state check for Odoo 16+
-                    if hasattr(child, 'state') and child.state in ['1_done', '1_canceled', 'done', 'cancel']:
-                         is_closed = True
-                    
-                    # Fallback: check stage name
-                    if not is_closed and child.stage_id and child.stage_id.name in ['Done', 'Cancelled', 'Canceled']:
-                        is_closed = True
-                    
+                    is_closed = self._is_subtask_closed(child)
                     if is_closed:
                         completed_subtasks_count += 1
 
+                    # Only subtasks changed since the client's last poll are sent in full
+                    if since_date and child.write_date <= since_date:
+                        continue
+
                     # Get description safely and remove HTML formatting
                     description = child.description if hasattr(child, 'description') else ''
                     if description:
@@ -887,19 +1073,34 @@ class ProjectController(http.Controller):
             
             # Fetch messages with tracking values
             # Note: tracking_value_ids is a One2many on mail.message
-            messages = request.env['mail.message'].sudo().search([
+            message_domain = [
                 ('model', '=', 'project.task'),
                 ('res_id', '=', task.id),
                 ('message_type', 'in', ['comment', 'notification']), 
-            ], order='date desc', limit=50)
+            ]
+            Message = request.env['mail.message'].sudo()
+            last_message_id = stamp['last_message_id']
+            has_more = False
+            if since_message_id or since_date:
+                if since_message_id:
+                    message_domain.append(('id', '>', since_message_id))
+                else:
+                    message_domain.append(('write_date', '>', since_date))
+                # Oldest first, so a client far behind catches up page by page
+                # from the last message it was actually sent
+                messages = Message.search(message_domain, order='id asc', limit=UPDATES_MESSAGE_LIMIT + 1)
+                has_more = len(messages) > UPDATES_MESSAGE_LIMIT
+                messages = messages[:UPDATES_MESSAGE_LIMIT]
+                if has_more:
+                    last_message_id = messages[-1].id
+                messages = messages[::-1]
+            else:
+                messages = Message.search(message_domain, order='date desc', limit=UPDATES_MESSAGE_LIMIT)
 
             for msg in messages:
                 tracking_changes = []
                 if hasattr(msg, 'tracking_value_ids') and msg.tracking_value_ids:
                     for val in msg.tracking_value_ids:
-                        # DEBUG: Log available fields
-                        # _logger.info("Tracking Value Fields: %s", val._fields.keys())
-                        
                         # Check for stage change
                         # Try field_id.name first as it is most robust for newer versions
                         is_stage_change = False
@@ -959,12 +1160,20 @@ class ProjectController(http.Controller):
                     'subtasks': subtasks_data,
                     'subtasks_summary': f"{completed_subtasks_count} / {total_subtasks_count} ({completion_percentage}%)",
                     'chat_logs': chat_logs,
-                    'completion_percentage': completion_percentage
+                    'completion_percentage': completion_percentage,
+                    # with ``since``, subtasks and chat_logs only hold what changed;
+                    # subtask_ids lets the client drop deleted subtasks
+                    'is_delta': bool(kwargs.get('since')),
+                    'subtask_ids': task.child_ids.ids,
+                    # with has_more, poll again with since=last_message_id right away
+                    'has_more': has_more,
+                    'last_message_id': last_message_id,
+                    'updated_at': str(stamp['updated_at']) if stamp['updated_at'] and not has_more else None,
                 }
             }
             
             headers = {'Content-Type': 'application/json'}
-            headers.update(cors_headers)
+            headers.update(cache_headers)
             return request.make_response(
                 json.dumps(response_data),
                 headers=headers
@@ -981,7 +1190,8 @@ class ProjectController(http.Controller):
             )
 ### http://localhost:8069/api/project/<string:project_uuid>/message
     @http.route('/api/project/<string:project_uuid>/message', type='http', auth='public', methods=['POST', 'OPTIONS'], csrf=False, cors='*')
-    def post_project_message(self, project_uuid, **kwargs):
+    @jwt_required(optional=True)
+    def post_project_message(self, project_uuid, contractor=None, **kwargs):
         cors_headers = {
             'Access-Control-Allow-Origin': '*',
             'Access-Control-Allow-Methods': 'POST, OPTIONS',
@@ -1056,7 +1266,8 @@ class ProjectController(http.Controller):
 
 ### http://localhost:8069/api/delete-all
     @http.route('/api/delete-all', type='http', auth='public', methods=['DELETE', 'OPTIONS'], csrf=False, cors='*')
-    def delete_all_projects(self, **kwargs):
+    @jwt_required(optional=True)
+    def delete_all_projects(self, contractor=None, **kwargs):
         if request.httprequest.method == 'OPTIONS':
             return request.make_response(
                 json.dumps({'status': 'ok'}),
@@ -1068,9 +1279,9 @@ class ProjectController(http.Controller):
             )
         try:
             projects = request.env['project.form.project'].sudo().search([])
-            projects.unlink()
+            deleted = projects._delete_cascade(unlink_tasks=False)
             return request.make_response(
-                json.dumps({'status': 'success'}),
+                json.dumps({'status': 'success', 'deleted': deleted}),
                 headers={
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*',
@@ -1118,7 +1329,8 @@ class ProjectController(http.Controller):
 
 ### http://localhost:8069/api/projects/<string:project_id>
     @http.route('/api/projects/<string:project_id>', type='http', auth='public', methods=['DELETE', 'OPTIONS'], csrf=False, cors='*')
-    def delete_project(self, project_id, **kwargs):
+    @jwt_required(optional=True)
+    def delete_project(self, project_id, contractor=None, **kwargs):
         if request.httprequest.method == 'OPTIONS':
             return request.make_response(
                 json.dumps({'status': 'ok'}),
@@ -1146,57 +1358,14 @@ class ProjectController(http.Controller):
                     status=404
                 )
 
-            # Delete associated Odoo task if it exists
-            if project.odoo_task_id:
-                try:
-                    odoo_task = request.env['project.task'].sudo().search([('id', '=', project.odoo_task_id)], limit=1)
-                    if odoo_task:
-                        odoo_task.unlink()
-                        _logger.info("Deleted Odoo task %s for project %s", project.odoo_task_id, project.uuid)
-                except Exception as e:
-                    _logger.warning("Failed to delete Odoo task %s: %s", project.odoo_task_id, str(e))
-                    # Continue with project deletion even if task deletion fails
-
-            # Delete related records (cascade delete)
-            # System Summary and Battery Info
-            system_summaries = request.env['project.form.system.summary'].sudo().search([('project_id', '=', project.uuid)])
-            for summary in system_summaries:
-                # Delete battery info first
-                battery_infos = request.env['project.form.battery.info'].sudo().search([('system_summary_id', '=', summary.uuid)])
-                battery_infos.unlink()
-                summary.unlink()
-
-            # Site Details
-            site_details = request.env['project.form.site.detail'].sudo().search([('project_id', '=', project.uuid)])
-            site_details.unlink()
-
-            # Electrical Details
-            electrical_details = request.env['project.form.electrical.detail'].sudo().search([('project_id', '=', project.uuid)])
-            electrical_details.unlink()
-
-            # Advanced Electrical Details
-            adv_electrical_details = request.env['project.form.advanced.electrical.detail'].sudo().search([('project_id', '=', project.uuid)])
-            adv_electrical_details.unlink()
-
-            # Optional Extra Details
-            optional_extra_details = request.env['project.form.optional.extra.detail'].sudo().search([('project_id', '=', project.uuid)])
-            optional_extra_details.unlink()
-
-            # System Components
-            system_components = request.env['project.form.system.component'].sudo().search([('project_id', '=', project.uuid)])
-            system_components.unlink()
-
-            # Uploads
-            uploads = request.env['project.form.upload'].sudo().search([('project_id', '=', project.uuid)])
-            uploads.unlink()
-
-            # Finally, delete the project itself
-            project.unlink()
+            # Removes the Odoo task and every related record too
+            deleted = project._delete_cascade()
 
             return request.make_response(
                 json.dumps({
                     'status': 'success',
-                    'message': f'Project {project_id} and all related records deleted successfully'
+                    'message': f'Project {project_id} and all related records deleted successfully',
+                    'deleted': deleted,
                 }),
                 headers={
                     'Content-Type': 'application/json',
@@ -1216,16 +1385,58 @@ class ProjectController(http.Controller):
                 },
                 status=500
             )
+### http://localhost:8069/api/projects/bulk-delete
+    @http.route('/api/projects/bulk-delete', type='http', auth='public', methods=['POST', 'OPTIONS'], csrf=False, cors='*')
+    @jwt_required(optional=True)
+    def bulk_delete_projects(self, contractor=None, **kwargs):
+        if request.httprequest.method == 'OPTIONS':
+            return request.make_response(
+                json.dumps({'status': 'ok'}),
+                headers={
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                }
+            )
+
+        try:
+            data = json.loads(request.httprequest.data.decode('utf-8'))
+            project_ids = data.get('ids') if isinstance(data, dict) else None
+            if not isinstance(project_ids, list) or not project_ids:
+                raise ValueError("'ids' must be a non-empty list of project IDs")
+        except ValueError as e:
+            return request.make_response(
+                json.dumps({'status': 'error', 'message': str(e)}),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                status=400
+            )
+
+        try:
+            deleted, missing = request.env['project.form.project'].sudo()._delete_by_uuids(project_ids)
+            return request.make_response(
+                json.dumps({'status': 'success', 'deleted': deleted, 'not_found': missing}),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+            )
+        except Exception as e:
+            request.env.cr.rollback()
+            _logger.exception("Failed to delete projects")
+            return request.make_response(
+                json.dumps({'status': 'error', 'message': str(e)}),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                status=500
+            )
+
 ### http://localhost:8069/api/projects/update
     @http.route('/api/projects/update', type='http', auth='public', methods=['POST', 'OPTIONS'], csrf=False, cors='*')
-    def update_project(self, **kwargs):
+    @jwt_required(optional=True)
+    def update_project(self, contractor=None, **kwargs):
         if request.httprequest.method == 'OPTIONS':
             return request.make_response(
                 json.dumps({'status': 'ok'}),
                 headers={
                     'Access-Control-Allow-Origin': '*',
                     'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization, If-Match',
                 }
             )
         try:
@@ -1260,6 +1471,28 @@ class ProjectController(http.Controller):
             
             _logger.info("Found project: %s (ID: %s)", project.name, project.id)
 
+            # Optimistic concurrency: the version the client last read, from
+            # If-Match (the ETag of GET /api/projects/<id>) or the body
+            try:
+                expected_version = self._get_expected_version(data)
+            except ValueError as e:
+                return request.make_response(
+                    json.dumps({'status': 'error', 'message': str(e)}),
+                    headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                    status=400
+                )
+            version = project._lock_version(expected_version)
+            if version is None:
+                return request.make_response(
+                    json.dumps({
+                        'status': 'error',
+                        'message': 'The project was modified by someone else. Reload it and apply your changes again.',
+                        'version': project.version,
+                    }),
+                    headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', 'ETag': '"%s"' % project.version},
+                    status=412
+                )
+
             # Fields to update on the project itself
             project_vals = {}
             if 'name' in data: project_vals['name'] = data['name']
@@ -1291,10 +1524,8 @@ class ProjectController(http.Controller):
                     services = request.env['project.form.service'].sudo().search([('uuid', 'in', service_uuids)])
                     project_vals['service_ids'] = [(6, 0, services.ids)]
 
-            if project_vals:
-                project.write(project_vals)
-
             # Update engineering firm on task
+            firm_changed = False
             if 'engineering_firm' in data or 'engineering_firm_id' in data:
                 firm_data = data.get('engineering_firm', {})
                 firm_id_val = firm_data.get('id') or firm_data.get('uuid') or data.get('engineering_firm_id')
@@ -1302,150 +1533,73 @@ class ProjectController(http.Controller):
                     firm = request.env['project.form.engineering.firm'].sudo().search([
                         '|', ('uuid', '=', firm_id_val), ('name', '=', firm_id_val)
                     ], limit=1)
+                    if firm and project.engineering_firm_id != firm:
+                        # kept on the project for a task that is not created yet
+                        project.engineering_firm_id = firm
+                        firm_changed = True
                     if firm and project.odoo_task_id:
                         task = request.env['project.task'].sudo().browse(project.odoo_task_id)
                         if task.exists():
                             task.write({'engineering_firm_id': firm.id})
 
-            # Update related models
-            # 1. System Summary
+            # Related models, as a merge patch: a missing key leaves the
+            # section alone, null deletes it, and only changed values are written
+            def pick(section, field_names, url_fields=()):
+                if section is None:
+                    return None
+                vals = {k: section[k] for k in field_names if k in section}
+                for f in url_fields:
+                    if f in vals:
+                        vals[f] = parse_url_list(vals[f])
+                return vals
+
+            details = []
             if 'system_summary' in data:
                 ss_data = data['system_summary']
-                _logger.info("Received system_summary data: %s", ss_data)
-                ss = request.env['project.form.system.summary'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-                ss_vals = {k: ss_data[k] for k in ['system_size', 'system_type', 'pv_modules', 'inverters'] if k in ss_data}
-                if ss:
-                    _logger.info("Updating existing system_summary: %s", ss.uuid)
-                    ss.write(ss_vals)
-                else:
-                    _logger.info("Creating new system_summary for project: %s", project.uuid)
-                    ss_vals['project_id'] = project.uuid
-                    ss = request.env['project.form.system.summary'].sudo().create(ss_vals)
-
-                # Handle Battery Info (inside System Summary)
-                if 'battery_info' in ss_data:
-                    bi_data = ss_data['battery_info']
-                    _logger.info("Received battery_info data: %s", bi_data)
-                    bi = request.env['project.form.battery.info'].sudo().search([('system_summary_id', '=', ss.uuid)], limit=1)
-                    bi_fields = ['qty', 'model', 'image']
-                    bi_vals = {}
-                    for f in bi_fields:
-                        if f in bi_data:
-                            val = bi_data[f]
-                            if f == 'image' and isinstance(val, list):
-                                val = json.dumps(val)
-                            bi_vals[f] = val
-                    
-                    if bi:
-                        _logger.info("Updating existing battery_info: %s", bi.uuid)
-                        bi.write(bi_vals)
-                    else:
-                        _logger.info("Creating new battery_info for system_summary: %s", ss.uuid)
-                        bi_vals['system_summary_id'] = ss.uuid
-                        request.env['project.form.battery.info'].sudo().create(bi_vals)
-
-            # 2. Site Details
+                details.append((('system_summary_id',), pick(ss_data, ['system_size', 'system_type', 'pv_modules', 'inverters'])))
+                if ss_data is not None and 'battery_info' in ss_data:
+                    details.append((('system_summary_id', 'battery_info_id'), pick(ss_data['battery_info'], ['qty', 'model', 'image'], ['image'])))
             if 'site_details' in data:
-                sd_data = data['site_details']
-                _logger.info("Received site_details data: %s", sd_data)
-                sd = request.env['project.form.site.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-                sd_fields = ['roof_material', 'roof_pitch', 'number_of_arrays', 'ground_mount_type', 'foundation_type', 'main_panel_size', 'utility_provider', 'jurisdiction']
-                sd_vals = {k: sd_data[k] for k in sd_fields if k in sd_data}
-                if sd:
-                    _logger.info("Updating existing site_detail: %s", sd.uuid)
-                    sd.write(sd_vals)
-                else:
-                    _logger.info("Creating new site_detail for project: %s", project.uuid)
-                    sd_vals['project_id'] = project.uuid
-                    request.env['project.form.site.detail'].sudo().create(sd_vals)
-
-            # 3. Electrical Details
+                details.append((('site_detail_id',), pick(data['site_details'], SITE_DETAIL_FIELDS)))
             if 'electrical_details' in data:
-                ed_data = data['electrical_details']
-                _logger.info("Received electrical_details data: %s", ed_data)
-                ed = request.env['project.form.electrical.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-                ed_fields = ['main_panel_size', 'bus_rating', 'main_breaker', 'pv_breaker_location', 'one_line_diagram']
-                ed_vals = {}
-                for f in ed_fields:
-                    if f in ed_data:
-                        val = ed_data[f]
-                        if f == 'one_line_diagram' and isinstance(val, list):
-                            val = json.dumps(val)
-                        ed_vals[f] = val
-                if ed:
-                    _logger.info("Updating existing electrical_detail: %s", ed.uuid)
-                    ed.write(ed_vals)
-                else:
-                    _logger.info("Creating new electrical_detail for project: %s", project.uuid)
-                    ed_vals['project_id'] = project.uuid
-                    request.env['project.form.electrical.detail'].sudo().create(ed_vals)
-
-            # 4. Advanced Electrical Details
+                details.append((('electrical_detail_id',), pick(data['electrical_details'], ELECTRICAL_DETAIL_FIELDS, ['one_line_diagram'])))
             if 'advanced_electrical_details' in data:
-                aed_data = data['advanced_electrical_details']
-                aed = request.env['project.form.advanced.electrical.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-                aed_fields = ['meter_location', 'service_entrance_type', 'subpanel_details']
-                aed_vals = {k: aed_data[k] for k in aed_fields if k in aed_data}
-                if aed:
-                    aed.write(aed_vals)
-                else:
-                    aed_vals['project_id'] = project.uuid
-                    request.env['project.form.advanced.electrical.detail'].sudo().create(aed_vals)
-
-            # 5. Optional Extra Details
+                details.append((('advanced_electrical_detail_id',), pick(data['advanced_electrical_details'], ADVANCED_ELECTRICAL_DETAIL_FIELDS)))
             if 'optional_extra_details' in data:
-                oed_data = data['optional_extra_details']
-                oed = request.env['project.form.optional.extra.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-                oed_fields = [
-                    'miracle_watt_required', 'miracle_watt_notes', 'der_rlc_required', 'der_rlc_notes',
-                    'setback_constraints', 'setback_notes', 'site_access_restrictions', 'site_access_notes',
-                    'inspection_notes', 'inspection_notes_text', 'battery_sld_requested', 'battery_sld_notes'
-                ]
-                oed_vals = {k: oed_data[k] for k in oed_fields if k in oed_data}
-                if oed:
-                    oed.write(oed_vals)
-                else:
-                    oed_vals['project_id'] = project.uuid
-                    request.env['project.form.optional.extra.detail'].sudo().create(oed_vals)
+                details.append((('optional_extra_detail_id',), pick(data['optional_extra_details'], OPTIONAL_EXTRA_DETAIL_FIELDS)))
 
-            # 6. System Components
+            components = None
             if 'system_components' in data:
-                sc_data_list = data['system_components']
-                # Delete existing ones and recreate
-                request.env['project.form.system.component'].sudo().search([('project_id', '=', project.uuid)]).unlink()
-                for comp_data in sc_data_list:
-                    attachment_urls = comp_data.get('attachment', [])
-                    if isinstance(attachment_urls, list):
-                        attachment_urls = json.dumps(attachment_urls)
-                    
-                    request.env['project.form.system.component'].sudo().create({
-                        'project_id': project.uuid,
-                        'type': comp_data.get('type'),
-                        'make_model': comp_data.get('make_model'),
-                        'qty': comp_data.get('qty'),
-                        'attachment': attachment_urls,
-                        'notes': comp_data.get('notes'),
-                    })
+                components = []
+                for comp_data in data['system_components'] or []:
+                    if comp_data:
+                        components.append(pick(comp_data, ['id', 'uuid', 'type', 'make_model', 'qty', 'attachment', 'notes'], ['attachment']))
 
-            # Update Odoo Task Description to reflect changes
-            try:
-                if project.odoo_task_id:
-                    task = request.env['project.task'].sudo().browse(project.odoo_task_id)
-                    if task.exists():
-                        new_description = self._generate_project_description(project)
-                        task.write({'description': new_description})
-                        _logger.info("Sync'd Odoo task description for task %s", project.odoo_task_id)
-            except Exception as e:
-                _logger.error("Failed to sync Odoo task description on update: %s", str(e))
+            changed = project._merge_api_update(project_vals, details, components) or firm_changed
+
+            # Update Odoo Task Description to reflect changes; a no-op
+            # update keeps the version, so other editors' copies stay valid
+            if changed:
+                version = project._bump_version()
+                try:
+                    project._sync_task_description()
+                except Exception as e:
+                    _logger.error("Failed to sync Odoo task description on update: %s", str(e))
 
             return request.make_response(
                 json.dumps({
                     'status': 'success',
                     'message': 'Project updated successfully',
-                    'project_id': project.uuid
+                    'project_id': project.uuid,
+                    'changed': changed,
+                    'version': version,
                 }),
-                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*', 'ETag': '"%s"' % version}
             )
+        except TransactionRollbackError:
+            # Concurrent update of the same project: the server retries the
+            # request, which then gets a 412 if it carried a version
+            raise
         except Exception as e:
             request.env.cr.rollback()
             _logger.exception("Failed to create project")
@@ -1457,7 +1611,8 @@ class ProjectController(http.Controller):
 
 ### http://localhost:8069/api/projects
     @http.route('/api/projects', type='http', auth='public', methods=['GET', 'OPTIONS'], csrf=False, cors='*')
-    def get_projects(self, **kwargs):
+    @jwt_required(optional=True)
+    def get_projects(self, contractor=None, **kwargs):
         if request.httprequest.method == 'OPTIONS':
             return request.make_response(
                 json.dumps({'status': 'ok'}),
@@ -1470,198 +1625,32 @@ class ProjectController(http.Controller):
 
         try:
             domain = []
-            # Check for Authorization header
-            auth_header = request.httprequest.headers.get('Authorization')
-            if auth_header:
-                contractor_id = self._verify_token()
-                if not contractor_id:
-                     return request.make_response(
-                        json.dumps({'status': 'error', 'message': 'Unauthorized request. Invalid or expired token.'}),
-                        headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                        status=401
-                    )
-                domain.append(('contractor_id', '=', contractor_id))
-
-            projects = request.env['project.form.project'].sudo().search(domain)
-            
-            # Optimization: Prefetch all linked task stages to avoid N+1 queries
-            task_ids = [p.odoo_task_id for p in projects if p.odoo_task_id]
-            task_stage_map = {}
-            if task_ids:
-                tasks = request.env['project.task'].sudo().search([('id', 'in', task_ids)])
-                for t in tasks:
-                    task_stage_map[t.id] = t.stage_id.name if t.stage_id else None
-
-            data = []
-            for project in projects:
-                # Fetch User Profile
-                user_profile = request.env['project.form.user.profile'].sudo().search([('uuid', '=', project.user_profile_id)], limit=1)
-                user_profile_data = {}
-                if user_profile:
-                    user_profile_data = {
-                        'id': user_profile.uuid,
-                        'company_name': user_profile.company_name,
-                        'contact_name': user_profile.contact_name,
-                        'email': user_profile.email,
-                        'phone': user_profile.phone,
-                    }
-
-                # Fetch Submission Type
-                submission_type = request.env['project.form.submission.type'].sudo().search([('uuid', '=', project.submission_type_id)], limit=1)
-                submission_type_data = {}
-                if submission_type:
-                    submission_type_data = {
-                        'id': submission_type.uuid,
-                        'name': submission_type.name,
-                    }
-
-                # Fetch Services
-                services_data = []
-                for service in project.service_ids:
-                    services_data.append({
-                        'id': service.uuid,
-                        'name': service.name,
-                    })
+            if contractor:
+                domain.append(('contractor_id', '=', contractor.id))
 
-                # Fetch System Summary by searching with project UUID
-                system_summary_data = {}
-                system_summary = request.env['project.form.system.summary'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-                if system_summary:
-                    # Fetch Battery Info
-                    battery_info_data = {}
-                    battery_info = request.env['project.form.battery.info'].sudo().search([('system_summary_id', '=', system_summary.uuid)], limit=1)
-                    if battery_info:
-                        battery_info_data = {
-                            'id': battery_info.uuid,
-                            'qty': battery_info.qty,
-                            'model': battery_info.model,
-                            'image': json.loads(battery_info.image) if battery_info.image else [],
-                        }
-
-                    system_summary_data = {
-                        'id': system_summary.uuid,
-                        'system_size': system_summary.system_size,
-                        'system_type': system_summary.system_type,
-                        'pv_modules': system_summary.pv_modules,
-                        'inverters': system_summary.inverters,
-                        'battery_info': battery_info_data
-                    }
-
-                # Fetch Site Details by searching with project UUID
-                site_details_data = {}
-                site_details = request.env['project.form.site.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-                if site_details:
-                    site_details_data = {
-                        'id': site_details.uuid,
-                        'roof_material': site_details.roof_material,
-                        'roof_pitch': site_details.roof_pitch,
-                        'number_of_arrays': site_details.number_of_arrays,
-                        'ground_mount_type': site_details.ground_mount_type,
-                        'foundation_type': site_details.foundation_type,
-                        'main_panel_size': site_details.main_panel_size,
-                        'utility_provider': site_details.utility_provider,
-                        'jurisdiction': site_details.jurisdiction,
-                    }
-
-                # Fetch Electrical Details by searching with project UUID
-                electrical_details_data = {}
-                electrical_details = request.env['project.form.electrical.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-                if electrical_details:
-                    electrical_details_data = {
-                        'id': electrical_details.uuid,
-                        'main_panel_size': electrical_details.main_panel_size,
-                        'bus_rating': electrical_details.bus_rating,
-                        'main_breaker': electrical_details.main_breaker,
-                        'pv_breaker_location': electrical_details.pv_breaker_location,
-                        'one_line_diagram': json.loads(electrical_details.one_line_diagram) if electrical_details.one_line_diagram else [],
-                    }
-
-                # Fetch Advanced Electrical Details by searching with project UUID
-                adv_elec_data = {}
-                adv_elec = request.env['project.form.advanced.electrical.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-                if adv_elec:
-                    adv_elec_data = {
-                        'id': adv_elec.uuid,
-                        'meter_location': adv_elec.meter_location,
-                        'service_entrance_type': adv_elec.service_entrance_type,
-                        'subpanel_details': adv_elec.subpanel_details,
-                    }
-
-                # Fetch Optional Extra Details by searching with project UUID
-                opt_extra_data = {}
-                opt_extra = request.env['project.form.optional.extra.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-                if opt_extra:
-                    opt_extra_data = {
-                        'id': opt_extra.uuid,
-                        'miracle_watt_required': opt_extra.miracle_watt_required,
-                        'miracle_watt_notes': opt_extra.miracle_watt_notes,
-                        'der_rlc_required': opt_extra.der_rlc_required,
-                        'der_rlc_notes': opt_extra.der_rlc_notes,
-                        'setback_constraints': opt_extra.setback_constraints,
-                        'setback_notes': opt_extra.setback_notes,
-                        'site_access_restrictions': opt_extra.site_access_restrictions,
-                        'site_access_notes': opt_extra.site_access_notes,
-                        'inspection_notes': opt_extra.inspection_notes,
-                        'inspection_notes_text': opt_extra.inspection_notes_text,
-                        'battery_sld_requested': opt_extra.battery_sld_requested,
-                        'battery_sld_notes': opt_extra.battery_sld_notes,
-                    }
-
-                # Fetch System Components by searching with project UUID
-                components_data = []
-                components = request.env['project.form.system.component'].sudo().search([('project_id', '=', project.uuid)])
-                for comp in components:
-                    components_data.append({
-                        'id': comp.uuid,
-                        'type': comp.type,
-                        'make_model': comp.make_model,
-                        'qty': comp.qty,
-                        'attachment': json.loads(comp.attachment) if comp.attachment else [],
-                        'notes': comp.notes,
-                    })
-
-                # Fetch Uploads by searching with project UUID
-                uploads_data = []
-                uploads = request.env['project.form.upload'].sudo().search([('project_id', '=', project.uuid)])
-                for upload in uploads:
-                    uploads_data.append({
-                        'id': upload.uuid,
-                        'url': upload.url,
-                        'name': upload.name,
-                        'category': upload.category,
-                        'mime_type': upload.mime_type,
-                        'size': upload.size,
-                    })
+            try:
+                domain += self._get_project_filter_domain(kwargs)
+                limit = self._get_page_limit(kwargs.get('limit'))
+                field_names = None
+                if kwargs.get('fields'):
+                    field_names = [f.strip() for f in kwargs['fields'].split(',') if f.strip()]
+                    unknown = set(field_names) - set(API_FIELDS)
+                    if unknown:
+                        raise ValueError("Unknown fields: %s" % ', '.join(sorted(unknown)))
+                projects, next_cursor = request.env['project.form.project'].sudo()._get_api_page(
+                    domain, limit, cursor=kwargs.get('cursor'))
+            except (ValueError, ValidationError) as e:
+                return request.make_response(
+                    json.dumps({'status': 'error', 'message': str(e)}),
+                    headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                    status=400
+                )
 
-                # specific status check with fallback
-                project_status = project.status
-                if not project_status and project.odoo_task_id in task_stage_map:
-                    project_status = task_stage_map[project.odoo_task_id]
-
-                data.append({
-                    'id': project.uuid,
-                    'name': project.name,
-                    'status': project_status,
-                    'address': project.address,
-                    'type': project.type,
-                    'general_notes': project.general_notes,
-                    'created_at': str(project.created_at),
-                    'updated_at': str(project.updated_at),
-                    'user_profile': user_profile_data,
-                    'submission_type': submission_type_data,
-                    'services': services_data,
-                    'system_summary': system_summary_data,
-                    'site_details': site_details_data,
-                    'electrical_details': electrical_details_data,
-                    'advanced_electrical_details': adv_elec_data,
-                    'optional_extra_details': opt_extra_data,
-                    'system_components': components_data,
-                    'uploads': uploads_data,
-                    'contractor_id': project.contractor_id.id if project.contractor_id else None,
-                })
+            # Related tables are loaded once for the whole page
+            data = projects._serialize_for_api(field_names=field_names)
             
             return request.make_response(
-                json.dumps({'status': 'success', 'data': data}, default=str),
+                json.dumps({'status': 'success', 'data': data, 'next_cursor': next_cursor}, default=str),
                 headers={
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*',
@@ -1678,9 +1667,111 @@ class ProjectController(http.Controller):
                 status=500
             )
 
+### http://localhost:8069/api/project-summaries
+    @http.route('/api/project-summaries', type='http', auth='public', methods=['GET', 'OPTIONS'], csrf=False, cors='*')
+    @jwt_required(optional=True)
+    def get_project_summaries(self, contractor=None, **kwargs):
+        """Flat project rows for list and dashboard screens, one indexed query per page.
+
+        Accepts the filters, ``limit`` and ``cursor`` of /api/projects.
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return request.make_response(
+                json.dumps({'status': 'ok'}),
+                headers={
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                }
+            )
+
+        try:
+            domain = []
+            if contractor:
+                domain.append(('contractor_id', '=', contractor.id))
+
+            try:
+                domain += self._get_project_filter_domain(kwargs)
+                limit = self._get_page_limit(kwargs.get('limit'))
+                summaries, next_cursor = request.env['project.form.project.summary'].sudo()._get_api_page(
+                    domain, limit, cursor=kwargs.get('cursor'))
+            except (ValueError, ValidationError) as e:
+                return request.make_response(
+                    json.dumps({'status': 'error', 'message': str(e)}),
+                    headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                    status=400
+                )
+
+            return request.make_response(
+                json.dumps({
+                    'status': 'success',
+                    'data': [summary._to_api_dict() for summary in summaries],
+                    'next_cursor': next_cursor,
+                }),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+            )
+        except Exception as e:
+            _logger.exception("Failed to fetch project summaries")
+            return request.make_response(
+                json.dumps({'status': 'error', 'message': str(e)}),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                status=500
+            )
+
+### http://localhost:8069/api/projects/address-matches?address=...
+    @http.route('/api/projects/address-matches', type='http', auth='public', methods=['GET', 'OPTIONS'], csrf=False, cors='*')
+    @jwt_required(optional=True)
+    def get_address_matches(self, contractor=None, **kwargs):
+        """Existing project addresses similar to ``address``, for duplicate warnings while typing."""
+        if request.httprequest.method == 'OPTIONS':
+            return request.make_response(
+                json.dumps({'status': 'ok'}),
+                headers={
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                }
+            )
+
+        try:
+            address = (kwargs.get('address') or '').strip()
+            if len(address) < 3:
+                return request.make_response(
+                    json.dumps({'status': 'error', 'message': 'address must be at least 3 characters'}),
+                    headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                    status=400
+                )
+            try:
+                limit = min(int(kwargs.get('limit') or 5), 20)
+            except ValueError:
+                limit = 5
+
+            normalized = normalize_address(address)
+            matches = request.env['project.form.project'].sudo()._find_similar_addresses(address, limit=limit)
+            return request.make_response(
+                json.dumps({
+                    'status': 'success',
+                    'normalized_address': normalized,
+                    'data': [{
+                        'address': match_address,
+                        'similarity': similarity,
+                        'exact': normalize_address(match_address) == normalized,
+                    } for match_address, similarity in matches],
+                }),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+            )
+        except Exception as e:
+            _logger.exception("Failed to look up similar addresses")
+            return request.make_response(
+                json.dumps({'status': 'error', 'message': str(e)}),
+                headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                status=500
+            )
+
 ### http://localhost:8069/api/projects/<string:project_uuid>
     @http.route('/api/projects/<string:project_uuid>', type='http', auth='public', methods=['GET', 'OPTIONS'], csrf=False, cors='*')
-    def get_project_by_id(self, project_uuid, **kwargs):
+    @jwt_required(optional=True)
+    def get_project_by_id(self, project_uuid, contractor=None, **kwargs):
         if request.httprequest.method == 'OPTIONS':
             return request.make_response(
                 json.dumps({'status': 'ok'}),
@@ -1703,179 +1794,16 @@ class ProjectController(http.Controller):
                     status=404
                 )
             
-            # Determine status with fallback to linked task
-            project_status = project.status
-            if not project_status and project.odoo_task_id:
-                 task = request.env['project.task'].sudo().browse(project.odoo_task_id)
-                 if task.exists() and task.stage_id:
-                     project_status = task.stage_id.name
-
-            # Fetch User Profile
-            user_profile = request.env['project.form.user.profile'].sudo().search([('uuid', '=', project.user_profile_id)], limit=1)
-            user_profile_data = {}
-            if user_profile:
-                user_profile_data = {
-                    'id': user_profile.uuid,
-                    'company_name': user_profile.company_name,
-                    'contact_name': user_profile.contact_name,
-                    'email': user_profile.email,
-                    'phone': user_profile.phone,
-                }
-
-            # Fetch Submission Type
-            submission_type = request.env['project.form.submission.type'].sudo().search([('uuid', '=', project.submission_type_id)], limit=1)
-            submission_type_data = {}
-            if submission_type:
-                submission_type_data = {
-                    'id': submission_type.uuid,
-                    'name': submission_type.name,
-                }
-
-            # Fetch Services
-            services_data = []
-            for service in project.service_ids:
-                services_data.append({
-                    'id': service.uuid,
-                    'name': service.name,
-                })
-
-            # Fetch System Summary by searching with project UUID
-            system_summary_data = {}
-            system_summary = request.env['project.form.system.summary'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-            if system_summary:
-                # Fetch Battery Info
-                battery_info_data = {}
-                battery_info = request.env['project.form.battery.info'].sudo().search([('system_summary_id', '=', system_summary.uuid)], limit=1)
-                if battery_info:
-                    battery_info_data = {
-                        'id': battery_info.uuid,
-                        'qty': battery_info.qty,
-                        'model': battery_info.model,
-                        'image': json.loads(battery_info.image) if battery_info.image else [],
-                    }
-
-                system_summary_data = {
-                    'id': system_summary.uuid,
-                    'system_size': system_summary.system_size,
-                    'system_type': system_summary.system_type,
-                    'pv_modules': system_summary.pv_modules,
-                    'inverters': system_summary.inverters,
-                    'battery_info': battery_info_data
-                }
-
-            # Fetch Site Details by searching with project UUID
-            site_details_data = {}
-            site_details = request.env['project.form.site.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-            if site_details:
-                site_details_data = {
-                    'id': site_details.uuid,
-                    'roof_material': site_details.roof_material,
-                    'roof_pitch': site_details.roof_pitch,
-                    'number_of_arrays': site_details.number_of_arrays,
-                    'ground_mount_type': site_details.ground_mount_type,
-                    'foundation_type': site_details.foundation_type,
-                    'main_panel_size': site_details.main_panel_size,
-                    'utility_provider': site_details.utility_provider,
-                    'jurisdiction': site_details.jurisdiction,
-                }
-
-            # Fetch Electrical Details by searching with project UUID
-            electrical_details_data = {}
-            electrical_details = request.env['project.form.electrical.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-            if electrical_details:
-                electrical_details_data = {
-                    'id': electrical_details.uuid,
-                    'main_panel_size': electrical_details.main_panel_size,
-                    'bus_rating': electrical_details.bus_rating,
-                    'main_breaker': electrical_details.main_breaker,
-                    'pv_breaker_location': electrical_details.pv_breaker_location,
-                    'one_line_diagram': json.loads(electrical_details.one_line_diagram) if electrical_details.one_line_diagram else [],
-                }
-
-            # Fetch Advanced Electrical Details by searching with project UUID
-            adv_elec_data = {}
-            adv_elec = request.env['project.form.advanced.electrical.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-            if adv_elec:
-                adv_elec_data = {
-                    'id': adv_elec.uuid,
-                    'meter_location': adv_elec.meter_location,
-                    'service_entrance_type': adv_elec.service_entrance_type,
-                    'subpanel_details': adv_elec.subpanel_details,
-                }
-
-            # Fetch Optional Extra Details by searching with project UUID
-            opt_extra_data = {}
-            opt_extra = request.env['project.form.optional.extra.detail'].sudo().search([('project_id', '=', project.uuid)], limit=1)
-            if opt_extra:
-                opt_extra_data = {
-                    'id': opt_extra.uuid,
-                    'miracle_watt_required': opt_extra.miracle_watt_required,
-                    'miracle_watt_notes': opt_extra.miracle_watt_notes,
-                    'der_rlc_required': opt_extra.der_rlc_required,
-                    'der_rlc_notes': opt_extra.der_rlc_notes,
-                    'setback_constraints': opt_extra.setback_constraints,
-                    'setback_notes': opt_extra.setback_notes,
-                    'site_access_restrictions': opt_extra.site_access_restrictions,
-                    'site_access_notes': opt_extra.site_access_notes,
-                    'inspection_notes': opt_extra.inspection_notes,
-                    'inspection_notes_text': opt_extra.inspection_notes_text,
-                    'battery_sld_requested': opt_extra.battery_sld_requested,
-                    'battery_sld_notes': opt_extra.battery_sld_notes,
-                }
-
-            # Fetch System Components by searching with project UUID
-            components_data = []
-            components = request.env['project.form.system.component'].sudo().search([('project_id', '=', project.uuid)])
-            for comp in components:
-                components_data.append({
-                    'id': comp.uuid,
-                    'type': comp.type,
-                    'make_model': comp.make_model,
-                    'qty': comp.qty,
-                    'attachment': json.loads(comp.attachment) if comp.attachment else [],
-                    'notes': comp.notes,
-                })
-
-            # Fetch Uploads by searching with project UUID
-            uploads_data = []
-            uploads = request.env['project.form.upload'].sudo().search([('project_id', '=', project.uuid)])
-            for upload in uploads:
-                uploads_data.append({
-                    'id': upload.uuid,
-                    'url': upload.url,
-                    'name': upload.name,
-                    'category': upload.category,
-                    'mime_type': upload.mime_type,
-                    'size': upload.size,
-                })
-
-            project_data = {
-                'id': project.uuid,
-                'name': project.name,
-                'status': project_status,
-                'address': project.address,
-                'type': project.type,
-                'general_notes': project.general_notes,
-                'created_at': str(project.created_at),
-                'updated_at': str(project.updated_at),
-                'user_profile': user_profile_data,
-                'submission_type': submission_type_data,
-                'services': services_data,
-                'system_summary': system_summary_data,
-                'site_details': site_details_data,
-                'electrical_details': electrical_details_data,
-                'advanced_electrical_details': adv_elec_data,
-                'optional_extra_details': opt_extra_data,
-                'system_components': components_data,
-                'uploads': uploads_data,
-                'contractor_id': project.contractor_id.id if project.contractor_id else None,
-            }
+            project_data = project._serialize_for_api()[0]
 
             return request.make_response(
                 json.dumps({'status': 'success', 'data': project_data}, default=str),
                 headers={
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*',
+                    # send back as If-Match to /api/projects/update
+                    'ETag': '"%s"' % project.version,
+                    'Access-Control-Expose-Headers': 'ETag',
                 }
             )
         except Exception as e:
@@ -3,33 +3,131 @@ from odoo.http import request
 import json
 import logging
 
-from ..services.zillow import scrape_zillow
-from ..services.asce_hazard import scrape_asce_hazard
+from ..services.browser_pool import get_browser_pool
+from ..services.jwt_auth import jwt_required
 
 _logger = logging.getLogger(__name__)
 
 
 class ScraperController(http.Controller):
-    
+
+    def _job_accepted_response(self, job):
+        return request.make_response(
+            json.dumps({
+                'status': 'queued',
+                'job_id': job.uuid,
+                'state': job.state,
+                'status_url': '/api/scrape/jobs/%s' % job.uuid,
+            }),
+            headers={
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+            },
+            status=202
+        )
+
+    def _cached_response(self, entry):
+        if entry.error:
+            # negative cache: the source failed recently, don't hammer it again
+            return request.make_response(
+                json.dumps({
+                    'status': 'error',
+                    'message': entry.error,
+                    'cached': True,
+                    'retry_after': str(entry.expires_at),
+                }),
+                headers={
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*',
+                },
+                status=502
+            )
+        return request.make_response(
+            json.dumps({
+                'status': 'success',
+                'data': entry._to_api_dict()['result'],
+                'cached': True,
+                'fetched_at': str(entry.fetched_at),
+            }),
+            headers={
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+            }
+        )
+
+    @http.route('/api/scrape/jobs/<string:job_uuid>', type='http', auth='public', methods=['GET', 'OPTIONS'], csrf=False, cors='*')
+    @jwt_required(optional=True)
+    def scrape_job_status(self, job_uuid, contractor=None, **kwargs):
+        """
+        Poll a queued scrape job.
+        
+        Response:
+        {
+            "status": "success",
+            "data": {
+                "id": "9b2f...",
+                "source": "zillow",
+                "state": "done",          (queued | running | done | failed)
+                "result": {"lot_size": "1.50 Acres", "parcel_number": "1907174400000"},
+                "error": null,
+                ...
+            }
+        }
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return request.make_response(
+                json.dumps({'status': 'ok'}),
+                headers={
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                }
+            )
+
+        job = request.env['project.form.scrape.job'].sudo().search([('uuid', '=', job_uuid)], limit=1)
+        if not job:
+            return request.make_response(
+                json.dumps({'status': 'error', 'message': 'Scrape job not found'}),
+                headers={
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*',
+                },
+                status=404
+            )
+
+        return request.make_response(
+            json.dumps({'status': 'success', 'data': job._to_api_dict()}),
+            headers={
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+            }
+        )
+
     @http.route('/api/scrape/zillow', type='http', auth='public', methods=['POST', 'OPTIONS'], csrf=False, cors='*')
-    def scrape_zillow_endpoint(self, **kwargs):
+    @jwt_required(optional=True)
+    def scrape_zillow_endpoint(self, contractor=None, **kwargs):
         """
-        Scrape lot size and parcel number from Zillow using an address.
+        Queue a scrape of lot size and parcel number from Zillow for an address.
         
         Request body:
         {
             "address": "1745 SE 4101, ANDREWS, TX 79714-5998",
-            "base_url": "https://www.zillow.com/homes/"  (Optional)
+            "base_url": "https://www.zillow.com/homes/",  (Optional)
+            "force_refresh": false  (Optional, bypass the cache)
         }
         
-        Response:
+        A cached result is returned immediately (200, "cached": true).
+        
+        Response (202):
         {
-            "status": "success",
-            "data": {
-                "lot_size": "1.50 Acres",
-                "parcel_number": "1907174400000"
-            }
+            "status": "queued",
+            "job_id": "9b2f...",
+            "state": "queued",
+            "status_url": "/api/scrape/jobs/9b2f..."
         }
+
+        The result ({"lot_size": ..., "parcel_number": ...}) is available
+        from the status URL once the job is done.
         """
         # Handle CORS preflight
         if request.httprequest.method == 'OPTIONS':
@@ -65,24 +163,20 @@ class ScraperController(http.Controller):
                     status=400
                 )
 
-            # Run the scraper function
-            _logger.info("Scraping Zillow for address: %s", address)
-            result = scrape_zillow(address, base_url)
-            _logger.info("Scrape result: %s", result)
+            params = {'base_url': base_url}
+            if not data.get('force_refresh'):
+                cached = request.env['project.form.scrape.cache'].sudo()._lookup('zillow', address, params)
+                if cached:
+                    return self._cached_response(cached)
 
-            return request.make_response(
-                json.dumps({
-                    'status': 'success',
-                    'data': result
-                }),
-                headers={
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                }
-            )
+            # Queue the scrape, the browser work runs outside this HTTP worker
+            _logger.info("Queueing Zillow scrape for address: %s", address)
+            job = request.env['project.form.scrape.job'].sudo()._enqueue('zillow', address, params)
+
+            return self._job_accepted_response(job)
 
         except Exception as e:
-            _logger.error("Error scraping Zillow: %s", str(e))
+            _logger.error("Error queueing Zillow scrape: %s", str(e))
             return request.make_response(
                 json.dumps({
                     'status': 'error',
@@ -96,25 +190,31 @@ class ScraperController(http.Controller):
             )
 
     @http.route('/api/scrape/asce', type='http', auth='public', methods=['POST', 'OPTIONS'], csrf=False, cors='*')
-    def scrape_asce_endpoint(self, **kwargs):
+    @jwt_required(optional=True)
+    def scrape_asce_endpoint(self, contractor=None, **kwargs):
         """
-        Scrape wind speed and snow load from ASCE Hazard Tool using an address.
+        Queue a scrape of wind speed and snow load from ASCE Hazard Tool for an address.
         
         Request body:
         {
             "address": "615 N SHIRK RD, NEW HOLLAND, PA 17557",
             "standard": "ASCE/SEI 7-22",  (Optional, default: "ASCE/SEI 7-22")
-            "risk_category": "II"  (Optional, default: "II")
+            "risk_category": "II",  (Optional, default: "II")
+            "force_refresh": false  (Optional, bypass the cache)
         }
         
-        Response:
+        A cached result is returned immediately (200, "cached": true).
+        
+        Response (202):
         {
-            "status": "success",
-            "data": {
-                "wind_speed": "113 mph",
-                "snow_load": "54 lb/ft²"
-            }
+            "status": "queued",
+            "job_id": "9b2f...",
+            "state": "queued",
+            "status_url": "/api/scrape/jobs/9b2f..."
         }
+
+        The result ({"wind_speed": ..., "snow_load": ...}) is available
+        from the status URL once the job is done.
         """
         # Handle CORS preflight
         if request.httprequest.method == 'OPTIONS':
@@ -151,24 +251,20 @@ class ScraperController(http.Controller):
                     status=400
                 )
 
-            # Run the ASCE scraper
-            _logger.info("Scraping ASCE for address: %s", address)
-            result = scrape_asce_hazard(address, standard, risk_category)
-            _logger.info("ASCE scrape result: %s", result)
+            params = {'standard': standard, 'risk_category': risk_category}
+            if not data.get('force_refresh'):
+                cached = request.env['project.form.scrape.cache'].sudo()._lookup('asce', address, params)
+                if cached:
+                    return self._cached_response(cached)
 
-            return request.make_response(
-                json.dumps({
-                    'status': 'success',
-                    'data': result
-                }),
-                headers={
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                }
-            )
+            # Queue the scrape, the browser work runs outside this HTTP worker
+            _logger.info("Queueing ASCE scrape for address: %s", address)
+            job = request.env['project.form.scrape.job'].sudo()._enqueue('asce', address, params)
+
+            return self._job_accepted_response(job)
 
         except Exception as e:
-            _logger.error("Error scraping ASCE: %s", str(e))
+            _logger.error("Error queueing ASCE scrape: %s", str(e))
             return request.make_response(
                 json.dumps({
                     'status': 'error',
@@ -182,30 +278,32 @@ class ScraperController(http.Controller):
             )
 
     @http.route('/api/scrape/combined', type='http', auth='public', methods=['POST', 'OPTIONS'], csrf=False, cors='*')
-    def scrape_combined_endpoint(self, **kwargs):
+    @jwt_required(optional=True)
+    def scrape_combined_endpoint(self, contractor=None, **kwargs):
         """
-        Scrape data from both Zillow and ASCE Hazard Tool using an address.
+        Queue scrapes of both Zillow and ASCE Hazard Tool for an address.
         
         Request body:
         {
             "address": "615 N SHIRK RD, NEW HOLLAND, PA 17557",
             "zillow_base_url": "https://www.zillow.com/homes/",  (Optional)
             "asce_standard": "ASCE/SEI 7-22",  (Optional)
-            "asce_risk_category": "II"  (Optional)
+            "asce_risk_category": "II",  (Optional)
+            "force_refresh": false  (Optional, bypass the cache)
         }
         
-        Response:
+        Sources with a cached result are returned under "data", the
+        others are queued under "jobs". When both are cached the status is
+        "success" and the response is 200.
+        
+        Response (202):
         {
-            "status": "success",
+            "status": "queued",
             "data": {
-                "asce": {
-                    "wind_speed": "113 mph",
-                    "snow_load": "54 lb/ft²"
-                },
-                "zillow": {
-                    "lot_size": "1.50 Acres",
-                    "parcel_number": "1907174400000"
-                }
+                "asce": {"wind_speed": "113 mph", "snow_load": "54 lb/ft²"}
+            },
+            "jobs": {
+                "zillow": {"job_id": "...", "state": "running", "status_url": "/api/scrape/jobs/..."}
             }
         }
         """
@@ -245,35 +343,39 @@ class ScraperController(http.Controller):
                     status=400
                 )
 
-            combined_result = {
-                'asce': None,
-                'zillow': None
+            Job = request.env['project.form.scrape.job'].sudo()
+            Cache = request.env['project.form.scrape.cache'].sudo()
+            requested = {
+                'asce': {'standard': asce_standard, 'risk_category': asce_risk_category},
+                'zillow': {'base_url': zillow_base_url},
             }
+            combined_result = {}
+            jobs = {}
             errors = []
+            for source, params in requested.items():
+                cached = Cache._lookup(source, address, params) if not data.get('force_refresh') else None
+                if cached:
+                    combined_result[source] = cached._to_api_dict()['result']
+                    if cached.error:
+                        errors.append(f"{source.upper()}: {cached.error}")
+                    continue
+                _logger.info("Queueing %s scrape for address: %s", source, address)
+                job = Job._enqueue(source, address, params)
+                jobs[source] = {
+                    'job_id': job.uuid,
+                    'state': job.state,
+                    'status_url': '/api/scrape/jobs/%s' % job.uuid,
+                }
 
-            # Scrape ASCE
-            _logger.info("Scraping ASCE for address: %s", address)
-            try:
-                combined_result['asce'] = scrape_asce_hazard(address, asce_standard, asce_risk_category)
-            except Exception as e:
-                _logger.error("ASCE scraping failed: %s", str(e))
-                errors.append(f"ASCE: {str(e)}")
-
-            # Scrape Zillow
-            _logger.info("Scraping Zillow for address: %s", address)
-            try:
-                combined_result['zillow'] = scrape_zillow(address, zillow_base_url)
-            except Exception as e:
-                _logger.error("Zillow scraping failed: %s", str(e))
-                errors.append(f"Zillow: {str(e)}")
-
-            _logger.info("Combined scrape result: %s", combined_result)
-
+            if jobs:
+                status = 'queued'
+            else:
+                status = 'success' if not errors else 'partial'
             response_data = {
-                'status': 'success' if not errors else 'partial',
-                'data': combined_result
+                'status': status,
+                'data': combined_result,
+                'jobs': jobs,
             }
-            
             if errors:
                 response_data['errors'] = errors
 
@@ -282,11 +384,12 @@ class ScraperController(http.Controller):
                 headers={
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*',
-                }
+                },
+                status=202 if jobs else 200
             )
 
         except Exception as e:
-            _logger.error("Error in combined scrape: %s", str(e))
+            _logger.error("Error queueing combined scrape: %s", str(e))
             return request.make_response(
                 json.dumps({
                     'status': 'error',
@@ -298,3 +401,44 @@ class ScraperController(http.Controller):
                 },
                 status=500
             )
+
+    @http.route('/api/scrape/health', type='http', auth='public', methods=['GET', 'OPTIONS'], csrf=False, cors='*')
+    @jwt_required(optional=True)
+    def scrape_health_endpoint(self, contractor=None, **kwargs):
+        """
+        Report the state of the headless Chrome pool used by the scrapers
+        in this worker process.
+        
+        Response:
+        {
+            "status": "success",
+            "data": {
+                "size": 2,
+                "running": 2,
+                "busy": 1,
+                "idle": 1,
+                "stats": {"started": 3, "recycled": 1, "crashed": 0, "jobs": 41, "timeouts": 0},
+                "sessions": [{"id": 2, "busy": true, "uses": 7, "age": 812, "idle_for": 0}]
+            }
+        }
+        """
+        if request.httprequest.method == 'OPTIONS':
+            return request.make_response(
+                json.dumps({'status': 'ok'}),
+                headers={
+                    'Access-Control-Allow-Origin': '*',
+                    'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+                }
+            )
+
+        return request.make_response(
+            json.dumps({
+                'status': 'success',
+                'data': get_browser_pool().health()
+            }),
+            headers={
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+            }
+        )
@@ -0,0 +1,40 @@
+import logging
+
+from odoo.tools.sql import column_exists
+
+_logger = logging.getLogger(__name__)
+
+# table -> (foreign key column, referenced table)
+LINKS = [
+    ('system_summaries', 'project_id', 'projects'),
+    ('site_details', 'project_id', 'projects'),
+    ('electrical_details', 'project_id', 'projects'),
+    ('advanced_electrical_details', 'project_id', 'projects'),
+    ('optional_extra_details', 'project_id', 'projects'),
+    ('system_components', 'project_id', 'projects'),
+    ('uploads', 'project_id', 'projects'),
+    # after system_summaries, whose orphans are gone by then
+    ('battery_infos', 'system_summary_id', 'system_summaries'),
+]
+
+
+def migrate(cr, version):
+    for table, column, target in LINKS:
+        legacy = '%s_uuid_legacy' % column
+        if not column_exists(cr, table, legacy):
+            continue
+        cr.execute("""
+            UPDATE {table} child
+               SET {column} = parent.id
+              FROM {target} parent
+             WHERE parent.uuid = child.{legacy}
+        """.format(table=table, column=column, target=target, legacy=legacy))
+        _logger.info("Linked %d rows of %s to %s", cr.rowcount, table, target)
+
+        # rows pointing to a deleted parent could never be reached again
+        cr.execute("DELETE FROM {table} WHERE {column} IS NULL".format(table=table, column=column))
+        if cr.rowcount:
+            _logger.warning("Removed %d orphaned rows from %s", cr.rowcount, table)
+
+        cr.execute("ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL".format(table=table, column=column))
+        cr.execute("ALTER TABLE {table} DROP COLUMN {legacy}".format(table=table, legacy=legacy))
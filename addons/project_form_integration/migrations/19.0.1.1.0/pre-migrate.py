@@ -0,0 +1,21 @@
+from odoo.tools.sql import column_exists, column_type, rename_column
+
+# table -> uuid column replaced by an integer foreign key of the same name
+UUID_LINKS = {
+    'system_summaries': 'project_id',
+    'site_details': 'project_id',
+    'electrical_details': 'project_id',
+    'advanced_electrical_details': 'project_id',
+    'optional_extra_details': 'project_id',
+    'system_components': 'project_id',
+    'uploads': 'project_id',
+    'battery_infos': 'system_summary_id',
+}
+
+
+def migrate(cr, version):
+    # Keep the uuids aside so the ORM creates the new integer columns and
+    # their foreign keys from scratch; post-migrate backfills them.
+    for table, column in UUID_LINKS.items():
+        if column_exists(cr, table, column) and column_type(cr, table, column) == 'varchar':
+            rename_column(cr, table, column, '%s_uuid_legacy' % column)
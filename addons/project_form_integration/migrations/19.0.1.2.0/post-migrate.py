@@ -0,0 +1,8 @@
+def migrate(cr, version):
+    # Projects created before the asynchronous sync already have their task;
+    # the ones without one stay pending and are picked up by the retry cron.
+    cr.execute("""
+        UPDATE projects
+           SET task_sync_state = 'done'
+         WHERE odoo_task_id IS NOT NULL AND task_sync_state = 'pending'
+    """)
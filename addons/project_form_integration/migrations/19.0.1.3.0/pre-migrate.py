@@ -0,0 +1,16 @@
+import logging
+
+import psycopg2
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    # The trigram index of normalized_address and the fuzzy address lookup
+    # rely on pg_trgm; it must exist before the ORM creates the index.
+    try:
+        with cr.savepoint():
+            cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except psycopg2.Error:
+        _logger.warning("Could not create the pg_trgm extension, "
+                        "normalized_address gets a btree index and fuzzy matching falls back to prefixes")
@@ -0,0 +1,14 @@
+from odoo.tools import config
+
+from odoo.addons.project_form_integration.services.passwords import DEFAULT_ROUNDS, get_crypt_context
+
+
+def migrate(cr, version):
+    # Contractor passwords were stored in plaintext; hash them all now
+    # rather than waiting for each contractor's next login.
+    ctx = get_crypt_context(int(config.get('contractor_password_rounds', DEFAULT_ROUNDS)))
+    cr.execute("SELECT id, password FROM project_form_contractor WHERE password IS NOT NULL")
+    for contractor_id, password in cr.fetchall():
+        if ctx.identify(password) == 'plaintext':
+            cr.execute("UPDATE project_form_contractor SET password = %s WHERE id = %s",
+                       (ctx.hash(password), contractor_id))
@@ -0,0 +1,34 @@
+import json
+import logging
+
+from odoo.tools.sql import column_exists, column_type
+
+_logger = logging.getLogger(__name__)
+
+# Text columns holding JSON arrays of URLs, now Json (jsonb) fields
+JSON_COLUMNS = {
+    'system_components': 'attachment',
+    'battery_infos': 'image',
+    'electrical_details': 'one_line_diagram',
+}
+
+
+def migrate(cr, version):
+    # Convert in place: letting the ORM change the column type would move
+    # the data aside into a new column instead.
+    for table, column in JSON_COLUMNS.items():
+        if not column_exists(cr, table, column) or column_type(cr, table, column) == 'jsonb':
+            continue
+        # values that are not valid JSON were single URLs stored as is
+        cr.execute('SELECT id, "{0}" FROM "{1}" WHERE "{0}" IS NOT NULL'.format(column, table))
+        for record_id, value in cr.fetchall():
+            try:
+                json.loads(value)
+            except ValueError:
+                _logger.info("Wrapping non-JSON %s.%s of record %s in a list", table, column, record_id)
+                fixed = json.dumps([value]) if value.strip() else None
+                cr.execute('UPDATE "{1}" SET "{0}" = %s WHERE id = %s'.format(column, table), (fixed, record_id))
+        cr.execute("""
+            ALTER TABLE "{1}" ALTER COLUMN "{0}" TYPE jsonb
+            USING CASE WHEN "{0}" IS NULL OR "{0}" = 'null' THEN NULL ELSE "{0}"::jsonb END
+        """.format(column, table))
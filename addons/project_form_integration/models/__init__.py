@@ -2,6 +2,11 @@ from . import user_profile
 from . import submission_type
 from . import service
 from . import project_inherit
+from . import project_task_sync
+from . import project_delete
+from . import project_bus
+from . import project_update
+from . import project_summary
 from . import system_summary
 from . import battery_info
 from . import site_details
@@ -12,7 +17,9 @@ from . import system_components
 from . import uploads
 from . import engineering_firm
 from . import project_task_inherit
+from . import task_lookup_cache
 from . import contractor
 from . import contractor_license
-
-
+from . import revoked_token
+from . import scrape_job
+from . import scrape_cache
@@ -8,7 +8,7 @@ class AdvancedElectricalDetail(models.Model):
     _table = 'advanced_electrical_details'
 
     uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()),null=False)
-    project_id = fields.Char(string='Project', required=True, index=True)
+    project_id = fields.Many2one('project.form.project', string='Project', required=True, index=True, ondelete='cascade')
     meter_location = fields.Char()
     service_entrance_type = fields.Char()
     subpanel_details = fields.Char()
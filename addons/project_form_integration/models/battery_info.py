@@ -8,10 +8,10 @@ class BatteryInfo(models.Model):
     _table = 'battery_infos'
 
     uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()),null=False)
-    system_summary_id = fields.Char(string='System Summary', required=True, index=True)
+    system_summary_id = fields.Many2one('project.form.system.summary', string='System Summary', required=True, index=True, ondelete='cascade')
     qty = fields.Integer(required=True)
     model = fields.Char()
-    image = fields.Text(string='Image URLs (JSON array)')
+    image = fields.Json(string='Image URLs')
 
     _sql_constraints = [
         ('system_summary_unique', 'unique(system_summary_id)', 'System Summary must be unique')
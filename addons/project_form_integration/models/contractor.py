@@ -1,4 +1,9 @@
 from odoo import models, fields, api
+from odoo.tools import config
+
+from ..services.jwt_auth import AUTH_STAMP
+from ..services.passwords import DEFAULT_ROUNDS, get_crypt_context
+from ..services.stamps import bump_stamp
 
 class Contractor(models.Model):
     _name = 'project.form.contractor'
@@ -7,7 +12,8 @@ class Contractor(models.Model):
     name = fields.Char(string='Name', required=True)
     company_name = fields.Char(string='Company Name')
     email = fields.Char(string='Email', required=True)
-    password = fields.Char(string='Password', required=True) # In production, this should be hashed
+    password = fields.Char(string='Password', required=True, copy=False,
+                           help='PBKDF2-SHA512 hash; plain values are hashed on save')
     address = fields.Char(string='Address')
     phone = fields.Char(string='Phone')
     logo_url = fields.Char(string='Logo URL')
@@ -16,3 +22,55 @@ class Contractor(models.Model):
     _sql_constraints = [
         ('email_unique', 'unique(email)', 'The email address must be unique for each contractor.')
     ]
+
+    @api.model
+    def _crypt_context(self):
+        return get_crypt_context(int(config.get('contractor_password_rounds', DEFAULT_ROUNDS)))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if vals.get('password'):
+                vals['password'] = self._crypt_context().hash(vals['password'])
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if vals.get('password'):
+            vals = dict(vals, password=self._crypt_context().hash(vals['password']))
+        return super().write(vals)
+
+    def _set_password_hash(self, password_hash):
+        # Bypasses write(), which would hash the hash again
+        self.ensure_one()
+        self.env.cr.execute("UPDATE %s SET password = %%s WHERE id = %%s" % self._table,
+                            (password_hash, self.id))
+        self.invalidate_recordset(['password'])
+
+    @api.model
+    def _authenticate(self, email, password):
+        """Return the contractor of ``email`` if ``password`` matches, else an empty recordset.
+
+        Looks the contractor up by its unique email only. Hashes made with
+        other rounds, or stored in plaintext, are upgraded on success.
+        """
+        ctx = self._crypt_context()
+        contractor = self.search([('email', '=', email)], limit=1)
+        if not contractor:
+            # spend the same time as a wrong password
+            ctx.dummy_verify()
+            return contractor
+        valid, replacement = ctx.verify_and_update(password, contractor.password)
+        if not valid:
+            return self.browse()
+        if replacement:
+            contractor._set_password_hash(replacement)
+        return contractor
+
+    def _contractor_exists(self, contractor_id):
+        # Remembered per worker by services.jwt_auth until a contractor is deleted
+        return bool(self.browse(contractor_id).exists())
+
+    def unlink(self):
+        # authenticated contractors are cached per worker
+        bump_stamp(self.env.cr, AUTH_STAMP)
+        return super().unlink()
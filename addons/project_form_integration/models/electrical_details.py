@@ -8,7 +8,7 @@ class ElectricalDetail(models.Model):
     _table = 'electrical_details'
 
     uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()),null=False)
-    project_id = fields.Char(string='Project', required=True, index=True)
+    project_id = fields.Many2one('project.form.project', string='Project', required=True, index=True, ondelete='cascade')
     main_panel_size = fields.Char()
     bus_rating = fields.Char()
     main_breaker = fields.Char()
@@ -19,7 +19,7 @@ class ElectricalDetail(models.Model):
         ('opposite', 'Opposite'),
         ('unknown', 'Unknown')
     ], string='PV Breaker Location')
-    one_line_diagram = fields.Text(string='One Line Diagram (JSON array)')
+    one_line_diagram = fields.Json(string='One Line Diagram URLs')
 
     _sql_constraints = [
         ('project_unique', 'unique(project_id)', 'Project must be unique')
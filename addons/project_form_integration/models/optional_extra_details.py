@@ -8,7 +8,7 @@ class OptionalExtraDetail(models.Model):
     _table = 'optional_extra_details'
 
     uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()),null=False)
-    project_id = fields.Char(string='Project', required=True, index=True)
+    project_id = fields.Many2one('project.form.project', string='Project', required=True, index=True, ondelete='cascade')
     miracle_watt_required = fields.Boolean(default=False)
     miracle_watt_notes = fields.Text()
     der_rlc_required = fields.Boolean(default=False)
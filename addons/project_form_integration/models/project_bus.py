@@ -0,0 +1,52 @@
+from odoo import models
+from odoo.tools import html2plaintext
+import hashlib
+import hmac
+
+UPDATES_CHANNEL_PREFIX = 'project_form.updates'
+UPDATES_NOTIFICATION = 'project_form/update'
+
+
+class Project(models.Model):
+    _inherit = 'project.form.project'
+
+    def _get_updates_channel(self):
+        """Bus channel carrying the live updates of this project.
+
+        The name ends with an HMAC of the uuid, so only clients that were
+        handed the channel by the authenticated channel endpoint can listen.
+        """
+        self.ensure_one()
+        secret = self.env['ir.config_parameter'].sudo().get_param('database.secret')
+        signature = hmac.new(secret.encode(), self.uuid.encode(), hashlib.sha256).hexdigest()[:32]
+        return '%s/%s/%s' % (UPDATES_CHANNEL_PREFIX, self.uuid, signature)
+
+    def _notify_updates(self, event, payload):
+        """Push one event to the subscribers of every project in ``self``.
+
+        Notifications are sent by the bus when the transaction commits.
+        """
+        Bus = self.env['bus.bus'].sudo()
+        for project in self:
+            Bus._sendone(project._get_updates_channel(), UPDATES_NOTIFICATION, dict(
+                payload, project_id=project.uuid, event=event))
+
+    def _notify_status_update(self, task):
+        self._notify_updates('status', {
+            'status': task.stage_id.name if task.stage_id else None,
+            'odoo_stage': task.stage_id.name if task.stage_id else 'Unknown',
+        })
+
+    def _notify_message_update(self, message):
+        # same shape as a chat_logs entry of /api/project-updates
+        self._notify_updates('message', {
+            'message': {
+                'id': message.id,
+                'date': str(message.date),
+                'author': message.author_id.name if message.author_id else 'System',
+                'body': html2plaintext(message.body) if message.body else '',
+                'type': message.message_type,
+                'subtype': message.subtype_id.name if message.subtype_id else 'Note',
+                'tracking': [],
+            },
+        })
@@ -0,0 +1,72 @@
+from odoo import models, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Tables emptied together with their projects, in the order they are reported
+CASCADE_TABLES = [
+    ('battery_infos', """
+        DELETE FROM battery_infos b
+         USING system_summaries s
+         WHERE b.system_summary_id = s.id AND s.project_id = ANY(%(ids)s)
+     RETURNING 1"""),
+    ('system_summaries', "DELETE FROM system_summaries WHERE project_id = ANY(%(ids)s) RETURNING 1"),
+    ('site_details', "DELETE FROM site_details WHERE project_id = ANY(%(ids)s) RETURNING 1"),
+    ('electrical_details', "DELETE FROM electrical_details WHERE project_id = ANY(%(ids)s) RETURNING 1"),
+    ('advanced_electrical_details', "DELETE FROM advanced_electrical_details WHERE project_id = ANY(%(ids)s) RETURNING 1"),
+    ('optional_extra_details', "DELETE FROM optional_extra_details WHERE project_id = ANY(%(ids)s) RETURNING 1"),
+    ('system_components', "DELETE FROM system_components WHERE project_id = ANY(%(ids)s) RETURNING 1"),
+    ('uploads', "DELETE FROM uploads WHERE project_id = ANY(%(ids)s) RETURNING 1"),
+    ('project_services', "DELETE FROM project_services WHERE project_id = ANY(%(ids)s) RETURNING 1"),
+    ('project_summaries', "DELETE FROM project_summaries WHERE project_id = ANY(%(ids)s) RETURNING 1"),
+    ('projects', "DELETE FROM projects WHERE id = ANY(%(ids)s) RETURNING 1"),
+]
+
+
+class Project(models.Model):
+    _inherit = 'project.form.project'
+
+    def _delete_cascade(self, unlink_tasks=True):
+        """Delete the projects in ``self`` and every record hanging off them.
+
+        All tables are emptied by one statement made of data-modifying CTEs,
+        so the cost is the same for one project or thousands. The linked
+        Odoo tasks are unlinked through the ORM in a single call when
+        ``unlink_tasks`` is set; a failure there is logged and does not stop
+        the deletion. Returns the number of deleted rows per table.
+        """
+        counts = {table: 0 for table, _query in CASCADE_TABLES}
+        if not self:
+            return counts
+        self.check_access('unlink')
+        task_ids = [task_id for task_id in self.mapped('odoo_task_id') if task_id]
+
+        self.env.flush_all()
+        # CTE names are prefixed so they do not shadow the tables themselves
+        ctes = ',\n'.join('deleted_%s AS (%s)' % (table, query) for table, query in CASCADE_TABLES)
+        counters = ', '.join('(SELECT count(*) FROM deleted_%s)' % table for table, _query in CASCADE_TABLES)
+        self.env.cr.execute('WITH %s\nSELECT %s' % (ctes, counters), {'ids': self.ids})
+        counts = dict(zip([table for table, _query in CASCADE_TABLES], self.env.cr.fetchone()))
+        self.env.invalidate_all()
+
+        if unlink_tasks and task_ids:
+            try:
+                with self.env.cr.savepoint():
+                    tasks = self.env['project.task'].sudo().browse(task_ids).exists()
+                    tasks.unlink()
+                counts['project_task'] = len(tasks)
+            except Exception as e:
+                _logger.warning("Failed to delete Odoo tasks %s: %s", task_ids, str(e))
+        _logger.info("Deleted projects and related records: %s", counts)
+        return counts
+
+    @api.model
+    def _delete_by_uuids(self, uuids):
+        """Delete the projects with the given uuids, see :meth:`_delete_cascade`.
+
+        Returns ``(counts, missing)`` where ``missing`` lists the uuids that
+        matched no project.
+        """
+        projects = self.search([('uuid', 'in', list(uuids))])
+        missing = sorted(set(uuids) - set(projects.mapped('uuid')))
+        return projects._delete_cascade(), missing
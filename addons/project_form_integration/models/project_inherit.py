@@ -1,7 +1,35 @@
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index
+import base64
+import binascii
+import json
+import logging
+import psycopg2
 import uuid
 
+from ..services.address import normalize_address
+
+_logger = logging.getLogger(__name__)
+
+# Top-level keys of the API payload that are backed by related tables
+API_SECTIONS = (
+    'user_profile', 'submission_type', 'system_summary', 'site_details',
+    'electrical_details', 'advanced_electrical_details', 'optional_extra_details',
+    'system_components', 'uploads', 'status',
+)
+
+# Every top-level key a client can ask for with ``fields=``
+API_FIELDS = (
+    'id', 'name', 'status', 'address', 'type', 'general_notes', 'created_at',
+    'updated_at', 'version', 'user_profile', 'submission_type', 'services', 'system_summary',
+    'site_details', 'electrical_details', 'advanced_electrical_details',
+    'optional_extra_details', 'system_components', 'uploads', 'contractor_id',
+)
+
+# A contractor project never shares its address with another contractor project
+NORMALIZED_ADDRESS_UNIQUE_INDEX = 'projects_contractor_normalized_address_unique'
+
 
 class Project(models.Model):
     _name = 'project.form.project'
@@ -11,22 +39,26 @@ class Project(models.Model):
     uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()),null=False)
     created_at = fields.Datetime(string='Created At', default=fields.Datetime.now, required=True)
     updated_at = fields.Datetime(string='Updated At', default=fields.Datetime.now, required=True)
+    version = fields.Integer(default=1, required=True, readonly=True, copy=False,
+                             help='Incremented by every API update, for If-Match preconditions')
 
     user_profile_id = fields.Char(string='User Profile ID', required=True)
     name = fields.Char(required=True)
     address = fields.Char(required=True)
+    normalized_address = fields.Char(compute='_compute_normalized_address', store=True, index='trigram',
+                                     help='Address reduced to a canonical form, used to detect duplicates')
     type = fields.Char(required=True)
     status = fields.Char(string='Status', default='New Job Creation')
     submission_type_id = fields.Char(string='Submission Type ID', required=True)
     general_notes = fields.Text()
-    odoo_task_id = fields.Integer(string='Odoo Task ID', help='Reference to auto-created task in Odoo Project module')
+    odoo_task_id = fields.Integer(string='Odoo Task ID', index=True, help='Reference to auto-created task in Odoo Project module')
     
     # Relationships
     # Note: Many2many with Char IDs might be tricky in Odoo, but we define it to try mapping
     service_ids = fields.Many2many('project.form.service', 'project_services', 'project_id', 'service_id', string='Services')
     contractor_id = fields.Many2one('project.form.contractor', string='Contractor')
     
-    # Reverse relations (One2many works with Char field on other side)
+    # Reverse relations
     system_summary_id = fields.One2many('project.form.system.summary', 'project_id', string='System Summary')
     site_detail_id = fields.One2many('project.form.site.detail', 'project_id', string='Site Details')
     electrical_detail_id = fields.One2many('project.form.electrical.detail', 'project_id', string='Electrical Details')
@@ -35,10 +67,34 @@ class Project(models.Model):
     system_component_ids = fields.One2many('project.form.system.component', 'project_id', string='System Components')
     upload_ids = fields.One2many('project.form.upload', 'project_id', string='Uploads')
 
+    def init(self):
+        # Keyset pagination of the API walks (created_at, id) backwards
+        create_index(self.env.cr, 'projects_created_at_id_index', self._table,
+                     ['created_at DESC', 'id DESC'])
+        create_index(self.env.cr, 'projects_contractor_created_at_id_index', self._table,
+                     ['contractor_id', 'created_at DESC', 'id DESC'])
+        # Equality probes of the duplicate check; the trigram index serves fuzzy lookups
+        create_index(self.env.cr, 'projects_normalized_address_btree_index', self._table,
+                     ['normalized_address'])
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS {index}
+                        ON projects (normalized_address) WHERE contractor_id IS NOT NULL
+                """.format(index=NORMALIZED_ADDRESS_UNIQUE_INDEX))
+        except psycopg2.IntegrityError:
+            _logger.warning("Duplicate contractor addresses in projects, unique index %s not created",
+                            NORMALIZED_ADDRESS_UNIQUE_INDEX)
+
+    @api.depends('address')
+    def _compute_normalized_address(self):
+        for project in self:
+            project.normalized_address = normalize_address(project.address) or False
+
     @api.constrains('address', 'contractor_id')
     def _check_address_contractor(self):
         for audit in self:
-            if audit.address and audit.contractor_id:
+            if audit.normalized_address and audit.contractor_id:
                 # Check if another project exists with the same address but DIFFERENT contractor
                 # OR if another project exists with the same address and NO contractor locally
                 # But the request says: "if other project is created by a contractor with an address that is already here then donot allow it."
@@ -46,8 +102,9 @@ class Project(models.Model):
                 # Assuming "already here" means any EXISTING project 
                 
                 # Let's interpret strict uniqueness for address unless it's the SAME project
+                # Compare normalized forms so formatting variants count as the same address
                 domain = [
-                    ('address', '=', audit.address),
+                    ('normalized_address', '=', audit.normalized_address),
                     ('id', '!=', audit.id)
                 ]
                 blocking_project = self.search(domain, limit=1)
@@ -59,3 +116,308 @@ class Project(models.Model):
                      # So if I am a contractor and I try to use an address that is already in the system (by anyone), block it.
                      raise ValidationError("The address '%s' is already associated with another project." % audit.address)
 
+
+    # ------------------------------------------------------------------
+    # API serialization
+    # ------------------------------------------------------------------
+
+    def _get_related_bundle(self, sections=None):
+        """Load the related records of every project in ``self``.
+
+        Child records hang off integer foreign keys, so reading a One2many on
+        one project fetches it for the whole recordset in a single query
+        (relational prefetch). User profiles and submission types are still
+        referenced by uuid and read with one ``IN`` query each.
+        ``sections`` restricts loading to the given API sections (all of
+        them when ``None``). Returns a dict keyed by project uuid.
+        """
+        env = self.env
+        wanted = set(API_SECTIONS if sections is None else sections)
+        projects = self.sudo()
+
+        def load_by_uuid(section, model, uuids):
+            if section not in wanted or not uuids:
+                return {}
+            result = {}
+            # ordered by id, keep the first one like search(limit=1)
+            for record in env[model].sudo().search([('uuid', 'in', list(uuids))], order='id'):
+                result.setdefault(record.uuid, record)
+            return result
+
+        user_profiles = load_by_uuid('user_profile', 'project.form.user.profile',
+                                     set(projects.mapped('user_profile_id')) - {False})
+        submission_types = load_by_uuid('submission_type', 'project.form.submission.type',
+                                        set(projects.mapped('submission_type_id')) - {False})
+
+        task_stages = {}
+        if 'status' in wanted:
+            # Only projects without a stored status fall back to the task stage
+            task_ids = [project.odoo_task_id for project in projects if project.odoo_task_id and not project.status]
+            if task_ids:
+                tasks = env['project.task'].sudo().browse(task_ids).exists()
+                task_stages = {task.id: task.stage_id.name if task.stage_id else None for task in tasks}
+
+        def first(records):
+            # slicing would drop the prefetch set, iterating keeps it
+            return next(iter(records), records.browse())
+
+        def one(project, field_name, section):
+            return first(project[field_name]) if section in wanted else None
+
+        def many(project, field_name, section):
+            if section not in wanted:
+                return env[project._fields[field_name].comodel_name].browse()
+            return project[field_name]
+
+        bundle = {}
+        for project in projects:
+            system_summary = one(project, 'system_summary_id', 'system_summary')
+            bundle[project.uuid] = {
+                'user_profile': user_profiles.get(project.user_profile_id),
+                'submission_type': submission_types.get(project.submission_type_id),
+                'system_summary': system_summary,
+                'battery_info': first(system_summary.battery_info_id) if system_summary else None,
+                'site_details': one(project, 'site_detail_id', 'site_details'),
+                'electrical_details': one(project, 'electrical_detail_id', 'electrical_details'),
+                'advanced_electrical_details': one(project, 'advanced_electrical_detail_id', 'advanced_electrical_details'),
+                'optional_extra_details': one(project, 'optional_extra_detail_id', 'optional_extra_details'),
+                'system_components': many(project, 'system_component_ids', 'system_components'),
+                'uploads': many(project, 'upload_ids', 'uploads'),
+                'task_stage': task_stages.get(project.odoo_task_id),
+            }
+        return bundle
+
+    def _serialize_for_api(self, field_names=None, bundle=None):
+        """Serialize ``self`` to the JSON structure returned by the projects API.
+
+        The related records are loaded with :meth:`_get_related_bundle` so a
+        whole page of projects costs a constant number of queries.
+        ``field_names`` is an optional iterable of top-level keys to return; ``id`` is always
+        included and sections that are not requested are never loaded.
+        """
+        if field_names is not None:
+            field_names = set(field_names) | {'id'}
+        if bundle is None:
+            sections = None if field_names is None else field_names & set(API_SECTIONS)
+            bundle = self._get_related_bundle(sections=sections)
+        return [project._serialize_one_for_api(bundle[project.uuid], field_names) for project in self]
+
+    def _serialize_one_for_api(self, related, field_names=None):
+        self.ensure_one()
+
+        def wanted(key):
+            return field_names is None or key in field_names
+
+        data = {}
+        if wanted('id'):
+            data['id'] = self.uuid
+        if wanted('name'):
+            data['name'] = self.name
+        if wanted('status'):
+            # Fall back to the linked task stage when no status is stored
+            data['status'] = self.status or related['task_stage']
+        if wanted('address'):
+            data['address'] = self.address
+        if wanted('type'):
+            data['type'] = self.type
+        if wanted('general_notes'):
+            data['general_notes'] = self.general_notes
+        if wanted('created_at'):
+            data['created_at'] = str(self.created_at)
+        if wanted('updated_at'):
+            data['updated_at'] = str(self.updated_at)
+        if wanted('version'):
+            data['version'] = self.version
+
+        if wanted('user_profile'):
+            user_profile = related['user_profile']
+            data['user_profile'] = {
+                'id': user_profile.uuid,
+                'company_name': user_profile.company_name,
+                'contact_name': user_profile.contact_name,
+                'email': user_profile.email,
+                'phone': user_profile.phone,
+            } if user_profile else {}
+
+        if wanted('submission_type'):
+            submission_type = related['submission_type']
+            data['submission_type'] = {
+                'id': submission_type.uuid,
+                'name': submission_type.name,
+            } if submission_type else {}
+
+        if wanted('services'):
+            data['services'] = [{'id': service.uuid, 'name': service.name} for service in self.service_ids]
+
+        if wanted('system_summary'):
+            system_summary = related['system_summary']
+            battery_info = related['battery_info']
+            system_summary_data = {}
+            if system_summary:
+                battery_info_data = {}
+                if battery_info:
+                    battery_info_data = {
+                        'id': battery_info.uuid,
+                        'qty': battery_info.qty,
+                        'model': battery_info.model,
+                        'image': battery_info.image or [],
+                    }
+                system_summary_data = {
+                    'id': system_summary.uuid,
+                    'system_size': system_summary.system_size,
+                    'system_type': system_summary.system_type,
+                    'pv_modules': system_summary.pv_modules,
+                    'inverters': system_summary.inverters,
+                    'battery_info': battery_info_data,
+                }
+            data['system_summary'] = system_summary_data
+
+        if wanted('site_details'):
+            site_details = related['site_details']
+            data['site_details'] = {
+                'id': site_details.uuid,
+                'roof_material': site_details.roof_material,
+                'roof_pitch': site_details.roof_pitch,
+                'number_of_arrays': site_details.number_of_arrays,
+                'ground_mount_type': site_details.ground_mount_type,
+                'foundation_type': site_details.foundation_type,
+                'main_panel_size': site_details.main_panel_size,
+                'utility_provider': site_details.utility_provider,
+                'jurisdiction': site_details.jurisdiction,
+            } if site_details else {}
+
+        if wanted('electrical_details'):
+            electrical_details = related['electrical_details']
+            data['electrical_details'] = {
+                'id': electrical_details.uuid,
+                'main_panel_size': electrical_details.main_panel_size,
+                'bus_rating': electrical_details.bus_rating,
+                'main_breaker': electrical_details.main_breaker,
+                'pv_breaker_location': electrical_details.pv_breaker_location,
+                'one_line_diagram': electrical_details.one_line_diagram or [],
+            } if electrical_details else {}
+
+        if wanted('advanced_electrical_details'):
+            adv_elec = related['advanced_electrical_details']
+            data['advanced_electrical_details'] = {
+                'id': adv_elec.uuid,
+                'meter_location': adv_elec.meter_location,
+                'service_entrance_type': adv_elec.service_entrance_type,
+                'subpanel_details': adv_elec.subpanel_details,
+            } if adv_elec else {}
+
+        if wanted('optional_extra_details'):
+            opt_extra = related['optional_extra_details']
+            data['optional_extra_details'] = {
+                'id': opt_extra.uuid,
+                'miracle_watt_required': opt_extra.miracle_watt_required,
+                'miracle_watt_notes': opt_extra.miracle_watt_notes,
+                'der_rlc_required': opt_extra.der_rlc_required,
+                'der_rlc_notes': opt_extra.der_rlc_notes,
+                'setback_constraints': opt_extra.setback_constraints,
+                'setback_notes': opt_extra.setback_notes,
+                'site_access_restrictions': opt_extra.site_access_restrictions,
+                'site_access_notes': opt_extra.site_access_notes,
+                'inspection_notes': opt_extra.inspection_notes,
+                'inspection_notes_text': opt_extra.inspection_notes_text,
+                'battery_sld_requested': opt_extra.battery_sld_requested,
+                'battery_sld_notes': opt_extra.battery_sld_notes,
+            } if opt_extra else {}
+
+        if wanted('system_components'):
+            data['system_components'] = [{
+                'id': comp.uuid,
+                'type': comp.type,
+                'make_model': comp.make_model,
+                'qty': comp.qty,
+                'attachment': comp.attachment or [],
+                'notes': comp.notes,
+            } for comp in related['system_components']]
+
+        if wanted('uploads'):
+            data['uploads'] = [{
+                'id': upload.uuid,
+                'url': upload.url,
+                'name': upload.name,
+                'category': upload.category,
+                'mime_type': upload.mime_type,
+                'size': upload.size,
+                'provider': upload.provider,
+                'is_image': upload.is_image,
+                'preview_url': upload.preview_url or None,
+            } for upload in related['uploads']]
+
+        if wanted('contractor_id'):
+            data['contractor_id'] = self.contractor_id.id if self.contractor_id else None
+
+        return data
+
+    # ------------------------------------------------------------------
+    # Address lookups
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _find_similar_addresses(self, address, limit=5, threshold=0.4):
+        """Return existing addresses close to ``address``, best match first.
+
+        Uses the pg_trgm similarity of the normalized forms, served by the
+        trigram index; falls back to a prefix match when the extension is
+        missing. Returns a list of ``(address, similarity)``.
+        """
+        normalized = normalize_address(address)
+        if not normalized:
+            return []
+        self.env.flush_all()
+        if self.env.registry.has_trigram:
+            self.env.cr.execute("""
+                SELECT address, similarity(normalized_address, %(value)s) AS score
+                  FROM projects
+                 WHERE normalized_address %% %(value)s
+                   AND similarity(normalized_address, %(value)s) >= %(threshold)s
+                 ORDER BY score DESC, id DESC
+                 LIMIT %(limit)s
+            """, {'value': normalized, 'threshold': threshold, 'limit': limit})
+            return [(row[0], round(row[1], 3)) for row in self.env.cr.fetchall()]
+        projects = self.search([('normalized_address', '=like', normalized + '%')], limit=limit)
+        return [(project.address, 1.0 if project.normalized_address == normalized else None)
+                for project in projects]
+
+    # ------------------------------------------------------------------
+    # API listing
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _encode_api_cursor(self, project):
+        """Build the opaque keyset cursor pointing just after ``project``."""
+        payload = json.dumps([fields.Datetime.to_string(project.created_at), project.id])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @api.model
+    def _decode_api_cursor(self, cursor):
+        padded = cursor + '=' * (-len(cursor) % 4)
+        try:
+            created_at, record_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            return fields.Datetime.to_datetime(created_at), int(record_id)
+        except (ValueError, TypeError, binascii.Error):
+            raise ValidationError("Invalid cursor '%s'." % cursor)
+
+    @api.model
+    def _get_api_page(self, domain, limit, cursor=None):
+        """Return one keyset page of projects ordered by ``created_at, id`` desc.
+
+        The cursor is pushed into the domain so every page is an index range
+        scan, however deep the client paginates. Returns ``(projects,
+        next_cursor)`` where ``next_cursor`` is ``None`` on the last page.
+        """
+        domain = list(domain)
+        if cursor:
+            created_at, record_id = self._decode_api_cursor(cursor)
+            domain += ['|',
+                       ('created_at', '<', created_at),
+                       '&', ('created_at', '=', created_at), ('id', '<', record_id)]
+        projects = self.search(domain, order='created_at desc, id desc', limit=limit + 1)
+        next_cursor = None
+        if len(projects) > limit:
+            projects = projects[:limit]
+            next_cursor = self._encode_api_cursor(projects[-1])
+        return projects, next_cursor
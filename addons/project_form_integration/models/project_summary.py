@@ -0,0 +1,179 @@
+from odoo import models, fields, api
+from odoo.tools.sql import create_index
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Upserts the summary row of the projects matched by a WHERE clause on ``p``
+REFRESH_SUMMARY_QUERY = """
+    INSERT INTO project_summaries (
+        project_id, uuid, name, address, type, status, submission_type_id, stage,
+        contractor_id, system_size, system_type, component_count, upload_count,
+        last_message_date, created_at, updated_at,
+        create_uid, create_date, write_uid, write_date
+    )
+    SELECT p.id, p.uuid, p.name, p.address, p.type, p.status, p.submission_type_id,
+           stage.name->>'en_US', p.contractor_id, ss.system_size, ss.system_type,
+           (SELECT count(*) FROM system_components c WHERE c.project_id = p.id),
+           (SELECT count(*) FROM uploads u WHERE u.project_id = p.id),
+           (SELECT max(m.date) FROM mail_message m
+             WHERE m.model = 'project.task' AND m.res_id = p.odoo_task_id),
+           p.created_at, p.updated_at,
+           %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+      FROM projects p
+      LEFT JOIN system_summaries ss ON ss.project_id = p.id
+      LEFT JOIN project_task task ON task.id = p.odoo_task_id
+      LEFT JOIN project_task_type stage ON stage.id = task.stage_id
+     WHERE {where}
+    ON CONFLICT (project_id) DO UPDATE SET
+        uuid = EXCLUDED.uuid,
+        name = EXCLUDED.name,
+        address = EXCLUDED.address,
+        type = EXCLUDED.type,
+        status = EXCLUDED.status,
+        submission_type_id = EXCLUDED.submission_type_id,
+        stage = EXCLUDED.stage,
+        contractor_id = EXCLUDED.contractor_id,
+        system_size = EXCLUDED.system_size,
+        system_type = EXCLUDED.system_type,
+        component_count = EXCLUDED.component_count,
+        upload_count = EXCLUDED.upload_count,
+        last_message_date = EXCLUDED.last_message_date,
+        created_at = EXCLUDED.created_at,
+        updated_at = EXCLUDED.updated_at,
+        write_uid = EXCLUDED.write_uid,
+        write_date = EXCLUDED.write_date
+"""
+
+
+class ProjectSummary(models.Model):
+    """Flat, read-only row per project for list and dashboard screens.
+
+    Rows are rebuilt with one set-based upsert right before the transaction
+    that changed their project commits, see
+    :meth:`project.form.project._mark_summary_dirty`.
+    """
+    _name = 'project.form.project.summary'
+    _description = 'Project Summary'
+    _table = 'project_summaries'
+    _order = 'created_at desc, project_id desc'
+
+    project_id = fields.Many2one('project.form.project', required=True, ondelete='cascade')
+    uuid = fields.Char(string='Project ID', required=True, index=True)
+    name = fields.Char()
+    address = fields.Char()
+    type = fields.Char()
+    status = fields.Char()
+    submission_type_id = fields.Char(string='Submission Type ID')
+    stage = fields.Char()
+    contractor_id = fields.Many2one('project.form.contractor', string='Contractor')
+    system_size = fields.Float(digits=(10, 2))
+    system_type = fields.Char()
+    component_count = fields.Integer()
+    upload_count = fields.Integer()
+    last_message_date = fields.Datetime()
+    created_at = fields.Datetime()
+    updated_at = fields.Datetime()
+
+    _sql_constraints = [
+        ('project_unique', 'unique(project_id)', 'A project has a single summary')
+    ]
+
+    def init(self):
+        # Same keyset as /api/projects, alone and per contractor: the
+        # project's creation date and id, so both endpoints share cursors
+        self.env.cr.execute("DROP INDEX IF EXISTS project_summaries_created_at_id_index")
+        self.env.cr.execute("DROP INDEX IF EXISTS project_summaries_contractor_created_at_id_index")
+        create_index(self.env.cr, 'project_summaries_created_at_project_id_index', self._table,
+                     ['created_at DESC', 'project_id DESC'])
+        create_index(self.env.cr, 'project_summaries_contractor_created_at_project_id_index', self._table,
+                     ['contractor_id', 'created_at DESC', 'project_id DESC'])
+        # Backfill the projects created before this table existed
+        self.env.cr.execute(
+            REFRESH_SUMMARY_QUERY.format(where="p.id NOT IN (SELECT project_id FROM project_summaries)"),
+            {'uid': self.env.uid})
+
+    def _to_api_dict(self):
+        self.ensure_one()
+        return {
+            'id': self.uuid,
+            'name': self.name,
+            'address': self.address,
+            'type': self.type,
+            'status': self.status,
+            'stage': self.stage,
+            'contractor_id': self.contractor_id.id or None,
+            'system_size': self.system_size,
+            'system_type': self.system_type,
+            'component_count': self.component_count,
+            'upload_count': self.upload_count,
+            'last_message_date': str(self.last_message_date) if self.last_message_date else None,
+            'created_at': str(self.created_at),
+            'updated_at': str(self.updated_at),
+        }
+
+    @api.model
+    def _get_api_page(self, domain, limit, cursor=None):
+        """Keyset page of summaries, with the cursors of ``/api/projects``.
+
+        Summaries are keyed on their project's ``created_at`` and id, so a
+        cursor of either endpoint continues the same listing in the other.
+        """
+        Project = self.env['project.form.project']
+        domain = list(domain)
+        if cursor:
+            created_at, project_id = Project._decode_api_cursor(cursor)
+            domain += ['|',
+                       ('created_at', '<', created_at),
+                       '&', ('created_at', '=', created_at), ('project_id', '<', project_id)]
+        summaries = self.search(domain, order='created_at desc, project_id desc', limit=limit + 1)
+        next_cursor = None
+        if len(summaries) > limit:
+            summaries = summaries[:limit]
+            next_cursor = Project._encode_api_cursor(summaries[-1].project_id)
+        return summaries, next_cursor
+
+
+class Project(models.Model):
+    _inherit = 'project.form.project'
+
+    summary_id = fields.One2many('project.form.project.summary', 'project_id', string='Summary')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        projects = super().create(vals_list)
+        projects._mark_summary_dirty()
+        return projects
+
+    def write(self, vals):
+        res = super().write(vals)
+        self._mark_summary_dirty()
+        return res
+
+    def _mark_summary_dirty(self):
+        """Refresh the summary rows of ``self`` just before the transaction commits.
+
+        Ids are collected for the whole transaction so a request that
+        touches a project many times, or many projects, costs one upsert.
+        """
+        if not self:
+            return
+        data = self.env.cr.precommit.data
+        dirty = data.get('project_form.summary_dirty')
+        if dirty is None:
+            dirty = data['project_form.summary_dirty'] = set()
+            env = self.env
+
+            @self.env.cr.precommit.add
+            def refresh():
+                ids = data.pop('project_form.summary_dirty')
+                env['project.form.project'].browse(ids).exists()._refresh_summaries()
+        dirty.update(self.ids)
+
+    def _refresh_summaries(self):
+        if not self:
+            return
+        self.env.flush_all()
+        self.env.cr.execute(REFRESH_SUMMARY_QUERY.format(where="p.id = ANY(%(ids)s)"),
+                            {'ids': self.ids, 'uid': self.env.uid})
+        self.env['project.form.project.summary'].invalidate_model()
@@ -6,12 +6,42 @@ class ProjectTask(models.Model):
     engineering_firm_id = fields.Many2one('project.form.engineering.firm', string='Engineering Firm')
 
     def write(self, vals):
+        old_stages = {task.id: task.stage_id.id for task in self} if 'stage_id' in vals else {}
         res = super(ProjectTask, self).write(vals)
         if 'stage_id' in vals:
-            for task in self:
-                # Find linked project.form.project using odoo_task_id
-                # Note: odoo_task_id is an Integer field on project.form.project
-                linked_projects = self.env['project.form.project'].sudo().search([('odoo_task_id', '=', task.id)])
-                for project in linked_projects:
-                    project.status = task.stage_id.name
+            self._sync_form_project_status(old_stages)
         return res
+
+    def _sync_form_project_status(self, old_stages):
+        """Copy the stage name of ``self`` to the linked form projects.
+
+        One search finds the projects of every task and each distinct stage
+        name is written with a single ``write``, however many tasks moved.
+        """
+        # Note: odoo_task_id is an Integer field on project.form.project
+        projects = self.env['project.form.project'].sudo().search([('odoo_task_id', 'in', self.ids)])
+        if not projects:
+            return
+        tasks = {task.id: task for task in self}
+        groups = {}
+        for project in projects:
+            status = tasks[project.odoo_task_id].stage_id.name
+            groups[status] = groups.get(status, projects.browse()) | project
+        for status, group in groups.items():
+            group.write({'status': status})
+
+        # push only real stage changes to the dashboards
+        for project in projects:
+            task = tasks[project.odoo_task_id]
+            if old_stages.get(task.id) != task.stage_id.id:
+                project._notify_status_update(task)
+
+    def message_post(self, **kwargs):
+        message = super(ProjectTask, self).message_post(**kwargs)
+        if message.message_type in ('comment', 'notification'):
+            linked_projects = self.env['project.form.project'].sudo().search([('odoo_task_id', '=', self.id)])
+            if linked_projects:
+                linked_projects._notify_message_update(message)
+                # last_message_date of the summary
+                linked_projects._mark_summary_dirty()
+        return message
@@ -0,0 +1,535 @@
+from odoo import models, fields, api
+from odoo.tools import config
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from ..services.stamps import bump_stamp, ensure_stamp_table, read_stamp
+
+_logger = logging.getLogger(__name__)
+
+FORM_SUBMISSIONS_PROJECT = 'Form Submissions'
+INITIAL_STAGE = 'New Job Creation'
+DESCRIPTION_TEMPLATE = 'project_form_integration.project_task_description'
+# Part of the description hash: bump it when the template changes so tasks re-render
+DESCRIPTION_VERSION = 1
+
+# Retry delays double from the base up to the cap, in seconds
+TASK_SYNC_BACKOFF_BASE = 60
+TASK_SYNC_BACKOFF_MAX = 3600
+TASK_SYNC_MAX_ATTEMPTS = 8
+
+# Bumped by changes of Odoo projects and stages, see models/task_lookup_cache.py
+TASK_LOOKUP_STAMP = 'task_lookups'
+# Tag and partner renames do not bump the stamp: entries are reloaded this
+# often, in seconds, and each map starts over past this many entries
+TASK_LOOKUP_TTL = 3600
+TASK_LOOKUP_CACHE_SIZE = 10000
+
+
+class TaskLookups:
+    """What task creation looks up in one database, kept per worker process.
+
+    ``target`` is ``(project id, stage id)`` of the Form Submissions
+    project; ``tags`` and ``partners`` map tag names and emails to ids.
+    Only committed ids go in, see ``_remember_task_lookups``.
+    """
+
+    def __init__(self, stamp):
+        self.stamp = stamp
+        self.loaded_at = time.monotonic()
+        self.target = None
+        self.tags = {}
+        self.partners = {}
+
+    def is_current(self, stamp):
+        return self.stamp == stamp and time.monotonic() - self.loaded_at < TASK_LOOKUP_TTL
+
+
+_task_lookups = {}
+_task_lookups_lock = threading.Lock()
+
+
+class Project(models.Model):
+    _inherit = 'project.form.project'
+
+    engineering_firm_id = fields.Many2one('project.form.engineering.firm', string='Engineering Firm')
+    task_sync_state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Task Sync State', default='pending', required=True, index=True, copy=False)
+    task_sync_attempts = fields.Integer(string='Task Sync Attempts', default=0, copy=False)
+    task_sync_error = fields.Text(string='Task Sync Error', copy=False)
+    task_sync_next_at = fields.Datetime(string='Next Task Sync Attempt', index=True, copy=False)
+    task_description_hash = fields.Char(string='Task Description Hash', copy=False,
+                                        help='Hash of the data last rendered into the task description')
+
+    # ------------------------------------------------------------------
+    # Odoo task creation
+    # ------------------------------------------------------------------
+
+    def init(self):
+        super().init()
+        ensure_stamp_table(self.env.cr)
+
+    @api.model
+    def _get_task_lookups(self):
+        """The task lookups of this worker, checked against the stamp once per transaction."""
+        data = self.env.cr.postcommit.data
+        lookups = data.get('project_form.task_lookups')
+        if lookups is not None:
+            return lookups
+        dbname = self.env.cr.dbname
+        stamp = read_stamp(self.env.cr, TASK_LOOKUP_STAMP)
+        with _task_lookups_lock:
+            lookups = _task_lookups.get(dbname)
+            if lookups is None or not lookups.is_current(stamp):
+                lookups = _task_lookups[dbname] = TaskLookups(stamp)
+        data['project_form.task_lookups'] = lookups
+        return lookups
+
+    @api.model
+    def _remember_task_lookups(self, target=None, tags=None, partners=None):
+        """Add what this transaction looked up to the worker's lookups once it commits."""
+        data = self.env.cr.postcommit.data
+        pending = data.get('project_form.task_lookups_pending')
+        if pending is None:
+            pending = data['project_form.task_lookups_pending'] = {'target': None, 'tags': {}, 'partners': {}}
+            self._get_task_lookups()
+            dbname = self.env.cr.dbname
+
+            @self.env.cr.postcommit.add
+            def remember():
+                lookups = _task_lookups.get(dbname)
+                if lookups is None:
+                    return
+                if pending['target']:
+                    lookups.target = pending['target']
+                for kind in ('tags', 'partners'):
+                    cache = getattr(lookups, kind)
+                    if len(cache) + len(pending[kind]) > TASK_LOOKUP_CACHE_SIZE:
+                        cache.clear()
+                    cache.update(pending[kind])
+        if target:
+            pending['target'] = target
+        pending['tags'].update(tags or {})
+        pending['partners'].update(partners or {})
+
+    @api.model
+    def _forget_task_lookups(self):
+        """Drop the lookups of a failed attempt, which may hold rolled back or stale ids."""
+        pending = self.env.cr.postcommit.data.get('project_form.task_lookups_pending')
+        if pending:
+            pending['target'] = None
+            pending['tags'].clear()
+            pending['partners'].clear()
+        with _task_lookups_lock:
+            _task_lookups.pop(self.env.cr.dbname, None)
+        self.env.cr.postcommit.data.pop('project_form.task_lookups', None)
+
+    @api.model
+    def _invalidate_task_lookups(self):
+        # every worker reloads its lookups once this transaction commits
+        bump_stamp(self.env.cr, TASK_LOOKUP_STAMP)
+
+    @api.model
+    def _get_task_target(self):
+        """Return the Form Submissions project and its initial stage, creating the project if needed."""
+        Project = self.env['project.project'].sudo()
+        Stage = self.env['project.task.type'].sudo()
+        target = self._get_task_lookups().target
+        if target:
+            return Project.browse(target[0]), Stage.browse(target[1])
+        odoo_project = Project.search([('name', '=', FORM_SUBMISSIONS_PROJECT)], limit=1)
+        if not odoo_project:
+            _logger.info("Creating '%s' project in Odoo", FORM_SUBMISSIONS_PROJECT)
+            odoo_project = Project.create({
+                'name': FORM_SUBMISSIONS_PROJECT,
+                'description': 'Auto-generated tasks from project form API submissions'
+            })
+        stage = Stage.search([
+            ('project_ids', 'in', [odoo_project.id]),
+            ('name', '=', INITIAL_STAGE)
+        ], limit=1)
+        if not stage:
+            # Get first stage of the project
+            stage = Stage.search([('project_ids', 'in', [odoo_project.id])], limit=1)
+        self._remember_task_lookups(target=(odoo_project.id, stage.id))
+        return odoo_project, stage
+
+    @api.model
+    def _resolve_task_tags(self, tag_names):
+        """Return a dict tag name -> project.tags id.
+
+        Names are served from the worker's lookups; the misses cost one
+        search, and the tags still missing one batch create.
+        """
+        Tag = self.env['project.tags'].sudo()
+        tag_names = list(dict.fromkeys(name for name in tag_names if name))
+        if not tag_names:
+            return {}
+        cache = self._get_task_lookups().tags
+        tag_map = {name: cache[name] for name in tag_names if name in cache}
+        misses = [name for name in tag_names if name not in tag_map]
+        if not misses:
+            return tag_map
+        found = {}
+        for tag in Tag.search([('name', 'in', misses)]):
+            found.setdefault(tag.name, tag.id)
+        missing = [name for name in misses if name not in found]
+        if missing:
+            for tag in Tag.create([{'name': name} for name in missing]):
+                found[tag.name] = tag.id
+        self._remember_task_lookups(tags=found)
+        tag_map.update(found)
+        return tag_map
+
+    @api.model
+    def _resolve_task_partners(self, user_profiles):
+        """Return a dict email -> res.partner id, like :meth:`_resolve_task_tags`."""
+        Partner = self.env['res.partner'].sudo()
+        profiles = {profile.email: profile for profile in user_profiles if profile.email}
+        if not profiles:
+            return {}
+        cache = self._get_task_lookups().partners
+        partner_map = {email: cache[email] for email in profiles if email in cache}
+        misses = [email for email in profiles if email not in partner_map]
+        if not misses:
+            return partner_map
+        found = {}
+        for partner in Partner.search([('email', 'in', misses)], order='id'):
+            found.setdefault(partner.email, partner.id)
+        missing = [profiles[email] for email in misses if email not in found]
+        if missing:
+            partners = Partner.create([{
+                'name': profile.company_name or profile.contact_name,
+                'email': profile.email,
+                'phone': profile.phone,
+                'is_company': True if profile.company_name else False,
+            } for profile in missing])
+            for partner in partners:
+                _logger.info("Created partner for %s", partner.email)
+                found[partner.email] = partner.id
+        self._remember_task_lookups(partners=found)
+        partner_map.update(found)
+        return partner_map
+
+    def _get_task_tag_names(self, related):
+        self.ensure_one()
+        tag_names = []
+        # Add project type as tag
+        if self.type:
+            tag_names.append(self.type.capitalize())
+        # Add submission type as tag
+        if related['submission_type']:
+            tag_names.append(related['submission_type'].name)
+        # Add service names as tags
+        tag_names.extend(self.service_ids.mapped('name'))
+        # Add system type as tag
+        if related['system_summary'] and related['system_summary'].system_type:
+            tag_names.append(related['system_summary'].system_type.capitalize())
+        return tag_names
+
+    def _get_task_priority(self, related):
+        self.ensure_one()
+        priority = '0'  # Default: Normal
+        sys_sum = related['system_summary']
+        if sys_sum and sys_sum.system_size:
+            if sys_sum.system_size > 20:
+                priority = '2'  # Very High
+            elif sys_sum.system_size >= 10:
+                priority = '1'  # High
+
+        # Lower priority if critical data is missing
+        if not related['electrical_details'] or not related['site_details']:
+            if priority == '2':
+                priority = '1'
+            elif priority == '1':
+                priority = '0'
+        return priority
+
+    def _create_odoo_tasks(self):
+        """Create the Odoo ``project.task`` of every project in ``self``.
+
+        Related data, tags, partners, the target project and its stage are
+        resolved once for the whole recordset and the tasks are created
+        with a single ``create``. Returns a dict project id -> task.
+        """
+        if not self:
+            return {}
+        odoo_project, stage = self._get_task_target()
+        bundle = self._get_related_bundle()
+
+        tag_names = {project.id: project._get_task_tag_names(bundle[project.uuid]) for project in self}
+        tag_map = self._resolve_task_tags([name for names in tag_names.values() for name in names])
+        partner_map = self._resolve_task_partners(
+            [bundle[project.uuid]['user_profile'] for project in self if bundle[project.uuid]['user_profile']])
+
+        description_data = {
+            project.id: project._get_task_description_data(bundle[project.uuid]) for project in self
+        }
+
+        vals_list = []
+        for project in self:
+            related = bundle[project.uuid]
+            user_profile = related['user_profile']
+            tag_ids = list(dict.fromkeys(tag_map[name] for name in tag_names[project.id]))
+            task_values = {
+                'name': f"{project.name} - {project.type.upper()}",
+                'project_id': odoo_project.id,
+                'description': project._generate_project_description(data=description_data[project.id]),
+                'priority': project._get_task_priority(related),
+                'partner_id': partner_map.get(user_profile.email, False) if user_profile else False,
+                'email_from': user_profile.email if user_profile else False,
+            }
+            if project.engineering_firm_id:
+                task_values['engineering_firm_id'] = project.engineering_firm_id.id
+            if tag_ids:
+                task_values['tag_ids'] = [(6, 0, tag_ids)]
+            if stage:
+                task_values['stage_id'] = stage.id
+            vals_list.append(task_values)
+
+        tasks = self.env['project.task'].sudo().create(vals_list)
+        result = {}
+        for project, task in zip(self, tasks):
+            project.write({
+                'odoo_task_id': task.id,
+                'task_description_hash': self._hash_task_description_data(description_data[project.id]),
+                'task_sync_state': 'done',
+                'task_sync_error': False,
+                'task_sync_next_at': False,
+            })
+            result[project.id] = task
+            _logger.info("Created enhanced Odoo task %s for project %s with %d tags, priority %s",
+                         task.id, project.uuid, len(task.tag_ids), task.priority)
+        return result
+
+    # ------------------------------------------------------------------
+    # Asynchronous task sync
+    # ------------------------------------------------------------------
+
+    def _schedule_task_sync(self):
+        """Create the Odoo tasks of ``self`` in the background once the current
+        transaction commits, so the API can answer as soon as the form data
+        is stored."""
+        from ..services.task_sync_runner import get_task_sync_runner
+        dbname = self.env.cr.dbname
+        project_ids = self.ids
+
+        @self.env.cr.postcommit.add
+        def submit():
+            get_task_sync_runner().submit(dbname, project_ids)
+
+    def _claim_task_sync(self):
+        """Lock the projects of ``self`` that still need a task and return them.
+
+        The row locks are held until the transaction ends, so a project is
+        never synced by two workers at once.
+        """
+        if not self:
+            return self
+        self.env.flush_all()
+        self.env.cr.execute("""
+            SELECT id FROM projects
+             WHERE id = ANY(%s) AND odoo_task_id IS NULL
+               AND task_sync_state IN ('pending', 'failed')
+               FOR UPDATE SKIP LOCKED
+        """, (self.ids,))
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    def _get_task_sync_delay(self, attempts):
+        base = int(config.get('task_sync_backoff_base', TASK_SYNC_BACKOFF_BASE))
+        cap = int(config.get('task_sync_backoff_max', TASK_SYNC_BACKOFF_MAX))
+        return min(base * 2 ** max(attempts - 1, 0), cap)
+
+    def _mark_task_sync_failed(self, error):
+        max_attempts = int(config.get('task_sync_max_attempts', TASK_SYNC_MAX_ATTEMPTS))
+        now = fields.Datetime.now()
+        for project in self:
+            attempts = project.task_sync_attempts + 1
+            project.write({
+                'task_sync_state': 'failed',
+                'task_sync_attempts': attempts,
+                'task_sync_error': error,
+                # no next attempt once the budget is spent
+                'task_sync_next_at': fields.Datetime.add(now, seconds=self._get_task_sync_delay(attempts))
+                if attempts < max_attempts else False,
+            })
+            _logger.warning("Odoo task sync of project %s failed (attempt %d): %s", project.uuid, attempts, error)
+
+    def _run_task_sync(self):
+        """Create the missing tasks of ``self``, recording failures for retry.
+
+        The whole recordset is tried in one batch first; if that fails each
+        project is retried on its own so one bad project does not hold back
+        the others.
+        """
+        projects = self._claim_task_sync()
+        if not projects:
+            return
+        try:
+            with self.env.cr.savepoint():
+                projects._create_odoo_tasks()
+            return
+        except Exception as e:
+            # a cached id may be what failed, and ids created in the savepoint are gone
+            self._forget_task_lookups()
+            if len(projects) == 1:
+                projects._mark_task_sync_failed(str(e))
+                return
+            _logger.warning("Batch task sync of %d projects failed, retrying one by one: %s", len(projects), e)
+        for project in projects:
+            try:
+                with self.env.cr.savepoint():
+                    project._create_odoo_tasks()
+            except Exception as e:
+                self._forget_task_lookups()
+                project._mark_task_sync_failed(str(e))
+
+    @api.model
+    def _cron_retry_task_sync(self, orphan_minutes=2, limit=200):
+        """Create the tasks whose sync failed and is due for a retry, and
+        the ones still pending because their worker never ran."""
+        now = fields.Datetime.now()
+        projects = self.search([
+            ('odoo_task_id', '=', False),
+            '|',
+            '&', ('task_sync_state', '=', 'failed'), ('task_sync_next_at', '<=', now),
+            '&', ('task_sync_state', '=', 'pending'),
+            ('create_date', '<', fields.Datetime.subtract(now, minutes=orphan_minutes)),
+        ], order='id', limit=limit)
+        if projects:
+            _logger.info("Retrying Odoo task sync of %d projects", len(projects))
+            projects._run_task_sync()
+
+    # ------------------------------------------------------------------
+    # Task description
+    # ------------------------------------------------------------------
+
+    def _get_task_description_data(self, related):
+        """Plain values shown in the task description, also used as its hash input."""
+        self.ensure_one()
+        user_profile = related['user_profile']
+        submission_type = related['submission_type']
+        sys_sum = related['system_summary']
+        batt = related['battery_info']
+        site = related['site_details']
+        elec = related['electrical_details']
+        adv_elec = related['advanced_electrical_details']
+        opt_extra = related['optional_extra_details']
+
+        def selection_label(record, field_name):
+            value = record[field_name]
+            return dict(record._fields[field_name].selection).get(value) if value else None
+
+        extras = []
+        if opt_extra:
+            for flag, icon, label, notes in (
+                ('miracle_watt_required', '✓', 'Miracle Watt Required', 'miracle_watt_notes'),
+                ('der_rlc_required', '✓', 'DER RLC Required', 'der_rlc_notes'),
+                ('setback_constraints', '⚠️', 'Setback Constraints', 'setback_notes'),
+                ('site_access_restrictions', '⚠️', 'Site Access Restrictions', 'site_access_notes'),
+                ('inspection_notes', '📝', 'Inspection Notes', 'inspection_notes_text'),
+                ('battery_sld_requested', '✓', 'Battery SLD Requested', 'battery_sld_notes'),
+            ):
+                if opt_extra[flag]:
+                    extras.append({'icon': icon, 'label': label, 'text': opt_extra[notes] or 'Yes'})
+
+        return {
+            'name': self.name,
+            'address': self.address,
+            'type': (self.type or 'unknown').upper(),
+            'submission_type': submission_type.name if submission_type else None,
+            'general_notes': self.general_notes,
+            'user_profile': {
+                'company_name': user_profile.company_name,
+                'contact_name': user_profile.contact_name,
+                'email': user_profile.email,
+                'phone': user_profile.phone,
+            } if user_profile else None,
+            'services': self.service_ids.mapped('name'),
+            'system_summary': {
+                'system_size': sys_sum.system_size,
+                'system_type': selection_label(sys_sum, 'system_type'),
+                'pv_modules': sys_sum.pv_modules,
+                'inverters': sys_sum.inverters,
+                'battery': {'qty': batt.qty, 'model': batt.model} if batt else None,
+            } if sys_sum else None,
+            'site_details': {
+                'roof_material': site.roof_material,
+                'roof_pitch': site.roof_pitch,
+                'number_of_arrays': site.number_of_arrays,
+                'utility_provider': site.utility_provider,
+                'jurisdiction': site.jurisdiction,
+            } if site else None,
+            'electrical_details': {
+                'main_panel_size': elec.main_panel_size,
+                'bus_rating': elec.bus_rating,
+                'main_breaker': elec.main_breaker,
+                'pv_breaker_location': selection_label(elec, 'pv_breaker_location'),
+            } if elec else None,
+            'advanced_electrical_details': {
+                'meter_location': adv_elec.meter_location,
+                'service_entrance_type': adv_elec.service_entrance_type,
+                'subpanel_details': adv_elec.subpanel_details,
+            } if adv_elec else None,
+            'extras': extras,
+            'components': [{
+                'type': comp.type,
+                'make_model': comp.make_model,
+                'qty': comp.qty,
+                'notes': comp.notes,
+            } for comp in related['system_components']],
+            'uploads': [{
+                'url': upload.url,
+                'name': upload.name,
+                'category': upload.category,
+                'image_url': upload.preview_url or None,
+            } for upload in related['uploads']],
+        }
+
+    @api.model
+    def _hash_task_description_data(self, data):
+        payload = json.dumps([DESCRIPTION_VERSION, data], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _generate_project_description(self, related=None, data=None):
+        """Render the HTML description of the Odoo task of this project.
+
+        ``related`` is this project's entry of :meth:`_get_related_bundle`;
+        it is loaded when not given.
+        """
+        self.ensure_one()
+        if data is None:
+            if related is None:
+                related = self._get_related_bundle()[self.uuid]
+            data = self._get_task_description_data(related)
+        return self.env['ir.qweb']._render(DESCRIPTION_TEMPLATE, {'data': data})
+
+    def _sync_task_description(self):
+        """Re-render the description of the existing tasks of ``self``.
+
+        Tasks whose project data did not change since the last render are
+        left alone, so an update that only touches other fields neither
+        rewrites the HTML nor produces a tracking message.
+        """
+        projects = self.filtered('odoo_task_id')
+        if not projects:
+            return
+        bundle = projects._get_related_bundle()
+        tasks = {task.id: task for task in self.env['project.task'].sudo().browse(projects.mapped('odoo_task_id')).exists()}
+        for project in projects:
+            task = tasks.get(project.odoo_task_id)
+            if not task:
+                continue
+            data = project._get_task_description_data(bundle[project.uuid])
+            description_hash = self._hash_task_description_data(data)
+            if description_hash == project.task_description_hash:
+                continue
+            task.write({'description': project._generate_project_description(data=data)})
+            project.task_description_hash = description_hash
+            _logger.info("Sync'd Odoo task description for task %s", task.id)
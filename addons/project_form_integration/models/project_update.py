@@ -0,0 +1,162 @@
+from odoo import models
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def changed_vals(record, vals):
+    """Return the subset of ``vals`` that differs from the values of ``record``.
+
+    Values are compared the way the ORM would store them, so ``'5'`` for an
+    Integer or a float with more digits than the field keeps count as
+    unchanged. A many2many is given as a single ``(6, 0, ids)`` command.
+    """
+    changes = {}
+    for name, value in vals.items():
+        field = record._fields[name]
+        if field.type in ('one2many', 'many2many'):
+            if len(value) == 1 and value[0][0] == 6 and set(value[0][2]) == set(record[name].ids):
+                continue
+        elif field.convert_to_record(field.convert_to_cache(value, record), record) == record[name]:
+            continue
+        changes[name] = value
+    return changes
+
+
+def merge_detail(parent, field_name, vals):
+    """Apply ``vals`` to the single record of the one2many ``field_name`` of ``parent``.
+
+    The record is created when missing and deleted when ``vals`` is None;
+    otherwise only changed fields are written. Returns the record and
+    whether anything changed.
+    """
+    record = parent[field_name][:1]
+    if vals is None:
+        if record:
+            record.unlink()
+            return record.browse(), True
+        return record, False
+    if record:
+        changes = changed_vals(record, vals)
+        if changes:
+            record.write(changes)
+        return record, bool(changes)
+    field = parent._fields[field_name]
+    record = parent.env[field.comodel_name].create(dict(vals, **{field.inverse_name: parent.id}))
+    return record, True
+
+
+class Project(models.Model):
+    _inherit = 'project.form.project'
+
+    def _lock_version(self, expected=None):
+        """Lock the project row and check that its version still is ``expected``.
+
+        The row lock is held until the transaction ends, so the check stays
+        true while the update is applied; of two concurrent updates the
+        later one is retried by the server and then finds the version moved
+        on. Returns the
+        current version, or None when ``expected`` is stale.
+        """
+        self.ensure_one()
+        self.flush_recordset(['version'])
+        self.env.cr.execute("SELECT version FROM projects WHERE id = %s FOR UPDATE", (self.id,))
+        version = self.env.cr.fetchone()[0]
+        if expected is not None and version != expected:
+            return None
+        return version
+
+    def _bump_version(self):
+        """Increment the version of the project once its update changed
+        something. Returns the new version."""
+        self.ensure_one()
+        self.flush_recordset(['version', 'updated_at'])
+        self.env.cr.execute("""
+            UPDATE projects
+               SET version = version + 1, updated_at = now() at time zone 'UTC'
+             WHERE id = %s
+         RETURNING version
+        """, (self.id,))
+        version = self.env.cr.fetchone()[0]
+        self.invalidate_recordset(['version', 'updated_at'])
+        self._mark_summary_dirty()
+        return version
+
+    def _merge_api_update(self, vals, details=(), components=None):
+        """Apply an update of ``/api/projects/update`` as a merge patch.
+
+        ``vals`` are project fields; ``details`` is a sequence of
+        ``(path, vals)`` where ``path`` is the tuple of one2many fields
+        leading to a one-to-one detail, e.g. ``('system_summary_id',
+        'battery_info_id')``, and ``vals`` None deletes the detail;
+        ``components`` is the full list of system components, or None to
+        leave them alone. Only what differs is written. Returns whether
+        anything changed.
+        """
+        self.ensure_one()
+        changes = changed_vals(self, vals)
+        if changes:
+            self.write(changes)
+        changed = bool(changes)
+
+        for path, detail_vals in details:
+            parent = self
+            for field_name in path[:-1]:
+                parent = parent[field_name][:1]
+            if not parent:
+                continue
+            _record, detail_changed = merge_detail(parent, path[-1], detail_vals)
+            changed |= detail_changed
+
+        if components is not None:
+            changed |= self._merge_system_components(components)
+        return changed
+
+    def _merge_system_components(self, items):
+        """Bring the system components of ``self`` in line with ``items``.
+
+        Items are matched to existing components by uuid (``id``); items
+        without a known uuid reuse an unmatched component with the same
+        values. The rest costs one ``create`` and one ``unlink`` in total,
+        plus one ``write`` per distinct set of changes. Returns whether
+        anything changed.
+        """
+        self.ensure_one()
+        Component = self.env['project.form.system.component']
+        existing = self.system_component_ids
+        by_uuid = {component.uuid: component for component in existing}
+        matched = set()
+        writes = {}
+        unknown = []
+        for item in items:
+            vals = {key: value for key, value in item.items() if key not in ('id', 'uuid')}
+            component = by_uuid.get(item.get('id') or item.get('uuid'))
+            if component is None or component.id in matched:
+                unknown.append(vals)
+                continue
+            matched.add(component.id)
+            changes = changed_vals(component, vals)
+            if changes:
+                key = json.dumps(changes, sort_keys=True, default=str)
+                writes[key] = writes.get(key, Component) | component
+
+        to_create = []
+        for vals in unknown:
+            same = next((component for component in existing
+                         if component.id not in matched and not changed_vals(component, vals)), None)
+            if same:
+                matched.add(same.id)
+            else:
+                to_create.append(dict(vals, project_id=self.id))
+
+        to_unlink = existing.filtered(lambda component: component.id not in matched)
+        for key, components in writes.items():
+            components.write(json.loads(key))
+        if to_create:
+            Component.create(to_create)
+        if to_unlink:
+            to_unlink.unlink()
+        _logger.info("System components of project %s: %d created, %d updated, %d deleted",
+                     self.uuid, len(to_create), sum(len(c) for c in writes.values()), len(to_unlink))
+        return bool(writes or to_create or to_unlink)
@@ -0,0 +1,65 @@
+from odoo import models, fields, api
+import datetime
+import logging
+
+from ..services.jwt_auth import AUTH_STAMP, remember_revocation
+from ..services.stamps import bump_stamp, ensure_stamp_table
+
+_logger = logging.getLogger(__name__)
+
+
+class RevokedToken(models.Model):
+    """JWTs signed out before they expire, see services.jwt_auth."""
+    _name = 'project.form.revoked.token'
+    _description = 'Revoked Token'
+    _table = 'revoked_tokens'
+
+    jti = fields.Char(string='Token ID', required=True)
+    contractor_id = fields.Many2one('project.form.contractor', string='Contractor', ondelete='cascade')
+    expires_at = fields.Datetime(required=True, index=True)
+
+    _sql_constraints = [
+        ('jti_unique', 'unique(jti)', 'A token is revoked once')
+    ]
+
+    def init(self):
+        ensure_stamp_table(self.env.cr)
+
+    @api.model
+    def _get_revocations(self):
+        """Map the jti of every revoked token still valid to its expiry timestamp."""
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT jti, extract(epoch FROM expires_at) FROM revoked_tokens
+             WHERE expires_at > (now() at time zone 'UTC')
+        """)
+        return {jti: float(exp) for jti, exp in self.env.cr.fetchall()}
+
+    def _is_revoked(self, jti):
+        # A single lookup on the unique index of jti
+        self.flush_model(['jti'])
+        self.env.cr.execute("SELECT 1 FROM revoked_tokens WHERE jti = %s", (jti,))
+        return bool(self.env.cr.fetchone())
+
+    @api.model
+    def _revoke(self, claims):
+        """Revoke the token of decoded ``claims`` until it expires."""
+        if self._is_revoked(claims['jti']):
+            return
+        self.create({
+            'jti': claims['jti'],
+            'contractor_id': claims['user_id'],
+            'expires_at': datetime.datetime.fromtimestamp(claims['exp'], datetime.timezone.utc).replace(tzinfo=None),
+        })
+        # other workers reload their revocations, this one does not have to wait
+        bump_stamp(self.env.cr, AUTH_STAMP)
+        dbname, jti, exp = self.env.cr.dbname, claims['jti'], claims['exp']
+        self.env.cr.postcommit.add(lambda: remember_revocation(dbname, jti, exp))
+
+    @api.autovacuum
+    def _gc_expired_tokens(self):
+        # Expired tokens fail the signature check anyway
+        expired = self.search([('expires_at', '<', fields.Datetime.now())])
+        if expired:
+            _logger.info("Removing %d expired revoked tokens", len(expired))
+            expired.unlink()
@@ -0,0 +1,89 @@
+from odoo import models, fields, api
+from odoo.tools import config
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Seconds a scraped value stays fresh, per source; failures and incomplete
+# results (the page did not load, a value was not found) are kept briefly
+DEFAULT_TTLS = {
+    'zillow': 90 * 24 * 3600,
+    'asce': 365 * 24 * 3600,
+}
+DEFAULT_NEGATIVE_TTL = 15 * 60
+
+
+class ScrapeCache(models.Model):
+    _name = 'project.form.scrape.cache'
+    _description = 'Scrape Cache'
+    _table = 'scrape_cache'
+
+    cache_key = fields.Char(required=True, index=True)
+    source = fields.Selection([
+        ('zillow', 'Zillow'),
+        ('asce', 'ASCE Hazard Tool'),
+    ], required=True)
+    address = fields.Char(required=True)
+    result = fields.Text(string='Result (JSON)')
+    error = fields.Text()
+    fetched_at = fields.Datetime(required=True)
+    expires_at = fields.Datetime(required=True, index=True)
+
+    _sql_constraints = [
+        ('cache_key_unique', 'unique(cache_key)', 'Cache key must be unique')
+    ]
+
+    @api.model
+    def _get_ttl(self, source, failed=False):
+        if failed:
+            return int(config.get('scraper_cache_negative_ttl', DEFAULT_NEGATIVE_TTL))
+        return int(config.get('scraper_cache_ttl_%s' % source, DEFAULT_TTLS[source]))
+
+    @api.model
+    def _is_incomplete_result(self, result):
+        # scrapers return a dict of values, None for each one not found
+        return not result or (isinstance(result, dict) and any(value is None for value in result.values()))
+
+    @api.model
+    def _lookup(self, source, address, params=None):
+        """Return the fresh cache entry for this request, if any."""
+        key = self.env['project.form.scrape.job']._make_dedup_key(source, address, params)
+        return self.search([('cache_key', '=', key), ('expires_at', '>', fields.Datetime.now())], limit=1)
+
+    @api.model
+    def _store(self, source, address, params, result=None, error=None):
+        key = self.env['project.form.scrape.job']._make_dedup_key(source, address, params)
+        now = fields.Datetime.now()
+        vals = {
+            'source': source,
+            'address': address,
+            'result': json.dumps(result) if result is not None else False,
+            'error': error or False,
+            'fetched_at': now,
+            'expires_at': fields.Datetime.add(now, seconds=self._get_ttl(
+                source, failed=bool(error) or self._is_incomplete_result(result))),
+        }
+        entry = self.search([('cache_key', '=', key)], limit=1)
+        if entry:
+            entry.write(vals)
+        else:
+            vals['cache_key'] = key
+            entry = self.create(vals)
+        return entry
+
+    def _to_api_dict(self):
+        self.ensure_one()
+        return {
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error or None,
+            'fetched_at': str(self.fetched_at),
+            'expires_at': str(self.expires_at),
+        }
+
+    @api.autovacuum
+    def _gc_expired_entries(self):
+        expired = self.search([('expires_at', '<', fields.Datetime.now())])
+        if expired:
+            _logger.info("Removing %d expired scrape cache entries", len(expired))
+            expired.unlink()
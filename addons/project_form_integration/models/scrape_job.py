@@ -0,0 +1,181 @@
+from odoo import models, fields, api
+import json
+import logging
+import psycopg2
+import uuid
+
+from ..services.address import normalize_address
+
+_logger = logging.getLogger(__name__)
+
+
+class ScrapeJob(models.Model):
+    _name = 'project.form.scrape.job'
+    _description = 'Scrape Job'
+    _table = 'scrape_jobs'
+    _order = 'id desc'
+
+    uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()))
+    source = fields.Selection([
+        ('zillow', 'Zillow'),
+        ('asce', 'ASCE Hazard Tool'),
+    ], required=True)
+    address = fields.Char(required=True)
+    params = fields.Text(string='Parameters (JSON)')
+    dedup_key = fields.Char(required=True, index=True)
+    state = fields.Selection([
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], default='queued', required=True, index=True)
+    result = fields.Text(string='Result (JSON)')
+    error = fields.Text()
+    started_at = fields.Datetime()
+    finished_at = fields.Datetime()
+
+    def init(self):
+        # At most one queued/running job per identical request
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS scrape_jobs_inflight_dedup_key_index
+                ON scrape_jobs (dedup_key) WHERE state IN ('queued', 'running')
+        """)
+        # One row per source, updated by every claim to serialize the
+        # claims of that source across worker processes, see _claim_next
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_job_claims (
+                source varchar PRIMARY KEY,
+                claimed_at timestamp
+            )
+        """)
+        sources = [value for value, _label in self._fields['source'].selection]
+        self.env.cr.execute(
+            "INSERT INTO scrape_job_claims (source) SELECT unnest(%s::varchar[]) ON CONFLICT DO NOTHING",
+            (sources,))
+
+    @api.model
+    def _make_dedup_key(self, source, address, params):
+        # also the key of project.form.scrape.cache
+        return '%s|%s|%s' % (source, normalize_address(address), json.dumps(params or {}, sort_keys=True))
+
+    @api.model
+    def _enqueue(self, source, address, params=None):
+        """Return the in-flight job for this request, or create a new one.
+
+        The job is handed to the background runner once the current
+        transaction commits.
+        """
+        dedup_key = self._make_dedup_key(source, address, params)
+        job = self.search([('dedup_key', '=', dedup_key), ('state', 'in', ('queued', 'running'))], limit=1)
+        if job:
+            return job
+        try:
+            with self.env.cr.savepoint():
+                job = self.create({
+                    'source': source,
+                    'address': address,
+                    'params': json.dumps(params or {}),
+                    'dedup_key': dedup_key,
+                })
+        except psycopg2.IntegrityError:
+            # a concurrent request queued the same scrape first
+            job = self.search([('dedup_key', '=', dedup_key), ('state', 'in', ('queued', 'running'))], limit=1)
+            if job:
+                return job
+            raise
+        job._schedule()
+        return job
+
+    def _schedule(self):
+        from ..services.scrape_runner import get_scrape_runner
+        dbname = self.env.cr.dbname
+        sources = set(self.mapped('source'))
+
+        @self.env.cr.postcommit.add
+        def submit():
+            runner = get_scrape_runner()
+            for source in sources:
+                runner.submit(dbname, source)
+
+    @api.model
+    def _claim_next(self, source, limit):
+        """Move the oldest queued job of ``source`` to running and return it.
+
+        Returns an empty recordset when ``limit`` jobs of the source already
+        run, in any worker process, or nothing is queued. Must be the first
+        statement of its transaction: claims of one source update the same
+        row of scrape_job_claims, so a concurrent claim fails to serialize
+        and is retried with a snapshot that sees the other claim.
+        """
+        cr = self.env.cr
+        cr.execute("UPDATE scrape_job_claims SET claimed_at = (now() at time zone 'UTC') WHERE source = %s",
+                   (source,))
+        cr.execute("SELECT count(*) FROM scrape_jobs WHERE source = %s AND state = 'running'", (source,))
+        if cr.fetchone()[0] >= limit:
+            return self.browse()
+        cr.execute("""
+            SELECT id FROM scrape_jobs
+             WHERE source = %s AND state = 'queued'
+             ORDER BY id
+             LIMIT 1
+               FOR UPDATE SKIP LOCKED
+        """, (source,))
+        row = cr.fetchone()
+        if not row:
+            return self.browse()
+        cr.execute("""
+            UPDATE scrape_jobs
+               SET state = 'running', started_at = (now() at time zone 'UTC')
+             WHERE id = %s
+        """, (row[0],))
+        job = self.browse(row[0])
+        job.invalidate_recordset(['state', 'started_at'])
+        return job
+
+    def _finish(self, result=None, error=None):
+        self.ensure_one()
+        self.write({
+            'state': 'failed' if error else 'done',
+            'result': json.dumps(result) if result is not None else False,
+            'error': error or False,
+            'finished_at': fields.Datetime.now(),
+        })
+        params = json.loads(self.params) if self.params else {}
+        self.env['project.form.scrape.cache']._store(self.source, self.address, params, result=result, error=error)
+
+    def _to_api_dict(self):
+        self.ensure_one()
+        return {
+            'id': self.uuid,
+            'source': self.source,
+            'address': self.address,
+            'state': self.state,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error or None,
+            'created_at': str(self.create_date),
+            'started_at': str(self.started_at) if self.started_at else None,
+            'finished_at': str(self.finished_at) if self.finished_at else None,
+        }
+
+    @api.model
+    def _cron_recover_jobs(self, stale_minutes=15, orphan_minutes=2):
+        """Requeue jobs lost by a restarted worker and fail the ones stuck running.
+
+        Requeueing only wakes up the runners of the job's source; jobs are
+        claimed from the table, so none is run twice.
+        """
+        now = fields.Datetime.now()
+        cutoff = fields.Datetime.subtract(now, minutes=stale_minutes)
+        stuck = self.search([('state', '=', 'running'), ('started_at', '<', cutoff)])
+        if stuck:
+            _logger.warning("Failing %d scrape jobs stuck in running state", len(stuck))
+            stuck.write({
+                'state': 'failed',
+                'error': 'Scrape did not finish within %s minutes' % stale_minutes,
+                'finished_at': now,
+            })
+        orphan_cutoff = fields.Datetime.subtract(now, minutes=orphan_minutes)
+        queued = self.search([('state', '=', 'queued'), ('create_date', '<', orphan_cutoff)])
+        if queued:
+            _logger.info("Requeueing %d orphaned scrape jobs", len(queued))
+            queued._schedule()
@@ -8,7 +8,7 @@ class SiteDetail(models.Model):
     _table = 'site_details'
 
     uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()),null=False)
-    project_id = fields.Char(string='Project', required=True, index=True)
+    project_id = fields.Many2one('project.form.project', string='Project', required=True, index=True, ondelete='cascade')
     roof_material = fields.Char()
     roof_pitch = fields.Char()
     number_of_arrays = fields.Integer()
@@ -1,4 +1,5 @@
 from odoo import models, fields, api
+from odoo.tools.sql import create_index
 import uuid
 
 
@@ -8,7 +9,7 @@ class SystemComponent(models.Model):
     _table = 'system_components'
 
     uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()),null=False)
-    project_id = fields.Char(string='Project', required=True, index=True)
+    project_id = fields.Many2one('project.form.project', string='Project', required=True, index=True, ondelete='cascade')
 from odoo import models, fields, api
 import uuid
 
@@ -19,9 +20,37 @@ class SystemComponent(models.Model):
     _table = 'system_components'
 
     uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()),null=False)
-    project_id = fields.Char(string='Project', required=True, index=True)
+    project_id = fields.Many2one('project.form.project', string='Project', required=True, index=True, ondelete='cascade')
     type = fields.Char(required=True)
     make_model = fields.Char(required=True)
     qty = fields.Integer(required=True)
-    attachment = fields.Text(string='Attachment URLs (JSON array)')
+    attachment = fields.Json(string='Attachment URLs')
+    has_attachment = fields.Boolean(compute='_compute_has_attachment', store=True, index=True)
     notes = fields.Text()
+
+    def init(self):
+        # containment lookups, e.g. the components referencing a Drive file:
+        # attachment @> '["https://drive.google.com/..."]'
+        create_index(self.env.cr, 'system_components_attachment_gin_index', self._table,
+                     ['attachment jsonb_path_ops'], method='gin')
+
+    @api.depends('attachment')
+    def _compute_has_attachment(self):
+        for component in self:
+            component.has_attachment = bool(component.attachment)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records.project_id._mark_summary_dirty()
+        return records
+
+    def write(self, vals):
+        projects = self.project_id
+        res = super().write(vals)
+        (projects | self.project_id)._mark_summary_dirty()
+        return res
+
+    def unlink(self):
+        self.project_id._mark_summary_dirty()
+        return super().unlink()
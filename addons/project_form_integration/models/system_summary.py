@@ -8,7 +8,7 @@ class SystemSummary(models.Model):
     _table = 'system_summaries'
 
     uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()),null=False)
-    project_id = fields.Char(string='Project', required=True, index=True)
+    project_id = fields.Many2one('project.form.project', string='Project', required=True, index=True, ondelete='cascade')
     system_size = fields.Float(string='System Size', digits=(10, 2))
     system_type = fields.Selection([
         ('roof_mount', 'Roof Mount'),
@@ -24,5 +24,19 @@ class SystemSummary(models.Model):
     _sql_constraints = [
         ('project_unique', 'unique(project_id)', 'Project must be unique')
     ]
-    
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records.project_id._mark_summary_dirty()
+        return records
+
+    def write(self, vals):
+        projects = self.project_id
+        res = super().write(vals)
+        (projects | self.project_id)._mark_summary_dirty()
+        return res
+
+    def unlink(self):
+        self.project_id._mark_summary_dirty()
+        return super().unlink()
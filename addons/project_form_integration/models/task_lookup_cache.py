@@ -0,0 +1,36 @@
+from odoo import models, api
+
+# Changes that make the task lookups of project.form.project stale, see
+# _get_task_target. Tags and partners are not tracked: their lookups expire.
+
+
+class ProjectProject(models.Model):
+    _inherit = 'project.project'
+
+    def write(self, vals):
+        if 'name' in vals or 'type_ids' in vals or 'active' in vals:
+            self.env['project.form.project']._invalidate_task_lookups()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['project.form.project']._invalidate_task_lookups()
+        return super().unlink()
+
+
+class ProjectTaskType(models.Model):
+    _inherit = 'project.task.type'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # a new stage can become the initial stage of the target project
+        self.env['project.form.project']._invalidate_task_lookups()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        if {'name', 'project_ids', 'sequence', 'active'} & set(vals):
+            self.env['project.form.project']._invalidate_task_lookups()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env['project.form.project']._invalidate_task_lookups()
+        return super().unlink()
@@ -1,6 +1,15 @@
 from odoo import models, fields, api
+import re
 import uuid
 
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+DRIVE_HOST = 'drive.google.com'
+# File id of the /file/d/<id>/view and ?id=<id> forms of Drive links
+DRIVE_FILE_ID_PATTERNS = (
+    re.compile(r'/d/([a-zA-Z0-9_-]+)'),
+    re.compile(r'id=([a-zA-Z0-9_-]+)'),
+)
+
 
 class Upload(models.Model):
     _name = 'project.form.upload'
@@ -8,11 +17,51 @@ class Upload(models.Model):
     _table = 'uploads'
 
     uuid = fields.Char(string='ID', required=True, index=True, default=lambda self: str(uuid.uuid4()),null=False)
-    project_id = fields.Char(string='Project', required=True, index=True)
+    project_id = fields.Many2one('project.form.project', string='Project', required=True, index=True, ondelete='cascade')
     url = fields.Char(required=True)
     name = fields.Char(required=True)
     category = fields.Char()
     mime_type = fields.Char()
     size = fields.Integer()
-    
+    # Worked out once when the upload is stored, read by the API and the task description
+    provider = fields.Selection([
+        ('google_drive', 'Google Drive'),
+        ('other', 'Other'),
+    ], compute='_compute_preview', store=True)
+    is_image = fields.Boolean(compute='_compute_preview', store=True)
+    preview_url = fields.Char(compute='_compute_preview', store=True,
+                              help='URL an <img> can display, for images only')
+
+    @api.depends('url', 'name', 'mime_type')
+    def _compute_preview(self):
+        for upload in self:
+            upload.provider = 'google_drive' if upload.url and DRIVE_HOST in upload.url else 'other'
+            upload.is_image = bool(
+                (upload.mime_type and upload.mime_type.startswith('image/'))
+                or (upload.name and upload.name.lower().endswith(IMAGE_EXTENSIONS)))
+            upload.preview_url = upload._get_preview_url() if upload.is_image else False
+
+    def _get_preview_url(self):
+        # Drive share links open a viewer page; uc?export=view serves the file itself
+        if self.provider == 'google_drive':
+            for pattern in DRIVE_FILE_ID_PATTERNS:
+                match = pattern.search(self.url)
+                if match:
+                    return f'https://drive.google.com/uc?export=view&id={match.group(1)}'
+        return self.url
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records.project_id._mark_summary_dirty()
+        return records
+
+    def write(self, vals):
+        projects = self.project_id
+        res = super().write(vals)
+        (projects | self.project_id)._mark_summary_dirty()
+        return res
 
+    def unlink(self):
+        self.project_id._mark_summary_dirty()
+        return super().unlink()
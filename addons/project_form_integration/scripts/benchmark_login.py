@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Measure contractor logins per second at different password hashing costs.
+
+The local mode hashes and verifies passwords with the module's crypt
+context, one thread per simulated worker, for each ``--rounds`` value:
+
+    python scripts/benchmark_login.py --rounds 100000 300000 600000 --threads 4
+
+The HTTP mode posts to ``/api/contractor/login`` of a running server, to
+include the request overhead and the server's actual worker count:
+
+    python scripts/benchmark_login.py --url http://localhost:8069 \\
+        --email contractor@example.com --password secret --threads 8
+
+Pick the highest cost whose throughput still covers the expected peak of
+sign-ins with room to spare, then set ``contractor_password_rounds`` in the
+server configuration. Existing hashes are upgraded at the next login.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'services'))
+from passwords import DEFAULT_ROUNDS, get_crypt_context  # noqa: E402
+
+
+def run_for(duration, threads, attempt):
+    """Call ``attempt`` from ``threads`` threads for ``duration`` seconds.
+
+    Returns the number of successful and failed attempts.
+    """
+    deadline = time.monotonic() + duration
+
+    def loop():
+        ok = failed = 0
+        while time.monotonic() < deadline:
+            if attempt():
+                ok += 1
+            else:
+                failed += 1
+        return ok, failed
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda _: loop(), range(threads)))
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
+def benchmark_local(rounds_list, threads, duration):
+    print("%10s %12s %14s" % ('rounds', 'logins/s', 'ms per login'))
+    for rounds in rounds_list:
+        ctx = get_crypt_context(rounds)
+        password_hash = ctx.hash('benchmark-password')
+        ok, _failed = run_for(duration, threads, lambda: ctx.verify('benchmark-password', password_hash))
+        rate = ok / duration
+        print("%10d %12.1f %14.1f" % (rounds, rate, 1000.0 * threads / rate if rate else float('inf')))
+
+
+def benchmark_http(url, email, password, threads, duration):
+    body = json.dumps({'email': email, 'password': password}).encode()
+
+    def login():
+        req = urllib.request.Request(url.rstrip('/') + '/api/contractor/login', data=body,
+                                     headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                return response.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
+
+    ok, failed = run_for(duration, threads, login)
+    print("%d successful logins, %d failures in %ds: %.1f logins/s" % (ok, failed, duration, ok / duration))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, nargs='+', default=[DEFAULT_ROUNDS // 4, DEFAULT_ROUNDS // 2, DEFAULT_ROUNDS],
+                        help='PBKDF2 iteration counts to compare (local mode)')
+    parser.add_argument('--threads', type=int, default=os.cpu_count() or 1,
+                        help='concurrent logins, roughly the number of Odoo workers')
+    parser.add_argument('--duration', type=int, default=10, help='seconds per measurement')
+    parser.add_argument('--url', help='base URL of a running server (HTTP mode)')
+    parser.add_argument('--email')
+    parser.add_argument('--password')
+    args = parser.parse_args()
+
+    if args.url:
+        if not args.email or not args.password:
+            parser.error('--email and --password are required with --url')
+        benchmark_http(args.url, args.email, args.password, args.threads, args.duration)
+    else:
+        benchmark_local(args.rounds, args.threads, args.duration)
+
+
+if __name__ == '__main__':
+    main()
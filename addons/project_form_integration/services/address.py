@@ -0,0 +1,27 @@
+import re
+
+# USPS standard abbreviations for the words that vary most between inputs
+_ABBREVIATIONS = {
+    'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W',
+    'NORTHEAST': 'NE', 'NORTHWEST': 'NW', 'SOUTHEAST': 'SE', 'SOUTHWEST': 'SW',
+    'STREET': 'ST', 'ROAD': 'RD', 'AVENUE': 'AVE', 'BOULEVARD': 'BLVD',
+    'DRIVE': 'DR', 'LANE': 'LN', 'COURT': 'CT', 'PLACE': 'PL', 'TERRACE': 'TER',
+    'HIGHWAY': 'HWY', 'PARKWAY': 'PKWY', 'CIRCLE': 'CIR', 'TRAIL': 'TRL',
+    'SUITE': 'STE', 'APARTMENT': 'APT', 'BUILDING': 'BLDG', 'FLOOR': 'FL',
+}
+
+_PUNCTUATION = re.compile(r"[.,;:#'\"()]")
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_address(address):
+    """Reduce formatting variants of an address to one comparable string.
+
+    "615 N Shirk Rd, New Holland" and "615 NORTH SHIRK ROAD NEW HOLLAND,"
+    both become "615 N SHIRK RD NEW HOLLAND".
+    """
+    if not address:
+        return ''
+    text = _PUNCTUATION.sub(' ', address.upper())
+    words = _WHITESPACE.sub(' ', text).strip().split(' ')
+    return ' '.join(_ABBREVIATIONS.get(word, word) for word in words if word)
@@ -1,26 +1,20 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium_stealth import stealth
-from webdriver_manager.chrome import ChromeDriverManager
 import logging
 import time
 import random
 import re
-import shutil
-import tempfile
-import os
+
+from .browser_pool import get_browser_pool
 
 _logger = logging.getLogger(__name__)
 
 
-def scrape_asce_hazard(address: str, standard: str = "ASCE/SEI 7-22", risk_category: str = "II"):
+def scrape_asce_hazard(address: str, standard: str = "ASCE/SEI 7-22", risk_category: str = "II", driver=None):
     """
     Scrape wind speed and snow load data from ASCE Hazard Tool.
     
@@ -28,58 +22,27 @@ def scrape_asce_hazard(address: str, standard: str = "ASCE/SEI 7-22", risk_categ
         address: Full address string to search for
         standard: ASCE standard to use (default: "ASCE/SEI 7-22")
         risk_category: Risk category (default: "II")
+        driver: WebDriver to use, a session is checked out of the shared
+            browser pool when omitted
     
     Returns:
         dict with wind_speed and snow_load values
     """
     url = "https://ascehazardtool.org/"
     
-    # Create a temporary user data directory
-    user_data_dir = tempfile.mkdtemp()
-    
-    # Configure Chrome options for headless execution
-    chrome_options = Options()
-    chrome_options.add_argument('--headless=new')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--disable-extensions')
-    chrome_options.add_argument('--disable-software-rasterizer')
-    chrome_options.add_argument('--window-size=1920,1080')
-    chrome_options.add_argument('--single-process')
-    chrome_options.add_argument('--disable-setuid-sandbox')
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36')
-    
-    # Critical for Docker
-    chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
-    chrome_options.add_argument("--remote-debugging-port=9223")
-    
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
+    if driver is None:
+        # Borrow a warm Chrome session instead of starting a new browser per call
+        with get_browser_pool().session() as pooled_driver:
+            return scrape_asce_hazard(address, standard, risk_category, driver=pooled_driver)
+
     data = {
         "wind_speed": None,
         "snow_load": None
     }
     
-    driver = None
     try:
-        # Use webdriver-manager to get the correct ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
         wait = WebDriverWait(driver, 20)
         
-        # Apply stealth settings
-        stealth(driver,
-            languages=["en-US", "en"],
-            vendor="Google Inc.",
-            platform="Win32",
-            webgl_vendor="Intel Inc.",
-            renderer="Intel Iris OpenGL Engine",
-            fix_hairline=True,
-        )
-        
         _logger.info("Navigating to ASCE Hazard Tool: %s", url)
         driver.get(url)
         
@@ -236,19 +199,6 @@ def scrape_asce_hazard(address: str, standard: str = "ASCE/SEI 7-22", risk_categ
     except Exception as e:
         _logger.error("Error scraping ASCE Hazard Tool: %s", str(e))
         raise Exception(f"Failed to scrape ASCE Hazard Tool: {str(e)}")
-    
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass
-        
-        # Clean up temp user data dir
-        try:
-            shutil.rmtree(user_data_dir, ignore_errors=True)
-        except Exception:
-            pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,267 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+from selenium_stealth import stealth
+from webdriver_manager.chrome import ChromeDriverManager
+from contextlib import contextmanager
+from odoo.tools import config
+import atexit
+import itertools
+import logging
+import queue
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
+
+
+class BrowserPoolTimeout(Exception):
+    """Raised when no browser session becomes free within the checkout timeout."""
+
+
+def _free_port():
+    # Every warm Chrome needs its own DevTools port, a fixed one would clash
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class BrowserSession:
+    """One long-lived headless Chrome process and its private profile dir."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, driver_path):
+        self.id = next(self._ids)
+        self.user_data_dir = tempfile.mkdtemp(prefix='odoo-scraper-')
+        self.created_at = time.time()
+        self.last_used_at = self.created_at
+        self.uses = 0
+        self.busy = False
+
+        chrome_options = Options()
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--disable-extensions')
+        chrome_options.add_argument('--disable-software-rasterizer')
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument('--single-process')
+        chrome_options.add_argument('--disable-setuid-sandbox')
+        chrome_options.add_argument(f'--user-agent={USER_AGENT}')
+
+        # Critical for Docker
+        chrome_options.add_argument(f"--user-data-dir={self.user_data_dir}")
+        chrome_options.add_argument(f"--remote-debugging-port={_free_port()}")
+
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+
+        try:
+            self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            # stealth registers its scripts for every new document, once per session is enough
+            stealth(self.driver,
+                languages=["en-US", "en"],
+                vendor="Google Inc.",
+                platform="Win32",
+                webgl_vendor="Intel Inc.",
+                renderer="Intel Iris OpenGL Engine",
+                fix_hairline=True,
+            )
+        except Exception:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            raise
+
+    def is_alive(self):
+        try:
+            self.driver.execute_script("return 1;")
+            return True
+        except Exception:
+            # a dead chromedriver fails with urllib3 errors, not WebDriverException
+            return False
+
+    def reset(self):
+        """Drop everything the previous job left behind in the browser."""
+        driver = self.driver
+        handles = driver.window_handles
+        if not handles:
+            # the job closed every window, the session cannot be reused
+            raise WebDriverException("Browser session has no window left")
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        origin = driver.execute_script("return window.location.origin;")
+        if origin and origin.startswith('http'):
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        driver.get('about:blank')
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+class BrowserPool:
+    """A bounded pool of warm headless Chrome sessions shared by the scrapers.
+
+    Sessions are started lazily up to ``size`` and then kept running between
+    jobs. A session is reset after every job and replaced after ``max_uses``
+    jobs, after ``max_idle`` seconds without use, or as soon as it stops
+    answering WebDriver commands.
+    """
+
+    def __init__(self, size=2, max_uses=20, max_idle=600, checkout_timeout=120):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_idle = max_idle
+        self.checkout_timeout = checkout_timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._driver_path = None
+        self._stats = {'started': 0, 'recycled': 0, 'crashed': 0, 'jobs': 0, 'timeouts': 0}
+
+    def _get_driver_path(self):
+        # ChromeDriverManager hits the network, resolve the binary once per process
+        with self._lock:
+            if not self._driver_path:
+                self._driver_path = ChromeDriverManager().install()
+            return self._driver_path
+
+    def _start_session(self):
+        session = BrowserSession(self._get_driver_path())
+        with self._lock:
+            self._sessions[session.id] = session
+            self._stats['started'] += 1
+        _logger.info("Started browser session %s", session.id)
+        return session
+
+    def _discard(self, session, reason):
+        with self._lock:
+            self._sessions.pop(session.id, None)
+            self._stats['crashed' if reason == 'crashed' else 'recycled'] += 1
+        _logger.info("Closing browser session %s (%s, %d uses)", session.id, reason, session.uses)
+        session.close()
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise BrowserPoolTimeout("No browser session available after %ss" % self.checkout_timeout)
+        try:
+            while True:
+                try:
+                    session = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._start_session()
+                if time.time() - session.last_used_at > self.max_idle:
+                    self._discard(session, 'idle')
+                    continue
+                return session
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, session, failed):
+        try:
+            session.uses += 1
+            session.last_used_at = time.time()
+            if failed and not session.is_alive():
+                self._discard(session, 'crashed')
+            elif session.uses >= self.max_uses:
+                self._discard(session, 'max uses')
+            else:
+                try:
+                    session.reset()
+                except Exception as e:
+                    _logger.warning("Failed to reset browser session %s: %s", session.id, e)
+                    self._discard(session, 'crashed')
+                else:
+                    session.busy = False
+                    self._idle.put(session)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self):
+        """Check out a warm driver for the duration of one scrape job."""
+        session = self._acquire()
+        session.busy = True
+        with self._lock:
+            self._stats['jobs'] += 1
+        failed = False
+        try:
+            yield session.driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._release(session, failed)
+
+    def health(self):
+        now = time.time()
+        with self._lock:
+            sessions = list(self._sessions.values())
+            stats = dict(self._stats)
+        return {
+            'size': self.size,
+            'max_uses': self.max_uses,
+            'running': len(sessions),
+            'busy': sum(1 for s in sessions if s.busy),
+            'idle': sum(1 for s in sessions if not s.busy),
+            'stats': stats,
+            'sessions': [{
+                'id': s.id,
+                'busy': s.busy,
+                'uses': s.uses,
+                'age': round(now - s.created_at),
+                'idle_for': 0 if s.busy else round(now - s.last_used_at),
+            } for s in sessions],
+        }
+
+    def close(self):
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(session, 'shutdown')
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Return the process-wide browser pool, configured from the Odoo config file.
+
+    Options: ``scraper_pool_size`` (default 2), ``scraper_session_max_uses``
+    (default 20), ``scraper_session_max_idle`` seconds (default 600) and
+    ``scraper_checkout_timeout`` seconds (default 120). Each Odoo worker
+    process gets its own pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                size=int(config.get('scraper_pool_size', 2)),
+                max_uses=int(config.get('scraper_session_max_uses', 20)),
+                max_idle=int(config.get('scraper_session_max_idle', 600)),
+                checkout_timeout=int(config.get('scraper_checkout_timeout', 120)),
+            )
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,200 @@
+from collections import OrderedDict
+from odoo.http import request
+from odoo.tools import config
+import datetime
+import functools
+import hashlib
+import json
+import jwt
+import threading
+import time
+import uuid
+
+from .stamps import read_stamp
+
+SECRET_KEY = config.get('jwt_secret')
+TOKEN_LIFETIME = datetime.timedelta(days=1)
+DEFAULT_CACHE_SIZE = 4096
+# Stamp bumped by revocations and contractor deletions, see services.stamps
+AUTH_STAMP = 'auth'
+# Seconds between two checks of the stamp: a signout in another worker
+# takes effect in this one within that delay
+DEFAULT_REVOCATION_CHECK_INTERVAL = 5
+
+
+class TokenCache:
+    """LRU of decoded token claims, each entry dropped once its token expires.
+
+    Only the signature check is cached here: revocation and the
+    contractor's existence are checked on every hit, against
+    :class:`AuthState`.
+    """
+
+    def __init__(self, size):
+        self._size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            claims = self._entries.get(token)
+            if claims is None:
+                return None
+            if claims['exp'] <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return claims
+
+    def put(self, token, claims):
+        with self._lock:
+            self._entries[token] = claims
+            self._entries.move_to_end(token)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+
+_token_cache = TokenCache(int(config.get('jwt_cache_size', DEFAULT_CACHE_SIZE)))
+
+
+class AuthState:
+    """Revoked tokens and existing contractors of one database, per worker.
+
+    Valid as long as the auth stamp is ``stamp``. Revocations are kept
+    until their token expires, so the set never outgrows one token
+    lifetime of signouts.
+    """
+
+    def __init__(self, stamp, revoked):
+        self.stamp = stamp
+        self.revoked = revoked
+        self.contractors = set()
+        self.checked_at = time.monotonic()
+
+    def is_revoked(self, jti):
+        exp = self.revoked.get(jti)
+        if exp is None:
+            return False
+        if exp <= time.time():
+            self.revoked.pop(jti, None)
+            return False
+        return True
+
+
+_auth_states = {}
+_auth_states_lock = threading.Lock()
+_revocation_check_interval = float(config.get('jwt_revocation_check_interval', DEFAULT_REVOCATION_CHECK_INTERVAL))
+
+
+def get_auth_state(env):
+    """Return the worker's auth state of the database of ``env``.
+
+    The stamp is read at most once per check interval, and revocations
+    are only reloaded when it moved.
+    """
+    dbname = env.cr.dbname
+    now = time.monotonic()
+    state = _auth_states.get(dbname)
+    if state is not None and now - state.checked_at < _revocation_check_interval:
+        return state
+    stamp = read_stamp(env.cr, AUTH_STAMP)
+    if state is not None and state.stamp == stamp:
+        state.checked_at = now
+        return state
+    state = AuthState(stamp, env['project.form.revoked.token'].sudo()._get_revocations())
+    with _auth_states_lock:
+        _auth_states[dbname] = state
+    return state
+
+
+def remember_revocation(dbname, jti, exp):
+    """Apply a committed signout to this worker's state right away."""
+    state = _auth_states.get(dbname)
+    if state is not None:
+        state.revoked[jti] = exp
+
+
+def generate_token(contractor_id):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    payload = {
+        'user_id': contractor_id,
+        'jti': uuid.uuid4().hex,
+        'exp': now + TOKEN_LIFETIME,
+        'iat': now,
+    }
+    return jwt.encode(payload, SECRET_KEY, algorithm='HS256')
+
+
+def decode_token(token):
+    """Return ``{'user_id', 'jti', 'exp'}`` of a valid token, None otherwise.
+
+    Tokens issued before ids were added are identified by their hash.
+    """
+    claims = _token_cache.get(token)
+    if claims is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+        except jwt.InvalidTokenError:
+            return None
+        claims = {
+            'user_id': payload.get('user_id'),
+            'jti': payload.get('jti') or hashlib.sha256(token.encode()).hexdigest(),
+            'exp': payload.get('exp') or 0,
+        }
+        _token_cache.put(token, claims)
+    return claims
+
+
+def get_request_token():
+    auth_header = request.httprequest.headers.get('Authorization')
+    if not auth_header:
+        return None
+    parts = auth_header.split(' ')
+    return parts[1] if len(parts) > 1 else None
+
+
+def authenticate(env):
+    """Return the contractor of the request's bearer token, None if it is not valid.
+
+    Costs no query once the token and its contractor are known to the
+    worker, apart from the periodic stamp check of :func:`get_auth_state`.
+    """
+    token = get_request_token()
+    claims = decode_token(token) if token else None
+    if not claims or not claims['user_id']:
+        return None
+    state = get_auth_state(env)
+    if state.is_revoked(claims['jti']):
+        return None
+    Contractor = env['project.form.contractor'].sudo()
+    contractor_id = claims['user_id']
+    if contractor_id not in state.contractors:
+        if not Contractor._contractor_exists(contractor_id):
+            return None
+        state.contractors.add(contractor_id)
+    return Contractor.browse(contractor_id)
+
+
+def jwt_required(optional=False):
+    """Authenticate the bearer token of a route and pass its ``contractor``.
+
+    With ``optional``, requests without an ``Authorization`` header get
+    ``contractor=None``; an invalid token is always answered with a 401.
+    Preflight requests go through untouched.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            kwargs.pop('contractor', None)
+            if request.httprequest.method == 'OPTIONS':
+                return func(self, *args, **kwargs)
+            contractor = authenticate(request.env)
+            if contractor is None and (not optional or request.httprequest.headers.get('Authorization')):
+                return request.make_response(
+                    json.dumps({'status': 'error', 'message': 'Unauthorized request. Invalid or expired token.'}),
+                    headers={'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                    status=401
+                )
+            return func(self, *args, contractor=contractor, **kwargs)
+        return wrapper
+    return decorator
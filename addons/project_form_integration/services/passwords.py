@@ -0,0 +1,21 @@
+from functools import lru_cache
+from passlib.context import CryptContext
+
+# Odoo's own default for user passwords
+DEFAULT_ROUNDS = 600000
+
+
+@lru_cache(maxsize=None)
+def get_crypt_context(rounds=DEFAULT_ROUNDS):
+    """Contractor password hashing: salted PBKDF2-SHA512 with ``rounds`` iterations.
+
+    Hashes made with other rounds, and plaintext passwords stored before
+    hashing was introduced, still verify and are flagged for a rehash.
+    """
+    return CryptContext(
+        ['pbkdf2_sha512', 'plaintext'],
+        deprecated=['plaintext'],
+        pbkdf2_sha512__default_rounds=rounds,
+        pbkdf2_sha512__min_rounds=rounds,
+        pbkdf2_sha512__max_rounds=rounds,
+    )
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+from odoo import api, SUPERUSER_ID
+from odoo.modules.registry import Registry
+from odoo.tools import config
+from psycopg2.extensions import TransactionRollbackError
+import json
+import logging
+import random
+import threading
+import time
+
+from .zillow import scrape_zillow
+from .asce_hazard import scrape_asce_hazard
+
+_logger = logging.getLogger(__name__)
+
+SCRAPERS = {
+    'zillow': scrape_zillow,
+    'asce': scrape_asce_hazard,
+}
+
+
+# Attempts at claiming a job when concurrent claims of the source collide
+CLAIM_ATTEMPTS = 3
+
+
+def get_source_limit(source):
+    """Jobs of ``source`` allowed to run at once across all worker processes,
+    from ``scraper_<source>_concurrency`` (default 1)."""
+    return int(config.get('scraper_%s_concurrency' % source, 1))
+
+
+class ScrapeRunner:
+    """Runs scrape jobs in background threads, outside the HTTP workers.
+
+    Jobs are claimed from the scrape_jobs table, which enforces the
+    concurrency limit of each source across all worker processes; the
+    threads of a source drain its queue while the limit allows. A backlog
+    of Zillow jobs never delays ASCE, and jobs are never lost with a
+    recycled worker: they stay queued for another one.
+    """
+
+    def __init__(self, limits):
+        self._limits = limits
+        self._executors = {
+            source: ThreadPoolExecutor(max_workers=limit, thread_name_prefix='scrape-%s' % source)
+            for source, limit in limits.items()
+        }
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def submit(self, dbname, source):
+        """Wake up a thread to run the queued jobs of ``source``."""
+        key = (dbname, source)
+        with self._lock:
+            # threads already waiting to start will see the new jobs
+            if self._pending.get(key, 0) >= self._limits[source]:
+                return
+            self._pending[key] = self._pending.get(key, 0) + 1
+        self._executors[source].submit(self._run, dbname, source)
+
+    def _run(self, dbname, source):
+        with self._lock:
+            self._pending[(dbname, source)] -= 1
+        try:
+            while run_next_scrape_job(dbname, source):
+                pass
+        except Exception:
+            _logger.exception("Scrape runner of %s crashed", source)
+
+
+def claim_next_scrape_job(registry, source):
+    """Claim the next job of ``source`` in its own transaction.
+
+    Returns ``(job_id, address, params)``, or None when the source is at
+    its limit or has nothing queued.
+    """
+    for attempt in range(CLAIM_ATTEMPTS):
+        try:
+            with registry.cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                job = env['project.form.scrape.job']._claim_next(source, get_source_limit(source))
+                if not job:
+                    return None
+                return job.id, job.address, json.loads(job.params) if job.params else {}
+        except TransactionRollbackError:
+            # another worker claimed a job of this source at the same time
+            time.sleep(random.uniform(0.1, 0.5) * (attempt + 1))
+    return None
+
+
+def run_next_scrape_job(dbname, source):
+    """Claim, execute and store the result of the next job of ``source``.
+
+    The scrape itself runs without an open transaction; a cursor is only
+    held to claim the job and to save its outcome. Returns whether a job
+    was run.
+    """
+    registry = Registry(dbname)
+    claimed = claim_next_scrape_job(registry, source)
+    if not claimed:
+        return False
+    job_id, address, params = claimed
+
+    _logger.info("Running %s scrape job %s for address: %s", source, job_id, address)
+    result = error = None
+    try:
+        result = SCRAPERS[source](address, **params)
+    except Exception as e:
+        _logger.error("%s scrape job %s failed: %s", source, job_id, str(e))
+        error = str(e)
+
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        env['project.form.scrape.job'].browse(job_id)._finish(result=result, error=error)
+    return True
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_scrape_runner():
+    """Return the process-wide runner, with as many threads per source as
+    the source may run jobs at once."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = ScrapeRunner({source: get_source_limit(source) for source in SCRAPERS})
+        return _runner
@@ -0,0 +1,31 @@
+"""Change stamps for caches kept in each worker process.
+
+A stamp is a counter per name, bumped in the transaction that makes the
+change, so it moves exactly when that change commits. A worker compares
+the stamps it loaded its cache at with the current ones, one primary key
+read, instead of clearing the registry cache of every worker.
+"""
+
+STAMP_TABLE = 'project_form_stamps'
+
+
+def ensure_stamp_table(cr):
+    cr.execute("""
+        CREATE TABLE IF NOT EXISTS project_form_stamps (
+            name varchar PRIMARY KEY,
+            stamp bigint NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def bump_stamp(cr, name):
+    cr.execute("""
+        INSERT INTO project_form_stamps (name, stamp) VALUES (%s, 1)
+        ON CONFLICT (name) DO UPDATE SET stamp = project_form_stamps.stamp + 1
+    """, (name,))
+
+
+def read_stamp(cr, name):
+    cr.execute("SELECT stamp FROM project_form_stamps WHERE name = %s", (name,))
+    row = cr.fetchone()
+    return row[0] if row else 0
@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+from odoo import api, SUPERUSER_ID
+from odoo.modules.registry import Registry
+from odoo.tools import config
+from psycopg2.extensions import TransactionRollbackError
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+
+class TaskSyncRunner:
+    """Creates the Odoo tasks of freshly stored projects in background threads.
+
+    Failures are recorded on the projects themselves and retried by the
+    ``_cron_retry_task_sync`` cron, so nothing is lost when a worker dies.
+    """
+
+    def __init__(self, concurrency):
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='task-sync')
+
+    def submit(self, dbname, project_ids):
+        if project_ids:
+            self._executor.submit(self._run, dbname, project_ids)
+
+    def _run(self, dbname, project_ids):
+        try:
+            run_task_sync(dbname, project_ids)
+        except TransactionRollbackError:
+            # another worker synced the same projects concurrently
+            _logger.info("Task sync of projects %s skipped after a concurrent update", project_ids)
+        except Exception:
+            _logger.exception("Task sync of projects %s crashed", project_ids)
+
+
+def run_task_sync(dbname, project_ids):
+    registry = Registry(dbname)
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        env['project.form.project'].browse(project_ids).exists()._run_task_sync()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_task_sync_runner():
+    """Return the process-wide runner; ``task_sync_concurrency`` threads (default 2)."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = TaskSyncRunner(int(config.get('task_sync_concurrency', 2)))
+        return _runner
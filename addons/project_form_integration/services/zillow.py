@@ -1,22 +1,19 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium_stealth import stealth
-from webdriver_manager.chrome import ChromeDriverManager
 import logging
 import time
 import random
 import json
-import shutil
-import tempfile
-import os
+
+from .browser_pool import get_browser_pool
 
 _logger = logging.getLogger(__name__)
 
-def scrape_zillow(address: str, base_url: str = "https://www.zillow.com/homes/"):
+def scrape_zillow(address: str, base_url: str = "https://www.zillow.com/homes/", driver=None):
     """
     Scrape lot size and parcel number from Zillow by address.
+
+    Uses ``driver`` when given, otherwise checks a session out of the shared
+    browser pool for the duration of the scrape.
     """
     if "http" not in address:
         formatted_address = address.replace(" ", "-").replace(",", "")
@@ -24,50 +21,17 @@ def scrape_zillow(address: str, base_url: str = "https://www.zillow.com/homes/")
     else:
         url = address
 
-    # Create a temporary user data directory
-    user_data_dir = tempfile.mkdtemp()
-
-    # Configure Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument('--headless=new') 
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--disable-extensions')
-    chrome_options.add_argument('--disable-software-rasterizer')
-    chrome_options.add_argument('--window-size=1920,1080')
-    chrome_options.add_argument('--single-process')
-    chrome_options.add_argument('--disable-setuid-sandbox')
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36')
-    
-    # Critical for Docker
-    chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
-    chrome_options.add_argument("--remote-debugging-port=9222")
+    if driver is None:
+        # Borrow a warm Chrome session instead of starting a new browser per call
+        with get_browser_pool().session() as pooled_driver:
+            return scrape_zillow(address, base_url, driver=pooled_driver)
 
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
     data = {
         "lot_size": None,
         "parcel_number": None
     }
     
-    driver = None
     try:
-        # Use webdriver-manager to get the correct ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-
-        stealth(driver,
-            languages=["en-US", "en"],
-            vendor="Google Inc.",
-            platform="Win32",
-            webgl_vendor="Intel Inc.",
-            renderer="Intel Iris OpenGL Engine",
-            fix_hairline=True,
-        )
-        
         _logger.info("Navigating to Zillow URL: %s", url)
         driver.get(url)
         
@@ -163,17 +127,6 @@ def scrape_zillow(address: str, base_url: str = "https://www.zillow.com/homes/")
     except Exception as e:
         _logger.error("Error scraping Zillow: %s", str(e))
         raise Exception(f"Failed to scrape Zillow page: {str(e)}")
-    
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except: pass
-        
-        # Clean up temp user data dir
-        try:
-            shutil.rmtree(user_data_dir, ignore_errors=True)
-        except: pass
 
 
 if __name__ == "__main__":